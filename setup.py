@@ -32,7 +32,8 @@ setup(
         "numpy>=1.20.0",
         "sounddevice>=0.4.5",
         "soundfile>=0.12.1",
-        "pyttsx3>=2.90"
+        "pyttsx3>=2.90",
+        'tomli>=1.1.0; python_version < "3.11"'
     ],
     extras_require={
         'dev': [
@@ -1,6 +1,8 @@
-from typing import Optional, Tuple
-from .config import TEMPO_CONFIG
-from .trainer import SwingTempo, TempoTrainer
+import argparse
+import sys
+from typing import List, Optional, Tuple
+from .catalog import TempoCatalog, default_catalog, load_catalog
+from .tempo import SwingTempo
 
 def get_user_selection(options: list[str], prompt: str) -> Optional[int]:
     print("\n" + prompt)
@@ -16,36 +18,50 @@ def get_user_selection(options: list[str], prompt: str) -> Optional[int]:
         print("Please enter a valid number.")
     return None
 
-def get_tempo_settings() -> SwingTempo:
+def get_tempo_settings(catalog: Optional[TempoCatalog] = None) -> SwingTempo:
+    catalog = catalog or default_catalog()
+
     # Get shot type selection
-    shot_types = list(TEMPO_CONFIG.keys())
+    shot_types = catalog.shot_types()
     print("\nSelect a shot type:")
     for i, shot_type in enumerate(shot_types, 1):
         print(f"{i}. {shot_type}")
 
     shot_choice = int(input("\nEnter your choice (number): ")) - 1
     selected_shot = shot_types[shot_choice]
-    shot_config = TEMPO_CONFIG[selected_shot]
 
     # Get pro selection
-    pros = list(shot_config["pros"].keys())
+    pros = catalog.pros(selected_shot)
     print(f"\nSelect a pro for {selected_shot}:")
     for i, pro in enumerate(pros, 1):
         print(f"{i}. {pro}")
 
     pro_choice = int(input("\nEnter your choice (number): ")) - 1
     selected_pro = pros[pro_choice]
-    pro_config = shot_config["pros"][selected_pro]
-
-    return SwingTempo(
-        shot_type=selected_shot,
-        pro_name=selected_pro,
-        bpm=pro_config["bpm"],
-        ratio=pro_config["ratio"],
-        frames=pro_config["frames"],
-        description=pro_config["description"],
-        learning_notes=shot_config["learning_notes"]
-    )
+
+    # Get club selection when the pro has club-level tempos
+    clubs = catalog.clubs(selected_shot, selected_pro)
+    selected_club = ""
+    if len(clubs) > 1:
+        print(f"\nSelect a club for {selected_pro}:")
+        for i, club in enumerate(clubs, 1):
+            print(f"{i}. {club or 'Default tempo'}")
+
+        club_choice = int(input("\nEnter your choice (number): ")) - 1
+        selected_club = clubs[club_choice]
+
+    return catalog.get(selected_shot, selected_pro, selected_club)
+
+def build_swing_tempo(shot_type: str,
+                      pro_name: str,
+                      catalog: Optional[TempoCatalog] = None,
+                      club: str = "") -> SwingTempo:
+    """Look up a pro's tempo in the catalog (the built-in TEMPO_CONFIG by default)"""
+    return (catalog or default_catalog()).get(shot_type, pro_name, club)
+
+def load_catalog_args(args: argparse.Namespace) -> TempoCatalog:
+    """The built-in catalog, extended by any --catalog files"""
+    return load_catalog(*args.catalog) if args.catalog else default_catalog()
 
 def print_instructions() -> None:
     print("""
@@ -64,16 +80,270 @@ Remember:
 - Short Game uses a 2:1 ratio (two parts backswing to one part downswing)
     """)
 
-def main() -> None:
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="total-tempo",
+        description="Dickfore golf swing tempo trainer"
+    )
+    parser.add_argument("--backend", choices=["sounddevice", "null", "memory", "file"],
+                        help="Audio output backend (default: AUDIO_CONFIG['backend'])")
+    parser.add_argument("--backend-output", help="Output file for the 'file' backend")
+    parser.add_argument("--listen", action="store_true",
+                        help="Time your own swing with the microphone (use headphones)")
+    parser.add_argument("--dashboard", action="store_true",
+                        help="Redraw a live dashboard instead of scrolling reports")
+    parser.add_argument("--timer-mode", choices=["low_jitter", "low_cpu"],
+                        help="Deadline timer: spin for accuracy or sleep to save CPU "
+                             "(default: AUDIO_CONFIG['timer_mode'])")
+    parser.add_argument("--catalog", action="append", default=[], metavar="FILE",
+                        help="JSON/TOML tempo catalog adding or replacing pros (repeatable)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    render = subparsers.add_parser(
+        "render",
+        help="Render a training session to a WAV/FLAC file"
+    )
+    render.add_argument("--shot-type", default="Long Game", help="Shot type from the tempo catalog")
+    render.add_argument("--pro", required=True, help="Pro name from the tempo catalog")
+    render.add_argument("--club", default="", help="Club-level tempo of the pro, if the catalog has one")
+    render.add_argument("--swings", type=int, default=50, help="Number of swing cycles")
+    render.add_argument("--output", required=True, help="Output path (.wav or .flac)")
+
+    analyze = subparsers.add_parser(
+        "analyze",
+        help="Time every swing in a directory of recorded WAV/FLAC files"
+    )
+    analyze.add_argument("directory", help="Directory searched recursively for recordings")
+    analyze.add_argument("--shot-type", default="Long Game", help="Shot type from the tempo catalog")
+    analyze.add_argument("--pro", required=True, help="Pro name to grade the swings against")
+    analyze.add_argument("--club", default="", help="Club-level tempo of the pro, if the catalog has one")
+    analyze.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    analyze.add_argument("--output", help="Write every swing to this CSV file")
+
+    bays = subparsers.add_parser(
+        "bays",
+        help="Run several bays' tempo sessions from one process on one output"
+    )
+    bays.add_argument("--bay", action="append", default=[], metavar="SHOT_TYPE:PRO",
+                      help="One bay's tempo, e.g. 'Long Game:Adam Scott' (repeat per bay)")
+    bays.add_argument("--channels", type=int, default=1,
+                      help="Output channels; bay N plays on channel N (wrapping around)")
+    bays.add_argument("--duration", type=float, help="Stop after this many seconds (default: Ctrl+C)")
+    bays.add_argument("--control-port", type=int, metavar="PORT",
+                      help="Serve the HTTP/WebSocket control API on localhost:PORT")
+
+    drill = subparsers.add_parser(
+        "drill",
+        help="Ramp the tempo from one pro to another (or to a BPM/ratio) over a run of swings"
+    )
+    drill.add_argument("--shot-type", default="Long Game", help="Shot type from the tempo catalog")
+    drill.add_argument("--pro", required=True, help="Pro whose tempo the drill starts at")
+    drill.add_argument("--to-pro", help="Pro whose tempo the drill ends at (default: --pro)")
+    drill.add_argument("--to-bpm", type=float, help="BPM the drill ends at, overriding the pro's")
+    drill.add_argument("--to-ratio", type=float, help="Ratio the drill ends at, overriding the pro's")
+    drill.add_argument("--swings", type=int, default=20, help="Swings from the first tempo to the last")
+
+    history = subparsers.add_parser(
+        "history",
+        help="Show mean ratio error per pro and the daily trend of recorded swings"
+    )
+    history.add_argument("--days", type=int, default=30, help="Days covered by the trend")
+
+    bench = subparsers.add_parser(
+        "bench-startup",
+        help="Measure import time and time to first cue"
+    )
+    bench.add_argument("--repeat", type=int, default=5, help="Cold starts per measurement")
+
+    suite = subparsers.add_parser(
+        "bench",
+        help="Benchmark synthesis, caching, rendering, scheduling and startup"
+    )
+    suite.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    suite.add_argument("--output", help="Write results to this JSON file")
+    suite.add_argument("--baseline", help="Compare against results saved earlier with --output")
+    suite.add_argument("--tolerance", type=float, default=0.25,
+                       help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    suite.add_argument("--skip-startup", action="store_true",
+                       help="Skip the cold-start subprocess measurements")
+
+    calibrate = subparsers.add_parser(
+        "calibrate-latency",
+        help="Measure the output device latency and save it as the device's profile"
+    )
+    calibrate.add_argument("--loopback", action="store_true",
+                           help="Also time a click played out and recorded back (needs a loopback cable)")
+    calibrate.add_argument("--input-device", help="Input device for the loopback recording")
+
+    return parser
+
+def run_render(args: argparse.Namespace) -> None:
+    from .render import render_session
+
+    tempo = build_swing_tempo(args.shot_type, args.pro, load_catalog_args(args), args.club)
+    frames = render_session(tempo, swings=args.swings, path=args.output)
+    print(f"Rendered {args.swings} swings ({frames} samples) to {args.output}")
+
+def run_analyze(args: argparse.Namespace) -> None:
+    from .batch import analyze_directory, format_summary, write_summary
+
+    tempo = build_swing_tempo(args.shot_type, args.pro, load_catalog_args(args), args.club)
+    results = analyze_directory(args.directory, tempo, workers=args.workers)
+    if not results:
+        print(f"No WAV or FLAC files found in {args.directory}")
+        return
+    print(format_summary(results, tempo))
+    if args.output:
+        rows = write_summary(results, args.output)
+        print(f"\n{rows} swings written to {args.output}")
+
+def run_bays(args: argparse.Namespace) -> None:
+    import asyncio
+    from .bays import SessionManager
+    from .config import AUDIO_CONFIG
+
+    if not args.bay and args.control_port is None:
+        build_parser().error("bays needs at least one --bay, or --control-port to add them remotely")
+    catalog = load_catalog_args(args)
+    tempos = []
+    for spec in args.bay:
+        shot_type, _, pro_name = spec.partition(":")
+        tempos.append(build_swing_tempo(shot_type.strip(), pro_name.strip(), catalog))
+
+    manager = SessionManager(backend=args.backend or AUDIO_CONFIG["backend"],
+                             backend_options=backend_options(args), channels=args.channels)
+    for number, tempo in enumerate(tempos, 1):
+        manager.add_session(f"Bay {number}", tempo)
+    if args.control_port is not None:
+        from .control import ControlServer
+
+        server = ControlServer(manager, catalog, port=args.control_port)
+        running = server.serve(args.duration)
+        print(f"Control API on http://{server.host}:{args.control_port}/sessions")
+    else:
+        running = manager.run(args.duration)
+    print(f"Running {len(tempos)} bays - press Ctrl+C to stop")
+    try:
+        asyncio.run(running)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+    print(manager.format_report())
+
+def run_drill(args: argparse.Namespace) -> None:
+    import dataclasses
+    from .config import AUDIO_CONFIG
+    from .drills import TempoRamp
+    from .history import SwingHistory, default_history_path
+    from .trainer import TempoTrainer
+
+    catalog = load_catalog_args(args)
+    start = build_swing_tempo(args.shot_type, args.pro, catalog)
+    end = build_swing_tempo(args.shot_type, args.to_pro or args.pro, catalog)
+    overrides = {"bpm": args.to_bpm, "ratio": args.to_ratio}
+    end = dataclasses.replace(end, **{k: v for k, v in overrides.items() if v is not None})
+    try:
+        ramp = TempoRamp(start, end, args.swings)
+    except ValueError as e:
+        build_parser().error(str(e))
+
+    history = SwingHistory(default_history_path())
+    trainer = TempoTrainer(backend=args.backend, backend_options=backend_options(args),
+                           timer_mode=args.timer_mode, history=history,
+                           dashboard=args.dashboard)
+    try:
+        trainer.drill(ramp, listen=args.listen)
+    finally:
+        history.close()
+
+def run_history(args: argparse.Namespace) -> None:
+    from .config import AUDIO_CONFIG
+    from .history import SwingHistory, default_history_path, format_history_report
+
+    history = SwingHistory(default_history_path())
+    try:
+        print(format_history_report(history, args.days))
+    finally:
+        history.close()
+
+def run_bench_startup(args: argparse.Namespace) -> None:
+    from .benchmarks import format_startup_report, measure_startup
+
+    print(format_startup_report(measure_startup(repeat=args.repeat)))
+
+def run_bench(args: argparse.Namespace) -> int:
+    from .benchmarks import (compare_results, format_regressions, format_report,
+                             load_results, run_benchmarks, save_results)
+
+    results = run_benchmarks(repeat=args.repeat, startup=not args.skip_startup)
+    print(format_report(results))
+    if args.output:
+        save_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        regressions = compare_results(results, load_results(args.baseline), args.tolerance)
+        print("\n" + format_regressions(regressions))
+        return 1 if regressions else 0
+    return 0
+
+def run_calibrate_latency(args: argparse.Namespace) -> None:
+    from .backends import create_backend
+    from .config import AUDIO_CONFIG
+    from .latency import calibrate, format_profile
+
+    options = {**AUDIO_CONFIG["backend_options"], **backend_options(args)}
+    backend = create_backend(args.backend or AUDIO_CONFIG["backend"],
+                             AUDIO_CONFIG["sample_rate"], **options)
+    profile = calibrate(backend, loopback=args.loopback, input_device=args.input_device)
+    print(format_profile(profile))
+
+def backend_options(args: argparse.Namespace) -> dict:
+    return {"path": args.backend_output} if args.backend_output else {}
+
+def run_interactive(args: argparse.Namespace) -> None:
     print("Welcome toDickfore Trainer!")
     
-    tempo_settings = get_tempo_settings()
+    tempo_settings = get_tempo_settings(load_catalog_args(args))
     if tempo_settings is None:
         print("Error: Could not start training session.")
         return
     
-    trainer = TempoTrainer()
-    trainer.train(tempo_settings)
+    # Audio backends load only once a session is actually starting
+    from .config import AUDIO_CONFIG
+    from .history import SwingHistory, default_history_path
+    from .trainer import TempoTrainer
+
+    history = SwingHistory(default_history_path())
+    trainer = TempoTrainer(backend=args.backend, backend_options=backend_options(args),
+                           timer_mode=args.timer_mode, history=history,
+                           dashboard=args.dashboard)
+    try:
+        trainer.train(tempo_settings, listen=args.listen)
+    finally:
+        history.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "render":
+        run_render(args)
+    elif args.command == "analyze":
+        run_analyze(args)
+    elif args.command == "bays":
+        run_bays(args)
+    elif args.command == "drill":
+        run_drill(args)
+    elif args.command == "history":
+        run_history(args)
+    elif args.command == "bench-startup":
+        run_bench_startup(args)
+    elif args.command == "bench":
+        sys.exit(run_bench(args))
+    elif args.command == "calibrate-latency":
+        run_calibrate_latency(args)
+    else:
+        run_interactive(args)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
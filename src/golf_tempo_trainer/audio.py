@@ -1,15 +1,30 @@
-import os
+import heapq
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
+from itertools import count
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Dict, Optional
-from pydub import AudioSegment
-from pydub.playback import play as pydub_play
-from .config import AUDIO_CONFIG
+from collections import OrderedDict, deque
+from fractions import Fraction
+from typing import TYPE_CHECKING, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from .backends import AudioBackend, create_backend
+from .config import AUDIO_CONFIG, TEMPO_CONFIG
+from .latency import LatencyProfile, find_profile
+from .mixer import Mixer
+from .timeline import SwingTimeline, exact
+from .tonebank import ToneBank
+from .voice import VoicePrompts, announcement, default_prompts
+from .wavetable import Oscillator, Wavetable, geometric_ramp, phase_increment
+import threading
 import time
-import pyttsx3
+
+ADDRESS_PROMPT_S = Fraction(1, 2)  # "Address the ball" follows the pro announcement
+PROMPT_LEAD_S = Fraction(3, 2)     # Prompts before the count-in of every trained swing
+SCHEDULE_AHEAD_S = 0.05            # A cycle queued from idle starts this far ahead of the stream
+CUE_LOG_SIZE = 1024                # Cue timestamps kept for drain_cues
+
+# PortAudio and pydub are loaded on first use so catalog and menu paths start fast
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 
 @dataclass
@@ -19,7 +34,9 @@ class Tone:
     volume: float = 0.8  # Default volume
     sample_rate: int = AUDIO_CONFIG["sample_rate"]
 
-    def generate(self) -> AudioSegment:
+    def generate(self) -> "AudioSegment":
+        from pydub import AudioSegment
+
         # Generate time array
         t = np.linspace(0, self.duration_ms / 1000.0,
                         int(self.sample_rate * self.duration_ms / 1000.0))
@@ -42,17 +59,44 @@ class Tone:
         return audio.apply_gain(self.volume)
 
 
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_loads: int = 0
+    evictions: int = 0
+    bytes_used: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
 class AudioCache:
     """
     Cache for audio segments to improve performance and reduce CPU usage
+    Memory tier is an LRU bounded by AUDIO_CONFIG["cache_max_bytes"]; evicted
+    tones are reloaded from the memory-mapped tone bank on disk
     Time Complexity: O(1) for retrievals, O(n) for initial generation
-    Space Complexity: O(n) where n is number of unique tones
+    Space Complexity: O(max_bytes) in memory, O(n) on disk for n unique tones
     """
 
-    def __init__(self):
-        self.cache_dir = Path("audio_cache")
-        self.cache_dir.mkdir(exist_ok=True)
-        self.cached_segments: Dict[str, np.ndarray] = {}
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(AUDIO_CONFIG["cache_dir"])
+        self._bank: Optional[ToneBank] = None
+        self.cached_segments: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.max_bytes = AUDIO_CONFIG["cache_max_bytes"] if max_bytes is None else max_bytes
+        self.stats = CacheStats()
+        # Wavetables and time bases are built once per (sample_rate, engine)
+        self._generators: Dict[Tuple[int, str], "ToneGenerator"] = {}
+        # Voice prompts are added from the render worker thread
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(name: str, freq: float, duration_s: float, volume: float, engine: Optional[str] = None) -> str:
+        # Engines synthesize slightly different samples, so each keeps its own tones
+        return f"{name}_{freq}_{duration_s}_{volume}_{engine or AUDIO_CONFIG['synth_engine']}"
 
     def get_tone(self,
                  name: str,
@@ -63,206 +107,648 @@ class AudioCache:
         """
         Retrieve or generate a tone with specific parameters
         """
-        key = f"{name}_{freq}_{duration_s}_{volume}"
+        return self.get_tones([(name, freq, duration_s, volume)], sample_rate)[0]
 
-        if key not in self.cached_segments:
-            cache_file = self.cache_dir / f"{key}.npy"
-
-            if cache_file.exists():
-                self.cached_segments[key] = np.load(str(cache_file))
+    def get_tones(self,
+                  requests: Sequence[Tuple[str, float, float, float]],
+                  sample_rate: int) -> List[np.ndarray]:
+        """
+        Retrieve or generate (name, freq, duration_s, volume) tones
+        All misses are synthesized in one batch and written to the bank once
+        """
+        with self._lock:
+            return self._get_tones(requests, sample_rate)
+
+    def _get_tones(self,
+                   requests: Sequence[Tuple[str, float, float, float]],
+                   sample_rate: int) -> List[np.ndarray]:
+        results: List[Optional[np.ndarray]] = [None] * len(requests)
+        missing: Dict[str, List[int]] = {}
+        engine = AUDIO_CONFIG["synth_engine"]
+
+        for i, (name, freq, duration_s, volume) in enumerate(requests):
+            key = self._key(name, freq, duration_s, volume, engine)
+            if key in missing:
+                missing[key].append(i)
+                continue
+            tone = self._lookup(key)
+            if tone is None:
+                missing[key] = [i]
             else:
-                # Generate time array
-                t = np.linspace(0, duration_s, int(sample_rate * duration_s))
-
-                # Generate sine wave
-                tone = np.sin(2 * np.pi * freq * t)
-
-                # Apply envelope for smooth start/end
-                envelope = np.ones_like(tone)
-                attack_samples = int(0.005 * sample_rate)  # 5ms attack
-                decay_samples = int(0.005 * sample_rate)   # 5ms decay
-                envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
-                envelope[-decay_samples:] = np.linspace(1, 0, decay_samples)
-
-                # Apply volume and convert to float32
-                tone = (tone * envelope * volume).astype(np.float32)
-
-                # Cache the tone
-                np.save(str(cache_file), tone)
-                self.cached_segments[key] = tone
-
-        return self.cached_segments[key]
+                results[i] = tone
+
+        if missing:
+            specs = []
+            for indices in missing.values():
+                _, freq, duration_s, volume = requests[indices[0]]
+                specs.append(ToneSpec(freq=freq, duration_s=duration_s, volume=volume))
+            generator = self._generators.get((sample_rate, engine))
+            if generator is None:
+                generator = self._generators[sample_rate, engine] = ToneGenerator(sample_rate, engine)
+            generated = generator.generate_batch(specs)
+
+            # Cache the tones
+            self.bank.add_many(dict(zip(missing, generated)))
+            for (key, indices), tone in zip(missing.items(), generated):
+                self._store(key, tone)
+                for i in indices:
+                    results[i] = tone
+
+        return results
+
+    def get_clip(self, key: str) -> Optional[np.ndarray]:
+        """Retrieve a pre-rendered clip such as a voice prompt, or None"""
+        with self._lock:
+            return self._lookup(key)
+
+    def add_clips(self, clips: Dict[str, np.ndarray]) -> None:
+        """Store pre-rendered clips in the bank and the memory tier"""
+        with self._lock:
+            self.bank.add_many(clips)
+            for key, clip in clips.items():
+                self._store(key, clip)
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        """Serve a tone from memory or the bank, counting hits and misses"""
+        if key in self.cached_segments:
+            self.stats.hits += 1
+            self.cached_segments.move_to_end(key)
+            return self.cached_segments[key]
+
+        self.stats.misses += 1
+        tone = self.bank.get(key)
+        if tone is not None:
+            self.stats.disk_loads += 1
+            self._store(key, tone)
+        return tone
+
+    @property
+    def bank(self) -> ToneBank:
+        """Disk tier, opened on first use so cache_dir can still be redirected"""
+        bank_path = self.cache_dir / AUDIO_CONFIG["tone_bank_file"]
+        if self._bank is None or self._bank.path != bank_path:
+            self._bank = ToneBank(bank_path, storage=AUDIO_CONFIG["tone_bank_storage"])
+        return self._bank
+
+    def _store(self, key: str, tone: np.ndarray) -> None:
+        """Insert into the memory tier, evicting least recently used tones over budget"""
+        if key in self.cached_segments:
+            self.stats.bytes_used -= self.cached_segments.pop(key).nbytes
+        self.cached_segments[key] = tone
+        self.stats.bytes_used += tone.nbytes
+        while self.stats.bytes_used > self.max_bytes and self.cached_segments:
+            _, evicted = self.cached_segments.popitem(last=False)
+            self.stats.bytes_used -= evicted.nbytes
+            self.stats.evictions += 1
+
+
+@dataclass(frozen=True)
+class ToneSpec:
+    freq: float
+    duration_s: float
+    volume: float = 0.8
+    end_freq: Optional[float] = None  # Set for an exponential sweep
+    fade_s: float = 0.005             # Linear attack and decay
 
 
 class ToneGenerator:
-    def __init__(self, sample_rate: int = 44100):
+    def __init__(self, sample_rate: int = 44100, engine: Optional[str] = None):
         self.sample_rate = sample_rate
+        self.engine = engine or AUDIO_CONFIG["synth_engine"]
+        if self.engine not in ("wavetable", "numpy"):
+            raise ValueError(f"Unknown synthesis engine: {self.engine}")
+        self._sine = Wavetable(sample_rate=sample_rate)
+        self._click = Wavetable(harmonics=(1.0, 0.5, 0.25), sample_rate=sample_rate)
+        self._time_bases: Dict[Tuple[int, float], np.ndarray] = {}
+        self._ramps: Dict[int, np.ndarray] = {}
+        self._envelopes: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def _time_base(self, n: int, duration_s: float) -> np.ndarray:
+        key = (n, duration_s)
+        if key not in self._time_bases:
+            self._time_bases[key] = np.linspace(0, duration_s, n)
+        return self._time_bases[key]
+
+    def _ramp(self, n: int) -> np.ndarray:
+        if n not in self._ramps:
+            self._ramps[n] = np.linspace(0, 1, n)
+        return self._ramps[n]
+
+    def _envelope(self, n: int, fade_samples: int) -> np.ndarray:
+        """Linear attack/decay envelope, shared by every tone of the same shape"""
+        key = (n, fade_samples)
+        if key not in self._envelopes:
+            envelope = np.ones(n)
+            fade = min(fade_samples, n)
+            if fade > 0:
+                envelope[:fade] = np.linspace(0, 1, fade)
+                envelope[-fade:] = np.linspace(1, 0, fade)
+            self._envelopes[key] = envelope
+        return self._envelopes[key]
+
+    def _sine_block(self, start: np.ndarray, is_sweep: np.ndarray,
+                    group: List[ToneSpec], n: int, duration_s: float) -> np.ndarray:
+        """Rows of tones and sweeps evaluated with np.sin"""
+        phase = np.empty((len(group), n))
+        if not is_sweep.all():
+            phase[~is_sweep] = 2 * np.pi * start[~is_sweep] * self._time_base(n, duration_s)
+        if is_sweep.any():
+            end = np.array([spec.end_freq for spec in group if spec.end_freq is not None])[:, None]
+            log_start = np.log(start[is_sweep])
+            freq = np.exp(log_start + (np.log(end) - log_start) * self._ramp(n))
+            phase[is_sweep] = 2 * np.pi * np.cumsum(freq, axis=1) / self.sample_rate
+        return np.sin(phase)
+
+    def _wavetable_block(self, start: np.ndarray, is_sweep: np.ndarray,
+                         group: List[ToneSpec], n: int) -> np.ndarray:
+        """Rows of tones and sweeps read from the sine table via uint32 phases"""
+        increments = phase_increment(start, self.sample_rate)
+        phases = np.empty((len(group), n), dtype=np.uint32)
+        if not is_sweep.all():
+            steps = np.round(increments[~is_sweep]).astype(np.uint32)
+            phases[~is_sweep] = np.arange(n, dtype=np.uint32) * steps
+        if is_sweep.any():
+            end = np.array([spec.end_freq for spec in group if spec.end_freq is not None])[:, None]
+            ratio = (end / start[is_sweep]) ** (1 / max(n - 1, 1))
+            steps = (increments[is_sweep] * geometric_ramp(ratio, n)).astype(np.uint32)
+            phases[is_sweep] = np.cumsum(steps, axis=1, dtype=np.uint32)
+        return self._sine.lookup(phases, max_freq=0)
+
+    def generate_batch(self, specs: Sequence[ToneSpec]) -> List[np.ndarray]:
+        """
+        Synthesize many tones and sweeps in one vectorized pass
+        Specs of equal length share one time base, envelope and 2-D sin call
+        Time Complexity: O(total samples) with one NumPy pass per distinct length
+        """
+        groups: Dict[Tuple[int, float, int], List[int]] = {}
+        for i, spec in enumerate(specs):
+            if spec.freq <= 0 or (spec.end_freq is not None and spec.end_freq <= 0):
+                raise ValueError(f"Frequencies must be positive: {spec}")
+            if spec.duration_s <= 0:
+                raise ValueError(f"Duration must be positive: {spec}")
+            n = int(self.sample_rate * spec.duration_s)
+            fade_samples = int(spec.fade_s * self.sample_rate)
+            groups.setdefault((n, spec.duration_s, fade_samples), []).append(i)
+
+        results: List[Optional[np.ndarray]] = [None] * len(specs)
+        for (n, duration_s, fade_samples), members in groups.items():
+            group = [specs[i] for i in members]
+            start = np.array([spec.freq for spec in group])[:, None]
+            volume = np.array([spec.volume for spec in group])[:, None]
+            is_sweep = np.array([spec.end_freq is not None for spec in group])
+
+            if self.engine == "wavetable":
+                block = self._wavetable_block(start, is_sweep, group, n)
+            else:
+                block = self._sine_block(start, is_sweep, group, n, duration_s)
+
+            block *= self._envelope(n, fade_samples)
+            block *= volume
+            block = block.astype(np.float32, copy=False)
+            for row, i in enumerate(members):
+                results[i] = block[row]
+
+        return results
 
     def generate_sweep(self, start_freq: float, end_freq: float, duration_s: float, volume: float = 0.8) -> np.ndarray:
         """Generate a frequency sweep"""
-        t = np.linspace(0, duration_s, int(self.sample_rate * duration_s))
-        freq = np.exp(np.linspace(
-            np.log(start_freq), np.log(end_freq), len(t)))
-        tone = np.sin(2 * np.pi * freq.cumsum() / self.sample_rate)
-        envelope = np.ones_like(tone)
-        attack_samples = int(0.01 * self.sample_rate)
-        decay_samples = int(0.01 * self.sample_rate)
-        envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
-        envelope[-decay_samples:] = np.linspace(1, 0, decay_samples)
-        return (tone * envelope * volume).astype(np.float32)
+        spec = ToneSpec(freq=start_freq, end_freq=end_freq, duration_s=duration_s,
+                        volume=volume, fade_s=0.01)
+        return self.generate_batch([spec])[0]
 
     def generate_impact_click(self, volume: float = 0.9) -> np.ndarray:
         """Generate an impact click sound"""
         duration_s = 0.030
-        t = np.linspace(0, duration_s, int(self.sample_rate * duration_s))
-        harmonics = [1000, 2000, 3000]
-        weights = [1.0, 0.5, 0.25]
-        click = np.zeros_like(t)
-        for freq, weight in zip(harmonics, weights):
-            click += weight * np.sin(2 * np.pi * freq * t)
+        n = int(self.sample_rate * duration_s)
+        t = self._time_base(n, duration_s)
+        if self.engine == "wavetable":
+            click = Oscillator(self._click, freq=1000).render(n).astype(np.float64)
+        else:
+            harmonics = [1000, 2000, 3000]
+            weights = [1.0, 0.5, 0.25]
+            click = np.zeros_like(t)
+            for freq, weight in zip(harmonics, weights):
+                click += weight * np.sin(2 * np.pi * freq * t)
         envelope = np.exp(-t * 50)
         return (click * envelope * volume).astype(np.float32)
 
 
+def shot_type_key(shot_type: str) -> str:
+    """Map a display shot type such as "Long Game" to its AUDIO_CONFIG key"""
+    key = shot_type.lower().replace(" ", "_")
+    return key if isinstance(AUDIO_CONFIG.get(key), dict) else "long_game"
+
+
+def swing_tone_requests(shot_type: str) -> Dict[str, Tuple[str, float, float, float]]:
+    """(name, freq, duration_s, volume) of each cue tone for a shot type"""
+    config = AUDIO_CONFIG[shot_type_key(shot_type)]
+
+    return {
+        # E4 note - softer than main tones, short duration for rhythm
+        'metronome': ('metronome', 330, 0.050, 0.5),
+        # A4 note
+        'backswing_start': ('backswing', 440, 0.100, config['backswing']['volume']),
+        # C#5 note
+        'downswing_start': ('downswing', 554.37, 0.100, config['downswing']['volume']),
+        # E5 note
+        'impact': ('impact', 659.25, 0.100, config['impact']['volume']),
+    }
+
+
+def load_swing_tones(shot_type: str, cache: AudioCache) -> Dict[str, np.ndarray]:
+    """Metronome and swing cue tones for a shot type, served from the cache"""
+    requests = swing_tone_requests(shot_type)
+    tones = cache.get_tones(list(requests.values()), AUDIO_CONFIG["sample_rate"])
+    return dict(zip(requests, tones))
+
+
+def warm_swing_tones(cache: AudioCache) -> int:
+    """Load the cue tones of every shot type in TEMPO_CONFIG in a single batch"""
+    requests = [
+        request
+        for shot_type in TEMPO_CONFIG
+        for request in swing_tone_requests(shot_type).values()
+    ]
+    cache.get_tones(requests, AUDIO_CONFIG["sample_rate"])
+    return len(requests)
+
+
+def mix_loop(out: np.ndarray, cycle: np.ndarray, loop_start: int, block_start: int) -> None:
+    """Add a cycle looping from loop_start into the block starting at block_start"""
+    frames = len(out)
+    first = max(block_start, loop_start)
+    i = first - block_start
+    pos = (first - loop_start) % len(cycle)
+    while i < frames:
+        chunk = min(frames - i, len(cycle) - pos)
+        out[i:i + chunk] += cycle[pos:pos + chunk]
+        i += chunk
+        pos = 0
+
+
+@dataclass(frozen=True)
+class CueTiming:
+    """When a named cue actually reached the output"""
+    name: str
+    sample: int   # Sample index the cue started on
+    time: float   # Seconds on the stream's DAC clock (perf_counter when unavailable)
+    source: str = ""  # Who queued the cue, when several sessions share the stream
+
+
+class _ToneEvent:
+    """A tone queued on the output stream at an absolute sample index"""
+    __slots__ = ("samples", "start", "name", "source", "channel", "gain")
+
+    def __init__(self, samples: np.ndarray, start: int, name: Optional[str] = None, source: str = "",
+                 channel: int = 0, gain: float = 1.0):
+        self.samples = samples
+        self.start = start
+        self.name = name  # Named events are timestamped when they start playing
+        self.source = source
+        self.channel = channel
+        self.gain = gain
+
+
+class _CueSequence:
+    """Timeline onsets the output callback turns into tone events as their blocks come up"""
+    __slots__ = ("onsets", "next")
+
+    def __init__(self, onsets: Iterator[Tuple[str, int]]):
+        self.onsets = onsets
+        self.next = next(onsets, None)
+
+
+def block_dac_time(time_info, latency: float = 0.0) -> float:
+    """
+    Time the first sample of a callback block reaches the DAC
+    Some host APIs report 0 for the DAC time; perf_counter plus the stream
+    latency is the closest stand-in on the same clock as the rest of the app
+    """
+    dac_time = getattr(time_info, "outputBufferDacTime", 0.0) if time_info is not None else 0.0
+    return dac_time or time.perf_counter() + latency
+
+
 class AudioPlayer:
-    def __init__(self):
+    def __init__(self,
+                 backend: Optional[Union[str, AudioBackend]] = None,
+                 backend_options: Optional[Dict] = None,
+                 channels: Optional[int] = None):
         self.generator = ToneGenerator()
-        self._streams: Dict[str, sd.OutputStream] = {}
+        # A backend name from AUDIO_CONFIG/CLI, or a ready-made backend instance
+        self._backend_spec = backend or AUDIO_CONFIG["backend"]
+        self._backend_options = {**AUDIO_CONFIG["backend_options"], **(backend_options or {})}
+        self._stream: Optional[AudioBackend] = None
+        self.latency_profile: Optional[LatencyProfile] = None
+        self._latency_offset = 0.0
         self._buffer_size = 128
+        self._sample_clock = 0
+        self._pending: Deque[_ToneEvent] = deque()
+        # Everything queued is mixed into one ring of future output on the audio thread
+        self.mixer = Mixer(channels or AUDIO_CONFIG["channels"])
+        self._cue_starts: List[Tuple[int, int, str, str]] = []
+        self._cue_order = count()
+        self._loop: Optional[Tuple[np.ndarray, int]] = None
+        self._sequence: Optional[_CueSequence] = None
+        self._cue_log: Deque[CueTiming] = deque(maxlen=CUE_LOG_SIZE)
         self.cached_tones = {}
         self.shot_type = "long_game"
         self.backswing_time = 0
         self.downswing_time = 0
+        self.timeline: Optional[SwingTimeline] = None
+        self._timeline_origin: Optional[int] = None
+        self._next_cycle = 0
         self.audio_cache = AudioCache()
-        
-        # Initialize text-to-speech engine
-        self.tts_engine = pyttsx3.init()
-        self.tts_engine.setProperty('rate', 150)  # Speed of speech
-        self.tts_engine.setProperty('volume', 0.9)  # Volume level
+
+        # Voice prompts are rendered once in the background and mixed like tones
+        self.voice = VoicePrompts(self.audio_cache)
+        self.voice.prerender(default_prompts())
+
+    @property
+    def sample_rate(self) -> int:
+        return AUDIO_CONFIG["sample_rate"]
+
+    @property
+    def channels(self) -> int:
+        return self.mixer.channels
+
+    @property
+    def sample_clock(self) -> int:
+        """Index of the next sample the output stream will render"""
+        return self._sample_clock
 
     def set_shot_type(self, shot_type: str) -> None:
         """Set the shot type to use appropriate tones"""
-        self.shot_type = shot_type.lower().replace(" ", "_")
-        if self.shot_type not in AUDIO_CONFIG:
-            self.shot_type = "long_game"
+        self.shot_type = shot_type_key(shot_type)
 
     def preload_swing_tones(self, backswing_s: float, downswing_s: float) -> None:
         """Preload all tones including the new metronome tone"""
-        config = AUDIO_CONFIG[self.shot_type]
-        sample_rate = AUDIO_CONFIG["sample_rate"]
-
-        # Add metronome tone to cached_tones
-        self.cached_tones = {
-            'metronome': self.audio_cache.get_tone(
-                'metronome',
-                freq=330,    # E4 note - softer than main tones
-                duration_s=0.050,  # Short duration for rhythm
-                volume=0.5,   # Lower volume than swing tones
-                sample_rate=sample_rate
-            ),
-            'backswing_start': self.audio_cache.get_tone(
-                'backswing',
-                freq=440,    # A4 note
-                duration_s=0.100,
-                volume=config['backswing']['volume'],
-                sample_rate=sample_rate
-            ),
-            'downswing_start': self.audio_cache.get_tone(
-                'downswing',
-                freq=554.37,  # C#5 note
-                duration_s=0.100,
-                volume=config['downswing']['volume'],
-                sample_rate=sample_rate
-            ),
-            'impact': self.audio_cache.get_tone(
-                'impact',
-                freq=659.25,  # E5 note
-                duration_s=0.100,
-                volume=config['impact']['volume'],
-                sample_rate=sample_rate
-            )
-        }
-
-        # Initialize audio streams for each tone
-        for tone_name, tone_data in self.cached_tones.items():
-            if tone_name not in self._streams or self._streams[tone_name].closed:
-                self._streams[tone_name] = sd.OutputStream(
-                    samplerate=sample_rate,
-                    channels=1,
-                    dtype=np.float32,
-                    blocksize=self._buffer_size
-                )
-                self._streams[tone_name].start()
+        self.cached_tones = load_swing_tones(self.shot_type, self.audio_cache)
+        self._ensure_stream()
 
-    def play(self, tone_name: str) -> None:
-        """Play a specific tone"""
-        if tone_name in self.cached_tones:
-            if tone_name not in self._streams or self._streams[tone_name].closed:
-                self._streams[tone_name] = sd.OutputStream(
-                    samplerate=AUDIO_CONFIG["sample_rate"],
-                    channels=1,
-                    dtype=np.float32,
-                    blocksize=self._buffer_size
+    @property
+    def backend(self) -> Optional[AudioBackend]:
+        """Backend currently driving the output stream"""
+        return self._stream
+
+    @property
+    def output_latency(self) -> float:
+        """
+        Seconds from a sample being rendered to it being heard
+        A calibrated profile for the device wins over the host API's estimate
+        """
+        if self.latency_profile is not None:
+            return self.latency_profile.latency
+        return self._stream.latency if self._stream is not None else 0.0
+
+    @property
+    def latency_samples(self) -> int:
+        """output_latency in samples: how far ahead of its hearing a sample must be rendered"""
+        return round(self.output_latency * self.sample_rate)
+
+    def start(self) -> None:
+        """Open the output stream now rather than on the first queued sound"""
+        self._ensure_stream()
+
+    def _ensure_stream(self) -> None:
+        """Open the shared output stream if it is not already running"""
+        if self._stream is None or self._stream.closed:
+            if isinstance(self._backend_spec, AudioBackend):
+                self._stream = self._backend_spec
+                if self._stream.channels != self.mixer.channels:
+                    self.mixer = Mixer(self._stream.channels)
+            else:
+                self._stream = create_backend(
+                    self._backend_spec,
+                    self.sample_rate,
+                    channels=self.mixer.channels,
+                    blocksize=self._buffer_size,
+                    **self._backend_options
                 )
-                self._streams[tone_name].start()
+            self.mixer.reset(self._sample_clock)
+            self._stream.start(self._callback)
+            self._load_latency_profile()
+
+    def _load_latency_profile(self) -> None:
+        """Pick up the calibration saved for this device, if any"""
+        try:
+            self.latency_profile = find_profile(self._stream)
+        except Exception:
+            # A device that cannot be named or a damaged profile file just means uncalibrated
+            self.latency_profile = None
+        # PortAudio's DAC times already include its reported latency
+        self._latency_offset = self.output_latency - self._stream.latency
+
+    def _callback(self, outdata: np.ndarray, frames: int, time_info, status) -> None:
+        """Mix newly queued tones into the ring, then copy this block out of it"""
+        block_start = self._sample_clock
+        block_end = block_start + frames
+
+        sequence = self._sequence
+        if sequence is not None:
+            while sequence.next is not None and sequence.next[1] < block_end:
+                name, at = sequence.next
+                if name in self.cached_tones:
+                    self._start_event(_ToneEvent(self.cached_tones[name], at, name))
+                sequence.next = next(sequence.onsets, None)
+
+        while self._pending:
+            self._start_event(self._pending.popleft())
+
+        out = outdata[:frames]
+        self.mixer.mix(out)
+
+        loop = self._loop
+        if loop is not None:
+            mix_loop(out[:, 0], loop[0], loop[1], block_start)
+
+        # Stamp each cue starting in this block with when its first sample hits the DAC
+        block_time = None
+        while self._cue_starts and self._cue_starts[0][0] < block_end:
+            start, _, name, source = heapq.heappop(self._cue_starts)
+            if block_time is None:
+                latency = self._stream.latency if self._stream is not None else 0.0
+                block_time = block_dac_time(time_info, latency) + self._latency_offset
+            self._cue_log.append(CueTiming(
+                name,
+                start,
+                block_time + (start - block_start) / self.sample_rate,
+                source
+            ))
+
+        # Overlapping tones are summed, so hard-limit to full scale
+        np.clip(out, -1.0, 1.0, out=out)
+        self._sample_clock = block_end
+
+    def _start_event(self, event: _ToneEvent) -> None:
+        # Late events start at the first sample we can still render
+        start = self.mixer.add(event.samples, event.start, event.channel, event.gain)
+        if event.name is not None:
+            heapq.heappush(self._cue_starts, (start, next(self._cue_order), event.name, event.source))
+
+    def start_loop(self, cycle: np.ndarray, at_sample: Optional[int] = None) -> int:
+        """Loop a pre-rendered cycle gaplessly from a sample index, returning it"""
+        self._ensure_stream()
+        loop_start = self._sample_clock if at_sample is None else int(at_sample)
+        self._loop = (cycle, loop_start)
+        return loop_start
+
+    def stop_loop(self) -> None:
+        """Stop the looping cycle at the next block"""
+        self._loop = None
+
+    def start_timeline(self, timeline: SwingTimeline, at_sample: Optional[int] = None) -> int:
+        """
+        Play a timeline's cycles back to back from a sample index, returning it
+        The callback queues each cue at its exact onset as its block comes up,
+        so the sequence runs for any length in constant memory and never drifts
+        """
+        self._ensure_stream()
+        origin = self._sample_clock if at_sample is None else int(at_sample)
+        self._sequence = _CueSequence(timeline.iter_onsets(origin))
+        return origin
 
-            self._streams[tone_name].write(self.cached_tones[tone_name])
-            sd.play(self.cached_tones[tone_name], AUDIO_CONFIG["sample_rate"])
-            sd.wait()  # Wait for the sound to finish playing
+    def stop_timeline(self) -> None:
+        """Stop queuing timeline cues at the next block; cues already playing finish"""
+        self._sequence = None
 
-    def speak(self, text: str) -> None:
-        """Speak the given text using text-to-speech"""
-        self.tts_engine.say(text)
-        self.tts_engine.runAndWait()
+    def seconds_until(self, sample: int) -> float:
+        """Time until the stream renders a sample index, or 0 if it already has"""
+        return max(0, sample - self._sample_clock) / self.sample_rate
 
-    def play_swing_sequence(self) -> None:
-        """Play a complete swing sequence with preparation rhythm"""
-        # Play pro name announcement
-        if hasattr(self, 'current_pro'):
-            self.speak(f"Starting {self.current_pro}")
-            time.sleep(0.5)  # Brief pause after pro announcement
-        
-        # Play "Address the ball" voice prompt
-        self.speak("Address the ball")
-        time.sleep(1)  # Brief pause after the voice prompt
-        
-        # Play 4 metronome beats to establish rhythm
-        beat_interval = self.backswing_time / 3  # Divide backswing into 3 beats
-        for _ in range(4):
-            self.play('metronome')
-            time.sleep(beat_interval)
-
-        # First tone - Start takeaway
-        self.play('backswing_start')
-        
-        # Wait for backswing duration
-        time.sleep(self.backswing_time)
+    def schedule(self, tone_name: str, at_sample: int, channel: int = 0, gain: float = 1.0) -> None:
+        """Queue a tone to start at an absolute sample index without blocking"""
+        if tone_name in self.cached_tones:
+            self._ensure_stream()
+            self._check_channel(channel)
+            self._pending.append(_ToneEvent(
+                self.cached_tones[tone_name], int(at_sample), tone_name, channel=channel, gain=gain))
 
-        # Second tone - Start downswing
-        self.play('downswing_start')
+    def _check_channel(self, channel: int) -> None:
+        # Checked on the caller's thread so a bad route never reaches the audio callback
+        if not 0 <= channel < self.mixer.channels:
+            raise ValueError(f"channel must be between 0 and {self.mixer.channels - 1}, got {channel}")
 
-        # Third tone - Impact
-        time.sleep(self.downswing_time)
-        self.play('impact')
+    def play(self, tone_name: str) -> None:
+        """Play a specific tone as soon as the next block is rendered"""
+        self.schedule(tone_name, self._sample_clock)
+
+    def drain_cues(self) -> List[CueTiming]:
+        """Cues played since the last call, oldest first"""
+        cues = []
+        while self._cue_log:
+            cues.append(self._cue_log.popleft())
+        return cues
+
+    def play_clip(self,
+                  samples: np.ndarray,
+                  at_sample: Optional[int] = None,
+                  name: Optional[str] = None,
+                  source: str = "",
+                  channel: int = 0,
+                  gain: float = 1.0) -> None:
+        """
+        Queue arbitrary samples on the output stream without blocking
+        Named clips are timestamped like cues, tagged with their `source`
+        """
+        self._ensure_stream()
+        self._check_channel(channel)
+        start = self._sample_clock if at_sample is None else int(at_sample)
+        self._pending.append(_ToneEvent(samples, start, name, source, channel, gain))
 
-        # Rest before next sequence
-        time.sleep(1.5)
+    def speak(self, text: str, at_sample: Optional[int] = None) -> bool:
+        """
+        Play a pre-rendered voice prompt on the output stream
+        Prompts that are not rendered yet are queued for rendering and skipped,
+        so speech never delays a cue
+        """
+        clip = self.voice.get(text)
+        if clip is None:
+            self.voice.prerender([text])
+            return False
+        self.play_clip(clip, at_sample)
+        return True
+
+    def play_swing_sequence(self) -> int:
+        """
+        Queue the next swing cycle with its prompts and preparation rhythm
+        Cues go on the sample clock at the timeline's exact onsets, with cycles
+        following each other back to back, so nothing here sleeps and a long
+        session never drifts.  The timeline is laid out in when cues are heard:
+        each is rendered the device's output latency ahead of its onset.
+        Returns the sample the next cycle's first sound is rendered on
+        """
+        timeline = self.timeline
+        if timeline is None:
+            raise RuntimeError("Call set_timing() or set_timeline() before playing a swing")
+        self._ensure_stream()
+        lead = self.latency_samples
+
+        # First cycle, or the caller fell behind: re-anchor so this cycle plays whole
+        earliest = self._sample_clock + round(SCHEDULE_AHEAD_S * self.sample_rate) + lead
+        cycle = self._next_cycle
+        if self._timeline_origin is None or self._timeline_origin + timeline.cycle_start(cycle) < earliest:
+            self._timeline_origin = earliest - timeline.cycle_start(cycle)
+        origin = self._timeline_origin - lead
+        start = origin + timeline.cycle_start(cycle)
+        self._next_cycle += 1
+
+        # Prompts fill the timeline's lead-in before the count-in
+        if hasattr(self, 'current_pro'):
+            self.speak(announcement(self.current_pro), start)
+        self.speak("Address the ball", start + timeline.to_sample(ADDRESS_PROMPT_S))
+
+        for name, at in timeline.onsets(cycle):
+            self.schedule(name, origin + at)
+        return origin + timeline.cycle_start(cycle + 1)
 
     def cleanup(self) -> None:
         """Clean up audio resources"""
-        for stream in self._streams.values():
-            stream.stop()
-            stream.close()
-        self._streams.clear()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        self._pending.clear()
+        self.mixer.reset(self._sample_clock)
+        self._cue_starts = []
+        self._loop = None
+        self._sequence = None
+        self._timeline_origin = None
+        self._next_cycle = 0
+        self._cue_log.clear()
         
-        # Stop and close the TTS engine
-        self.tts_engine.stop()
+        # Stop the voice render worker
+        self.voice.shutdown()
 
     def set_timing(self, backswing_time: float, downswing_time: float) -> None:
         """Set the timing values for the swing sequence"""
         self.backswing_time = backswing_time
         self.downswing_time = downswing_time
+        self.set_timeline(SwingTimeline(exact(backswing_time), exact(downswing_time),
+                                        self.sample_rate, lead_in=PROMPT_LEAD_S))
+
+    def set_timeline(self, timeline: SwingTimeline) -> None:
+        """Play swing sequences from an exact timeline, starting a new session"""
+        self.timeline = timeline
+        self.backswing_time = float(timeline.backswing)
+        self.downswing_time = float(timeline.downswing)
+        self._timeline_origin = None
+        self._next_cycle = 0
+
+    def switch_timeline(self, timeline: SwingTimeline) -> None:
+        """
+        Play swing sequences from a new timeline from the next cycle boundary on
+        Unlike set_timeline() the running schedule is kept, so the new timeline's
+        first cycle starts exactly where the last queued cycle ends
+        """
+        if self.timeline is None or self._timeline_origin is None:
+            self.set_timeline(timeline)
+            return
+        self._timeline_origin += self.timeline.cycle_start(self._next_cycle)
+        self._next_cycle = 0
+        self.timeline = timeline
+        self.backswing_time = float(timeline.backswing)
+        self.downswing_time = float(timeline.downswing)
 
     def set_current_pro(self, pro_name: str) -> None:
         """Set the current pro name for announcements"""
         self.current_pro = pro_name
+        self.voice.prerender([announcement(pro_name)])
@@ -0,0 +1,220 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Type, Union
+import numpy as np
+
+# Same signature as a sounddevice output callback
+Callback = Callable[[np.ndarray, int, object, object], None]
+
+
+class BlockTime(NamedTuple):
+    """Stand-in for PortAudio's callback time info on virtual backends"""
+    currentTime: float
+    outputBufferDacTime: float
+
+
+class AudioBackend:
+    """Output sink that repeatedly asks a callback to fill blocks of samples"""
+    name = "base"
+
+    def __init__(self, sample_rate: int, channels: int = 1, blocksize: int = 128):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.closed = True
+
+    @property
+    def latency(self) -> float:
+        """Reported output latency in seconds"""
+        return 0.0
+
+    @property
+    def device_name(self) -> str:
+        """Name latency profiles are stored under"""
+        return self.name
+
+    def start(self, callback: Callback) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.stop()
+        self.closed = True
+
+
+class SoundDeviceBackend(AudioBackend):
+    """
+    Real output through PortAudio
+    `stream_latency` is PortAudio's 'low' or 'high' setting; calibration runs
+    its loopback at the same setting so a saved profile describes this stream
+    """
+    name = "sounddevice"
+
+    def __init__(self, sample_rate: int, channels: int = 1, blocksize: int = 128,
+                 device: Optional[Union[int, str]] = None, stream_latency: str = "low"):
+        super().__init__(sample_rate, channels, blocksize)
+        self.device = device
+        self.stream_latency = stream_latency
+        self._stream = None
+
+    @property
+    def latency(self) -> float:
+        return float(getattr(self._stream, "latency", 0.0) or 0.0)
+
+    @property
+    def device_name(self) -> str:
+        import sounddevice as sd
+
+        info = sd.query_devices(self.device, 'output')
+        host_api = sd.query_hostapis(info['hostapi'])['name']
+        return f"{info['name']} ({host_api})"
+
+    def start(self, callback: Callback) -> None:
+        import sounddevice as sd
+
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype=np.float32,
+            blocksize=self.blocksize,
+            device=self.device,
+            latency=self.stream_latency,
+            callback=callback
+        )
+        self._stream.start()
+        self.closed = False
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        self.closed = True
+
+
+class NullBackend(AudioBackend):
+    """
+    Renders blocks and discards them, advancing only a sample clock
+    With realtime=True a thread paces blocks like a sound card; otherwise the
+    caller drives rendering with pump()
+    """
+    name = "null"
+
+    def __init__(self, sample_rate: int, channels: int = 1, blocksize: int = 128,
+                 realtime: bool = True):
+        super().__init__(sample_rate, channels, blocksize)
+        self.realtime = realtime
+        self.frames_rendered = 0
+        self._callback: Optional[Callback] = None
+        self._buffer = np.zeros((blocksize, channels), dtype=np.float32)
+        self._start_time = 0.0
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, callback: Callback) -> None:
+        self._callback = callback
+        self._start_time = time.perf_counter()
+        self.closed = False
+        if self.realtime:
+            self._running.set()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-sink", daemon=True)
+            self._thread.start()
+
+    def pump(self, frames: int) -> None:
+        """Synchronously render enough whole blocks to cover `frames` samples"""
+        for _ in range(-(-frames // self.blocksize)):
+            self._render_block()
+
+    def _render_block(self) -> None:
+        # The virtual DAC plays each block exactly when the sample clock says
+        dac_time = self._start_time + self.frames_rendered / self.sample_rate
+        self._buffer.fill(0.0)
+        self._callback(self._buffer, self.blocksize, BlockTime(dac_time, dac_time), None)
+        self._consume(self._buffer)
+        self.frames_rendered += self.blocksize
+
+    def _consume(self, block: np.ndarray) -> None:
+        pass
+
+    def _run(self) -> None:
+        period = self.blocksize / self.sample_rate
+        deadline = time.perf_counter()
+        while self._running.is_set():
+            self._render_block()
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class MemoryBackend(NullBackend):
+    """Keeps every rendered block so callers can assert exact sample positions"""
+    name = "memory"
+
+    def __init__(self, sample_rate: int, channels: int = 1, blocksize: int = 128,
+                 realtime: bool = False):
+        super().__init__(sample_rate, channels, blocksize, realtime)
+        self._blocks: List[np.ndarray] = []
+
+    def _consume(self, block: np.ndarray) -> None:
+        self._blocks.append(block.copy())
+
+    def recorded(self) -> np.ndarray:
+        """Everything rendered so far as a (frames, channels) array"""
+        if not self._blocks:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(self._blocks)
+
+
+class FileBackend(NullBackend):
+    """Streams every rendered block to a WAV/FLAC file"""
+    name = "file"
+
+    def __init__(self, sample_rate: int, channels: int = 1, blocksize: int = 128,
+                 path: Union[str, Path] = "session.wav", realtime: bool = True):
+        super().__init__(sample_rate, channels, blocksize, realtime)
+        self.path = Path(path)
+        self._file = None
+
+    def start(self, callback: Callback) -> None:
+        import soundfile as sf
+
+        self._file = sf.SoundFile(str(self.path), 'w', samplerate=self.sample_rate,
+                                  channels=self.channels)
+        super().start(callback)
+
+    def _consume(self, block: np.ndarray) -> None:
+        self._file.write(block)
+
+    def close(self) -> None:
+        super().close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+BACKENDS: Dict[str, Type[AudioBackend]] = {
+    backend.name: backend
+    for backend in (SoundDeviceBackend, NullBackend, MemoryBackend, FileBackend)
+}
+
+
+def create_backend(name: str, sample_rate: int, channels: int = 1, blocksize: int = 128,
+                   **options) -> AudioBackend:
+    """Build a backend by its config/CLI name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown audio backend: {name} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](sample_rate, channels=channels, blocksize=blocksize, **options)
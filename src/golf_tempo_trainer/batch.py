@@ -0,0 +1,137 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Union
+from .tempo import SwingTempo, grade_ratio, ratio_error
+
+AUDIO_EXTENSIONS = (".wav", ".flac")
+READ_BLOCK_SIZE = 65536  # Offline reads use big chunks; detection matches live 256-sample blocks
+
+
+@dataclass
+class SwingRow:
+    """One detected swing in SwingTiming terms, graded like TempoTrainer.analyze_timing"""
+    file: str
+    swing: int
+    start_s: float
+    backswing: float
+    downswing: float
+    total: float
+    ratio: float
+    ratio_error: float
+    grade: str
+
+
+@dataclass
+class FileResult:
+    path: str
+    swings: List[SwingRow] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def find_audio_files(directory: Union[str, Path]) -> List[Path]:
+    """Every WAV/FLAC file under a directory, in a stable order"""
+    return sorted(
+        path for path in Path(directory).rglob("*")
+        if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS
+    )
+
+
+def analyze_file(path: Union[str, Path],
+                 tempo: SwingTempo,
+                 block_size: int = READ_BLOCK_SIZE) -> FileResult:
+    """
+    Detect and grade every swing in one recording
+    The file is streamed in chunks, so memory does not grow with its length.
+    Failures are returned in the result rather than raised, so one bad file
+    does not stop a batch
+    """
+    import soundfile as sf
+    from .onset import SwingListener
+
+    result = FileResult(str(path))
+    try:
+        listener = SwingListener(tempo, sf.info(str(path)).samplerate)
+        timings = listener.feed_file(path, block_size)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+
+    for number, (timing, start) in enumerate(zip(timings, listener.swing_starts), start=1):
+        error = ratio_error(timing.ratio, tempo.ratio)
+        result.swings.append(SwingRow(
+            file=str(path),
+            swing=number,
+            start_s=start,
+            backswing=timing.backswing,
+            downswing=timing.downswing,
+            total=timing.total,
+            ratio=timing.ratio,
+            ratio_error=error,
+            grade=grade_ratio(error)
+        ))
+    return result
+
+
+def analyze_directory(directory: Union[str, Path],
+                      tempo: SwingTempo,
+                      workers: Optional[int] = None) -> List[FileResult]:
+    """
+    Analyze every recording under a directory across a process pool
+    Onset detection is CPU bound, so files run in separate processes; results
+    come back in file order whatever order they finish in
+    """
+    paths = find_audio_files(directory)
+    if not paths:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers == 1:
+        return [analyze_file(path, tempo) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(analyze_file, tempo=tempo), paths))
+
+
+def write_summary(results: List[FileResult], path: Union[str, Path]) -> int:
+    """Write every swing of every file as one CSV table, returning the row count"""
+    columns = [column.name for column in fields(SwingRow)]
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as summary_file:
+        writer = csv.DictWriter(summary_file, fieldnames=columns)
+        writer.writeheader()
+        for result in results:
+            for swing in result.swings:
+                writer.writerow(asdict(swing))
+                rows += 1
+    return rows
+
+
+def format_summary(results: List[FileResult], tempo: SwingTempo) -> str:
+    """Per-file averages and grade counts as a text table"""
+    lines = [
+        f"=== Batch Analysis - {tempo.pro_name} ({tempo.ratio:.1f}:1) ===",
+        f"{'File':<32} {'Swings':>6} {'Back':>7} {'Down':>7} {'Ratio':>6} {'Excel':>5} {'Good':>5} {'Focus':>5}",
+    ]
+    for result in results:
+        name = Path(result.path).name[:32]
+        if result.error:
+            lines.append(f"{name:<32} {result.error}")
+            continue
+        swings = result.swings
+        if not swings:
+            lines.append(f"{name:<32} {0:>6}")
+            continue
+        count = len(swings)
+        grades = [swing.grade for swing in swings]
+        lines.append(
+            f"{name:<32} {count:>6} "
+            f"{sum(s.backswing for s in swings) / count:>6.3f}s "
+            f"{sum(s.downswing for s in swings) / count:>6.3f}s "
+            f"{sum(s.ratio for s in swings) / count:>6.2f} "
+            f"{grades.count('excellent'):>5} {grades.count('good'):>5} {grades.count('focus'):>5}"
+        )
+    total = sum(len(result.swings) for result in results)
+    lines.append(f"{len(results)} files, {total} swings")
+    return "\n".join(lines)
@@ -0,0 +1,335 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Union
+import numpy as np
+from .audio import AudioPlayer, CueTiming, load_swing_tones
+from .backends import AudioBackend
+from .drills import TempoRamp
+from .stats import SessionStats
+from .tempo import SwingTempo, SwingTiming, grade_ratio, ratio_error
+from .timeline import SwingTimeline
+from .trainer import measure_swing
+
+SCHEDULER_TICK_S = 0.02  # How often the scheduler queues cycles and routes played cues
+LOOKAHEAD_S = 0.25       # Cycles are queued once they start within this window
+START_AHEAD_S = 0.05     # A new or late session starts this far ahead of the stream
+
+Listener = Callable[[Dict], None]
+
+
+@dataclass
+class BaySession:
+    """
+    One hitting bay's tempo session
+    Holds no thread or stream of its own: the manager's scheduler queues its
+    cycles on the shared output and routes its played cues back to it
+    """
+    name: str
+    tempo: SwingTempo
+    timeline: SwingTimeline
+    channel: int = 0    # Output channel the bay's speaker is wired to
+    gain: float = 1.0
+    running: bool = True
+    cycles: int = 0     # Cycles queued on the output
+    resyncs: int = 0    # Times the scheduler fell behind and restarted the timeline
+    stats: SessionStats = field(default_factory=SessionStats)
+    last_timing: Optional[SwingTiming] = None
+    drill: Optional[TempoRamp] = None
+    drill_swing: int = 0  # Next swing of the drill to queue
+    _origin: Optional[int] = None  # Sample the current timeline's cycle 0 starts on
+    _next_cycle: int = 0
+    _played: List[CueTiming] = field(default_factory=list)
+
+    @property
+    def next_start(self) -> Optional[int]:
+        """Sample the next cycle starts on, or None before the first is queued"""
+        if self._origin is None:
+            return None
+        return self._origin + self.timeline.cycle_start(self._next_cycle)
+
+    def cue_played(self, cue: CueTiming) -> Optional[SwingTiming]:
+        """Collect one cycle's cues and time it once its impact has played, returning the timing"""
+        self._played.append(cue)
+        if cue.name != 'impact':
+            return None
+        timing = measure_swing(self._played, self.tempo, self.timeline.sample_rate)
+        self._played = []
+        if timing is not None:
+            self.last_timing = timing
+            self.stats.add(timing, self.tempo.backswing_time, self.tempo.downswing_time)
+        return timing
+
+    def to_dict(self) -> Dict:
+        """The session's state as JSON-ready values"""
+        return {
+            "name": self.name,
+            "shot_type": self.tempo.shot_type,
+            "pro": self.tempo.pro_name,
+            "club": self.tempo.club,
+            "bpm": self.tempo.bpm,
+            "ratio": self.tempo.ratio,
+            "channel": self.channel,
+            "gain": self.gain,
+            "running": self.running,
+            "cycles": self.cycles,
+            "resyncs": self.resyncs,
+            "swings": self.stats.swings,
+            "excellent": self.stats.grade_share('excellent'),
+            "drill": None if self.drill is None else {
+                "swing": self.drill_swing, "swings": len(self.drill), "to": self.drill.end.pro_name,
+            },
+        }
+
+    def summary(self) -> str:
+        return (f"{self.name:<12} ch {self.channel + 1:<3} {self.tempo.pro_name:<24} {self.tempo.bpm:>5.0f} BPM  "
+                f"{self.cycles:>5} cycles  {self.resyncs:>3} resyncs  "
+                f"{self.stats.live_line() if self.stats.swings else 'no swings timed yet'}")
+
+
+def swing_event(session: BaySession, timing: SwingTiming) -> Dict:
+    """A timed swing of a session as JSON-ready values"""
+    target_ratio = session.tempo.backswing_time / session.tempo.downswing_time
+    error = ratio_error(timing.ratio, target_ratio)
+    return {
+        "type": "swing",
+        "session": session.name,
+        "pro": session.tempo.pro_name,
+        "bpm": session.tempo.bpm,
+        "backswing": timing.backswing,
+        "downswing": timing.downswing,
+        "total": timing.total,
+        "ratio": timing.ratio,
+        "target_ratio": target_ratio,
+        "error_pct": error,
+        "grade": grade_ratio(error),
+        "swings": session.stats.swings,
+    }
+
+
+class SessionManager:
+    """
+    Many independent tempo sessions on one output stream
+    One asyncio task is the only scheduler: every tick it queues each
+    session's cycles that start within the lookahead at their exact timeline
+    samples, and hands cues the stream has played back to their session.
+    Tones come from one shared cache, loaded once per shot type, and each
+    session is routed to its own channel of a multichannel device
+    Time Complexity: O(sessions) per tick
+    """
+
+    def __init__(self,
+                 backend: Optional[Union[str, AudioBackend]] = "null",
+                 backend_options: Optional[Dict] = None,
+                 channels: Optional[int] = None,
+                 tick_s: float = SCHEDULER_TICK_S,
+                 lookahead_s: float = LOOKAHEAD_S):
+        self.player = AudioPlayer(backend=backend, backend_options=backend_options, channels=channels)
+        self.tick_s = tick_s
+        self.lookahead_s = lookahead_s
+        self._sessions: Dict[str, BaySession] = {}
+        self._tones: Dict[str, Dict[str, np.ndarray]] = {}
+        self._stopping: Optional[asyncio.Event] = None
+        self._listeners: List[Listener] = []
+
+    @property
+    def sessions(self) -> List[BaySession]:
+        return list(self._sessions.values())
+
+    def get(self, name: str) -> BaySession:
+        if name not in self._sessions:
+            raise KeyError(f"No session named {name!r}")
+        return self._sessions[name]
+
+    def add_session(self,
+                    name: str,
+                    tempo: SwingTempo,
+                    running: bool = True,
+                    channel: Optional[int] = None,
+                    gain: float = 1.0) -> BaySession:
+        """Add a bay; without a channel, bays take the device's channels in turn"""
+        if name in self._sessions:
+            raise ValueError(f"Session {name!r} already exists")
+        self.player.start()
+        if channel is None:
+            channel = len(self._sessions) % self.player.channels
+        self._check_channel(channel)
+        self._load_tones(tempo.shot_type)
+        session = BaySession(name, tempo, SwingTimeline.from_tempo(tempo, self.player.sample_rate),
+                             channel=channel, gain=gain, running=running)
+        self._sessions[name] = session
+        self._session_changed(session, "added")
+        return session
+
+    def remove_session(self, name: str) -> BaySession:
+        """Stop queuing a session's cycles; cues already queued still play out"""
+        session = self.get(name)
+        del self._sessions[name]
+        self._session_changed(session, "removed")
+        return session
+
+    def start_session(self, name: str) -> None:
+        session = self.get(name)
+        if not session.running:
+            session.running = True
+            session._origin = None  # Resume from the next tick, not the old schedule
+            session._next_cycle = 0
+            session._played = []
+            self._session_changed(session, "started")
+
+    def route(self, name: str, channel: int, gain: float = 1.0) -> None:
+        """Move a session to another channel or gain from the next queued cycle on"""
+        self._check_channel(channel)
+        session = self.get(name)
+        session.channel = channel
+        session.gain = gain
+        self._session_changed(session, "routed")
+
+    def _check_channel(self, channel: int) -> None:
+        if not 0 <= channel < self.player.channels:
+            raise ValueError(f"channel must be between 0 and {self.player.channels - 1}, got {channel}")
+
+    def stop_session(self, name: str) -> None:
+        session = self.get(name)
+        if session.running:
+            session.running = False
+            self._session_changed(session, "stopped")
+
+    def switch_tempo(self, name: str, tempo: SwingTempo) -> None:
+        """Change a session's tempo from its next cycle boundary on, ending any drill"""
+        session = self.get(name)
+        self._load_tones(tempo.shot_type)
+        session.drill = None
+        self._switch(session, tempo, SwingTimeline.from_tempo(tempo, self.player.sample_rate))
+        self._session_changed(session, "tempo")
+
+    def start_drill(self, name: str, ramp: TempoRamp) -> None:
+        """Ramp a session's tempo, one step per cycle, from its next cycle boundary on"""
+        session = self.get(name)
+        self._load_tones(ramp.start.shot_type)
+        session.drill = ramp
+        session.drill_swing = 0
+        self._switch(session, ramp.tempo(0), ramp.timeline(0, self.player.sample_rate))
+        session.drill_swing = 1
+        self._session_changed(session, "drill")
+
+    def _switch(self, session: BaySession, tempo: SwingTempo, timeline: SwingTimeline) -> None:
+        # The new timeline's cycle 0 starts where the last queued cycle ends
+        boundary = session.next_start
+        session.tempo = tempo
+        session.timeline = timeline
+        session._next_cycle = 0
+        session._origin = boundary
+        session._played = []
+
+    def _next_drill_step(self, session: BaySession) -> None:
+        ramp = session.drill
+        swing = session.drill_swing
+        self._switch(session, ramp.tempo(swing), ramp.timeline(swing, self.player.sample_rate))
+        session.drill_swing += 1
+        if session.drill_swing == len(ramp):
+            session.drill = None  # Done: the session holds the final tempo
+            self._session_changed(session, "drill_done")
+
+    def add_listener(self, listener: Listener) -> None:
+        """
+        Call `listener(event)` with a JSON-ready dict for every played cue,
+        timed swing and session change, on the scheduler's thread
+        Listeners must not block: they run between scheduler ticks
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        self._listeners.remove(listener)
+
+    def _emit(self, event: Dict) -> None:
+        for listener in list(self._listeners):
+            listener(event)
+
+    def _session_changed(self, session: BaySession, change: str) -> None:
+        if self._listeners:
+            self._emit({"type": "session", "change": change, **session.to_dict()})
+
+    def _load_tones(self, shot_type: str) -> Dict[str, np.ndarray]:
+        if shot_type not in self._tones:
+            self._tones[shot_type] = load_swing_tones(shot_type, self.player.audio_cache)
+        return self._tones[shot_type]
+
+    def tick(self) -> int:
+        """
+        Queue every cycle starting within the lookahead and route played cues
+        Returns the number of cues queued
+        """
+        player = self.player
+        player.start()
+        clock = player.sample_clock
+        earliest = clock + round(START_AHEAD_S * player.sample_rate)
+        horizon = clock + round(self.lookahead_s * player.sample_rate)
+
+        queued = 0
+        for session in self._sessions.values():
+            if not session.running:
+                continue
+            start = session.next_start
+            if start is None or start < earliest:
+                # First cycle, or the scheduler fell behind: restart so the cycle plays whole
+                if start is not None:
+                    session.resyncs += 1
+                session._origin = earliest - session.timeline.cycle_start(session._next_cycle)
+                start = earliest
+            tones = self._tones[session.tempo.shot_type]
+            while start < horizon:
+                if session.drill is not None and session._next_cycle:
+                    # The next step's timeline is built here, a lookahead ahead of its boundary
+                    self._next_drill_step(session)
+                for cue, at in session.timeline.onsets(session._next_cycle):
+                    player.play_clip(tones[cue], session._origin + at, cue, session.name,
+                                     session.channel, session.gain)
+                    queued += 1
+                session._next_cycle += 1
+                session.cycles += 1
+                start = session.next_start
+
+        for cue in player.drain_cues():
+            session = self._sessions.get(cue.source)
+            if session is None:
+                continue
+            timing = session.cue_played(cue)
+            if self._listeners:
+                self._emit({"type": "cue", "session": session.name, "cue": cue.name,
+                            "sample": cue.sample, "time": cue.time})
+                if timing is not None:
+                    self._emit(swing_event(session, timing))
+        return queued
+
+    async def run(self, duration: Optional[float] = None) -> None:
+        """Run the scheduler until stop() is called or `duration` seconds have passed"""
+        loop = asyncio.get_running_loop()
+        deadline = None if duration is None else loop.time() + duration
+        self._stopping = asyncio.Event()
+        try:
+            while not self._stopping.is_set():
+                self.tick()
+                wait = self.tick_s
+                if deadline is not None:
+                    wait = min(wait, deadline - loop.time())
+                    if wait <= 0:
+                        break
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._stopping = None
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def close(self) -> None:
+        self.stop()
+        self.player.cleanup()
+
+    def format_report(self) -> str:
+        lines = [f"=== {len(self._sessions)} Bay Sessions ==="]
+        lines += [session.summary() for session in self._sessions.values()]
+        return "\n".join(lines)
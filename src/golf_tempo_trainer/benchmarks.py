@@ -0,0 +1,308 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+# Modules on the path to the interactive menu and to the first audible cue
+STARTUP_MODULES = (
+    "golf_tempo_trainer.__main__",
+    "golf_tempo_trainer.trainer",
+    "golf_tempo_trainer.audio",
+)
+
+_IMPORT_SNIPPET = """
+import json, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+_FIRST_CUE_SNIPPET = """
+import json, time
+start = time.perf_counter()
+from golf_tempo_trainer.audio import AudioPlayer
+player = AudioPlayer()
+player.preload_swing_tones(0.75, 0.25)
+player.play('backswing_start')
+queued = time.perf_counter()
+player.cleanup()
+print(json.dumps({"seconds": queued - start}))
+"""
+
+
+def _run_cold(code: str) -> float:
+    """Run a snippet in a fresh interpreter and return the seconds it reports"""
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    # A scratch working directory keeps the snippet's tone cache out of the caller's
+    with tempfile.TemporaryDirectory() as run_dir:
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", code],
+            capture_output=True, text=True, env=env, check=True, cwd=run_dir
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])["seconds"]
+
+
+def _best_of(code: str, repeat: int) -> Optional[float]:
+    try:
+        return min(_run_cold(code) for _ in range(repeat))
+    except subprocess.CalledProcessError:
+        # No audio device or backend available on this machine
+        return None
+
+
+def measure_startup(repeat: int = 5) -> Dict[str, Optional[float]]:
+    """
+    Cold-start timings in seconds, best of `repeat` fresh interpreters
+    Interpreter start-up itself is excluded; None marks a step that failed
+    """
+    results: Dict[str, Optional[float]] = {}
+    for module in STARTUP_MODULES:
+        results[f"import {module}"] = _best_of(_IMPORT_SNIPPET.format(module=module), repeat)
+    results["first cue"] = _best_of(_FIRST_CUE_SNIPPET, repeat)
+    return results
+
+
+def format_startup_report(results: Dict[str, Optional[float]]) -> str:
+    return format_report(results, "Startup Benchmark", decimals=1)
+
+
+def format_report(results: Dict[str, Optional[float]],
+                  title: str = "Benchmark",
+                  decimals: int = 3) -> str:
+    width = max(len(name) for name in results)
+    lines: List[str] = [f"=== {title} ==="]
+    for name, seconds in results.items():
+        value = "unavailable" if seconds is None else f"{seconds * 1000:8.{decimals}f} ms"
+        lines.append(f"{name:<{width}}  {value}")
+    return "\n".join(lines)
+
+
+# In-process benchmarks: every result is seconds, lower is better
+
+SCHEDULER_DEADLINES = 200
+SCHEDULER_INTERVAL_S = 0.002
+NULL_SINK_SECONDS = 0.5
+SESSION_SWINGS = 20
+BAY_SESSIONS = 50
+BAY_AUDIO_S = 60.0
+BAY_CHANNELS = 8
+
+
+def _best_time(fn: Callable[[], object], repeat: int) -> float:
+    """Fastest of `repeat` calls, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _p99(samples: List[float]) -> float:
+    from .timer import jitter_stats
+
+    return jitter_stats(samples).p99
+
+
+def bench_synthesis(repeat: int) -> Dict[str, Optional[float]]:
+    from .audio import Tone, ToneGenerator
+
+    results: Dict[str, Optional[float]] = {}
+    try:
+        results["Tone.generate 100ms"] = _best_time(lambda: Tone(440, 100).generate(), repeat)
+    except ImportError:
+        results["Tone.generate 100ms"] = None  # pydub not installed
+
+    for engine in ("wavetable", "numpy"):
+        generator = ToneGenerator(engine=engine)
+        results[f"{engine} sweep 1s"] = _best_time(
+            lambda: generator.generate_sweep(660, 220, 1.0), repeat)
+        results[f"{engine} impact click"] = _best_time(generator.generate_impact_click, repeat)
+    return results
+
+
+def bench_cache(repeat: int, cache_dir: Path) -> Dict[str, Optional[float]]:
+    """get_tone on a cold cache (synthesis + bank write), from the bank on disk, and from memory"""
+    from .audio import AudioCache
+    from .config import AUDIO_CONFIG
+
+    sample_rate = AUDIO_CONFIG["sample_rate"]
+    cold, disk, memory = [], [], []
+    for run in range(repeat):
+        run_dir = cache_dir / f"cache_{run}"
+        run_dir.mkdir()
+        request = ("bench", 440.0 + run, 0.5, 0.8, sample_rate)
+
+        cache = AudioCache()
+        cache.cache_dir = run_dir
+        cold.append(_best_time(lambda: cache.get_tone(*request), 1))
+        memory.append(_best_time(lambda: cache.get_tone(*request), 1))
+
+        reopened = AudioCache()
+        reopened.cache_dir = run_dir
+        disk.append(_best_time(lambda: reopened.get_tone(*request), 1))
+
+    return {
+        "AudioCache cold": min(cold),
+        "AudioCache disk": min(disk),
+        "AudioCache memory": min(memory),
+    }
+
+
+def bench_session_render(repeat: int, out_dir: Path) -> Dict[str, Optional[float]]:
+    from .audio import AudioCache
+    from .catalog import default_catalog
+    from .render import render_session
+
+    catalog = default_catalog()
+    tempo = catalog.get("Long Game", catalog.pros("Long Game")[0])
+    cache = AudioCache()
+    cache.cache_dir = out_dir
+    try:
+        seconds = _best_time(
+            lambda: render_session(tempo, SESSION_SWINGS, out_dir / "session.wav", cache), repeat)
+    except ImportError:
+        seconds = None  # soundfile not installed
+    return {f"render session ({SESSION_SWINGS} swings)": seconds}
+
+
+def bench_scheduler() -> Dict[str, Optional[float]]:
+    """p99 lateness of timer deadlines and of null-sink blocks against their ideal times"""
+    from .backends import NullBackend
+    from .config import AUDIO_CONFIG
+    from .timer import TimerService
+
+    results: Dict[str, Optional[float]] = {}
+    for mode in ("low_jitter", "low_cpu"):
+        timer = TimerService(mode)
+        try:
+            start = time.perf_counter() + 0.01
+            for i in range(SCHEDULER_DEADLINES):
+                timer.sleep_until(start + i * SCHEDULER_INTERVAL_S)
+            results[f"timer p99 lateness ({mode})"] = max(0.0, timer.jitter().p99)
+        finally:
+            timer.stop()
+
+    sample_rate = AUDIO_CONFIG["sample_rate"]
+    backend = NullBackend(sample_rate, blocksize=128)
+    called: List[float] = []
+    backend.start(lambda outdata, frames, time_info, status: called.append(time.perf_counter()))
+    time.sleep(NULL_SINK_SECONDS)
+    backend.close()
+
+    period = backend.blocksize / sample_rate
+    lateness = [at - called[0] - i * period for i, at in enumerate(called)]
+    results["null sink p99 block lateness"] = max(0.0, _p99(lateness)) if lateness else None
+    return results
+
+
+def bench_bays(sessions: int = BAY_SESSIONS,
+               seconds: float = BAY_AUDIO_S,
+               channels: int = BAY_CHANNELS) -> Dict[str, Optional[float]]:
+    """
+    Wall time for the session manager to drive many bays, spread over a
+    multichannel output, through `seconds` of audio on a null sink pumped as
+    fast as possible, scheduler and mixing included
+    """
+    from .backends import NullBackend
+    from .bays import SessionManager
+    from .catalog import default_catalog
+    from .config import AUDIO_CONFIG
+
+    sample_rate = AUDIO_CONFIG["sample_rate"]
+    backend = NullBackend(sample_rate, channels=channels, blocksize=128, realtime=False)
+    manager = SessionManager(backend=backend, channels=channels)
+    tempos = list(default_catalog())
+    for i in range(sessions):
+        manager.add_session(f"Bay {i + 1}", tempos[i % len(tempos)])
+
+    tick_frames = round(manager.tick_s * sample_rate)
+    try:
+        start = time.perf_counter()
+        for _ in range(round(seconds / manager.tick_s)):
+            manager.tick()
+            backend.pump(tick_frames)
+        elapsed = time.perf_counter() - start
+    finally:
+        manager.close()
+    return {f"{sessions} bay sessions on {channels} channels ({seconds:.0f}s of audio)": elapsed}
+
+
+def run_benchmarks(repeat: int = 5, startup: bool = True) -> Dict[str, Optional[float]]:
+    """Every benchmark, as {name: seconds}; None marks one that could not run here"""
+    results: Dict[str, Optional[float]] = {}
+    results.update(bench_synthesis(repeat))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results.update(bench_cache(repeat, Path(tmp_dir)))
+        results.update(bench_session_render(repeat, Path(tmp_dir)))
+    results.update(bench_scheduler())
+    results.update(bench_bays())
+    if startup:
+        results.update(measure_startup(repeat))
+    return results
+
+
+def save_results(results: Dict[str, Optional[float]], path: Union[str, Path]) -> None:
+    """Write results as JSON along with the machine they were measured on"""
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "created": time.time(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(document, results_file, indent=2)
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, Optional[float]]:
+    with open(path, encoding="utf-8") as results_file:
+        return json.load(results_file)["results"]
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative slowdown, e.g. 0.3 for 30% slower"""
+        return self.current / self.baseline - 1 if self.baseline > 0 else float("inf")
+
+
+def compare_results(current: Dict[str, Optional[float]],
+                    baseline: Dict[str, Optional[float]],
+                    tolerance: float = 0.25,
+                    min_delta: float = 50e-6) -> List[Regression]:
+    """
+    Benchmarks more than `tolerance` slower than the baseline; ones missing from either are skipped
+    Slowdowns under `min_delta` seconds are timer noise on microbenchmarks and never count
+    """
+    regressions = []
+    for name, seconds in current.items():
+        before = baseline.get(name)
+        if seconds is None or before is None:
+            continue
+        if seconds > before * (1 + tolerance) and seconds - before > min_delta:
+            regressions.append(Regression(name, before, seconds))
+    return regressions
+
+
+def format_regressions(regressions: List[Regression]) -> str:
+    if not regressions:
+        return "No regressions against baseline"
+    lines = ["=== Regressions ==="]
+    for regression in regressions:
+        lines.append(f"{regression.name}: {regression.baseline * 1000:.3f} ms -> "
+                     f"{regression.current * 1000:.3f} ms (+{regression.change * 100:.0f}%)")
+    return "\n".join(lines)
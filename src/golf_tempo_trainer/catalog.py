@@ -0,0 +1,278 @@
+import json
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from .config import TEMPO_CONFIG
+from .tempo import SwingTempo
+
+CATALOG_EXTENSIONS = (".json", ".toml")
+FRAMES_RATIO_TOLERANCE = 0.01  # frames "24/8" must agree with the ratio within 1%
+
+FramesKey = Tuple[float, float]
+
+
+class CatalogError(ValueError):
+    """A catalog entry failed validation; the message names the entry"""
+
+
+def parse_frames(frames: str) -> FramesKey:
+    """'24/8' -> (24.0, 8.0); half frames such as '15/7.5' are allowed"""
+    try:
+        back, down = (float(part) for part in str(frames).split("/"))
+    except ValueError:
+        raise ValueError(f"Frames must look like '24/8', got {frames!r}") from None
+    if back <= 0 or down <= 0:
+        raise ValueError(f"Frames must be positive, got {frames!r}")
+    return back, down
+
+
+class _SortedIndex:
+    """
+    Tempos sorted by one numeric attribute for nearest and range lookups
+    Time Complexity: O(n log n) to build, O(log n) per lookup
+    """
+
+    def __init__(self, tempos: Iterable[SwingTempo], attribute: str):
+        ordered = sorted(tempos, key=lambda tempo: getattr(tempo, attribute))
+        self.keys = [getattr(tempo, attribute) for tempo in ordered]
+        self.tempos = ordered
+
+    def nearest(self, value: float) -> Optional[SwingTempo]:
+        """Closest tempo to `value`; ties go to the lower value"""
+        if not self.keys:
+            return None
+        i = bisect_left(self.keys, value)
+        if i == len(self.keys):
+            return self.tempos[-1]
+        if i > 0 and value - self.keys[i - 1] <= self.keys[i] - value:
+            return self.tempos[i - 1]
+        return self.tempos[i]
+
+    def between(self, low: float, high: float) -> List[SwingTempo]:
+        return self.tempos[bisect_left(self.keys, low):bisect_right(self.keys, high)]
+
+
+class TempoCatalog:
+    """
+    Immutable, indexed set of SwingTempo records
+    Exact lookups by shot type, pro, club or frames are dict hits; nearest BPM
+    and ratio lookups bisect indexes sorted once at build time
+    Time Complexity: O(n log n) to build, O(1) exact and O(log n) nearest lookups
+    """
+
+    def __init__(self, tempos: Iterable[SwingTempo]):
+        self._tempos = tuple(tempos)
+        self._by_key: Dict[Tuple[str, str, str], SwingTempo] = {}
+        self._shots: Dict[str, Dict[str, List[str]]] = {}
+        by_pro: Dict[str, List[SwingTempo]] = {}
+        by_frames: Dict[FramesKey, List[SwingTempo]] = {}
+        by_shot: Dict[str, List[SwingTempo]] = {}
+
+        for tempo in self._tempos:
+            key = (tempo.shot_type, tempo.pro_name, tempo.club)
+            if key in self._by_key:
+                raise CatalogError(f"{_entry_name(*key)}: duplicate tempo")
+            self._by_key[key] = tempo
+            # Insertion order is file order, which menus keep
+            self._shots.setdefault(tempo.shot_type, {}).setdefault(tempo.pro_name, []).append(tempo.club)
+            by_pro.setdefault(tempo.pro_name, []).append(tempo)
+            by_frames.setdefault(parse_frames(tempo.frames), []).append(tempo)
+            by_shot.setdefault(tempo.shot_type, []).append(tempo)
+
+        self._by_pro = {pro: tuple(tempos) for pro, tempos in by_pro.items()}
+        self._by_frames = {frames: tuple(tempos) for frames, tempos in by_frames.items()}
+        self._bpm = {None: _SortedIndex(self._tempos, "bpm")}
+        self._ratio = {None: _SortedIndex(self._tempos, "ratio")}
+        for shot_type, tempos in by_shot.items():
+            self._bpm[shot_type] = _SortedIndex(tempos, "bpm")
+            self._ratio[shot_type] = _SortedIndex(tempos, "ratio")
+
+    @classmethod
+    def from_config(cls, config: Mapping) -> "TempoCatalog":
+        """Validate and compile a TEMPO_CONFIG-shaped mapping"""
+        return cls(_compile(config))
+
+    def __len__(self) -> int:
+        return len(self._tempos)
+
+    def __iter__(self) -> Iterator[SwingTempo]:
+        return iter(self._tempos)
+
+    def shot_types(self) -> List[str]:
+        return list(self._shots)
+
+    def pros(self, shot_type: str) -> List[str]:
+        return list(self._shot(shot_type))
+
+    def clubs(self, shot_type: str, pro_name: str) -> List[str]:
+        """Club-level tempos of a pro; "" is the pro's default tempo"""
+        return list(self._pro_clubs(shot_type, pro_name))
+
+    def get(self, shot_type: str, pro_name: str, club: str = "") -> SwingTempo:
+        tempo = self._by_key.get((shot_type, pro_name, club))
+        if tempo is None:
+            clubs = [name for name in self._pro_clubs(shot_type, pro_name) if name]
+            raise ValueError(f"Unknown club for {pro_name} ({shot_type}): {club}"
+                             + (f" (choose from {', '.join(clubs)})" if clubs else ""))
+        return tempo
+
+    def by_pro(self, pro_name: str) -> Tuple[SwingTempo, ...]:
+        """Every tempo of a pro across shot types and clubs"""
+        return self._by_pro.get(pro_name, ())
+
+    def by_frames(self, frames: str) -> Tuple[SwingTempo, ...]:
+        """Tempos with exactly these frame counts, e.g. '21/7'"""
+        return self._by_frames.get(parse_frames(frames), ())
+
+    def nearest_bpm(self, bpm: float, shot_type: Optional[str] = None) -> Optional[SwingTempo]:
+        return self._index(self._bpm, shot_type).nearest(bpm)
+
+    def nearest_ratio(self, ratio: float, shot_type: Optional[str] = None) -> Optional[SwingTempo]:
+        return self._index(self._ratio, shot_type).nearest(ratio)
+
+    def bpm_between(self, low: float, high: float, shot_type: Optional[str] = None) -> List[SwingTempo]:
+        """Tempos from `low` to `high` BPM inclusive, slowest first"""
+        return self._index(self._bpm, shot_type).between(low, high)
+
+    def _shot(self, shot_type: str) -> Dict[str, List[str]]:
+        if shot_type not in self._shots:
+            raise ValueError(f"Unknown shot type: {shot_type}")
+        return self._shots[shot_type]
+
+    def _pro_clubs(self, shot_type: str, pro_name: str) -> List[str]:
+        pros = self._shot(shot_type)
+        if pro_name not in pros:
+            raise ValueError(f"Unknown pro for {shot_type}: {pro_name}")
+        return pros[pro_name]
+
+    def _index(self, indexes: Dict[Optional[str], _SortedIndex], shot_type: Optional[str]) -> _SortedIndex:
+        if shot_type is not None:
+            self._shot(shot_type)
+        return indexes[shot_type]
+
+
+def _entry_name(*parts: str) -> str:
+    return " / ".join(part for part in parts if part)
+
+
+def _number(entry: Mapping, key: str, name: str) -> float:
+    value = entry.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not value > 0:
+        raise CatalogError(f"{name}: '{key}' must be a positive number, got {value!r}")
+    return value
+
+
+def _text(entry: Mapping, key: str, name: str, default: Optional[str] = None) -> str:
+    value = entry.get(key, default)
+    if not isinstance(value, str):
+        raise CatalogError(f"{name}: '{key}' must be a string, got {value!r}")
+    return value
+
+
+def _compile_tempo(shot_type: str, pro_name: str, club: str, entry: Mapping,
+                   learning_notes: str) -> SwingTempo:
+    name = _entry_name(shot_type, pro_name, club)
+    bpm = _number(entry, "bpm", name)
+    ratio = _number(entry, "ratio", name)
+    frames = _text(entry, "frames", name)
+    try:
+        back, down = parse_frames(frames)
+    except ValueError as e:
+        raise CatalogError(f"{name}: {e}") from None
+    if abs(back / down - ratio) > ratio * FRAMES_RATIO_TOLERANCE:
+        raise CatalogError(f"{name}: frames {frames} do not match ratio {ratio}")
+    return SwingTempo(shot_type=shot_type, pro_name=pro_name, bpm=bpm, ratio=ratio, frames=frames,
+                      description=_text(entry, "description", name, ""),
+                      learning_notes=learning_notes, club=club)
+
+
+def _compile(config: Mapping) -> List[SwingTempo]:
+    """Validate every entry of a TEMPO_CONFIG-shaped mapping, raising CatalogError on the first bad one"""
+    tempos = []
+    for shot_type, shot_config in config.items():
+        if not isinstance(shot_config, Mapping):
+            raise CatalogError(f"{shot_type}: expected a table of description, learning_notes and pros")
+        learning_notes = _text(shot_config, "learning_notes", shot_type, "")
+        pros = shot_config.get("pros")
+        if not isinstance(pros, Mapping) or not pros:
+            raise CatalogError(f"{shot_type}: 'pros' must be a non-empty table")
+
+        for pro_name, pro_config in pros.items():
+            if not isinstance(pro_config, Mapping):
+                raise CatalogError(f"{_entry_name(shot_type, pro_name)}: expected a table")
+            tempos.append(_compile_tempo(shot_type, pro_name, "", pro_config, learning_notes))
+
+            # Club tempos inherit whatever they leave out from the pro's default
+            clubs = pro_config.get("clubs", {})
+            if not isinstance(clubs, Mapping):
+                raise CatalogError(f"{_entry_name(shot_type, pro_name)}: 'clubs' must be a table")
+            defaults = {key: value for key, value in pro_config.items() if key != "clubs"}
+            for club, club_config in clubs.items():
+                if not isinstance(club_config, Mapping) or not club:
+                    raise CatalogError(f"{_entry_name(shot_type, pro_name, str(club))}: expected a named table")
+                tempos.append(_compile_tempo(shot_type, pro_name, club, {**defaults, **club_config},
+                                             learning_notes))
+    return tempos
+
+
+def read_catalog_file(path: Union[str, Path]) -> Dict:
+    """Raw TEMPO_CONFIG-shaped mapping from a .json or .toml file"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with open(path, encoding="utf-8") as catalog_file:
+            data = json.load(catalog_file)
+    elif suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise CatalogError(f"{path}: reading TOML catalogs needs Python 3.11+ or 'pip install tomli'") from None
+        with open(path, "rb") as catalog_file:
+            data = tomllib.load(catalog_file)
+    else:
+        raise ValueError(f"Unsupported catalog format: {path.suffix} (use {' or '.join(CATALOG_EXTENSIONS)})")
+    if not isinstance(data, dict):
+        raise CatalogError(f"{path}: expected a table of shot types")
+    return data
+
+
+def merge_configs(*configs: Mapping) -> Dict:
+    """Later configs add shot types and pros, or replace pros of the same name"""
+    merged: Dict = {}
+    for config in configs:
+        for shot_type, shot_config in config.items():
+            if not isinstance(shot_config, Mapping):
+                merged[shot_type] = shot_config  # Left for validation to report
+                continue
+            target = merged.setdefault(shot_type, {"pros": {}})
+            target.update({key: value for key, value in shot_config.items() if key != "pros"})
+            pros = shot_config.get("pros", {})
+            target["pros"] = {**target["pros"], **pros} if isinstance(pros, Mapping) else pros
+    return merged
+
+
+def load_catalog(*paths: Union[str, Path], include_builtin: bool = True) -> TempoCatalog:
+    """Compile catalog files, layered over the built-in TEMPO_CONFIG unless `include_builtin` is False"""
+    configs = [TEMPO_CONFIG] if include_builtin else []
+    for path in paths:
+        try:
+            configs.append(read_catalog_file(path))
+        except CatalogError:
+            raise
+        except ValueError as e:
+            raise CatalogError(f"{path}: {e}") from None
+    try:
+        return TempoCatalog.from_config(merge_configs(*configs))
+    except CatalogError as e:
+        source = ", ".join(str(path) for path in paths)
+        raise CatalogError(f"{e} (in {source})" if source else str(e)) from None
+
+
+@lru_cache(maxsize=1)
+def default_catalog() -> TempoCatalog:
+    """The built-in TEMPO_CONFIG, compiled once per process"""
+    return TempoCatalog.from_config(TEMPO_CONFIG)
@@ -154,6 +154,17 @@ TEMPO_CONFIG: Dict[str, ShotConfig] = {
 # Enhanced audio configuration for different shot types
 AUDIO_CONFIG = {
     "sample_rate": 44100,
+    "cache_max_bytes": 32 * 1024 * 1024,  # Memory budget for cached tones
+    "cache_dir": "audio_cache",           # Tone bank and latency profiles, created on first write
+    "tone_bank_file": "tones.bank",       # Packed tone file inside cache_dir
+    "tone_bank_storage": "float32",       # "int16" halves the bank size
+    "synth_engine": "wavetable",          # "numpy" evaluates np.sin per sample
+    "backend": "sounddevice",             # Or "null", "memory", "file" for headless runs
+    "backend_options": {},                # e.g. {"path": "session.wav"} for "file"
+    "channels": 1,                        # Output channels; sessions are routed to one each
+    "timer_mode": "low_jitter",           # "low_cpu" never spins, at the cost of ~1ms jitter
+    "history_file": "swing_history.bin",  # Append-only log of every analyzed swing, inside cache_dir
+    "latency_profiles_file": "latency_profiles.json",  # Per-device calibration inside cache_dir
     "long_game": {
         "backswing": {"start_freq": 220, "end_freq": 110, "volume": 1.0},
         "top": {"freq": 440, "volume": 0.9},
@@ -0,0 +1,344 @@
+import asyncio
+import base64
+import dataclasses
+import hashlib
+import json
+from http import HTTPStatus
+from typing import Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from .bays import SessionManager
+from .catalog import TempoCatalog, default_catalog
+from .drills import DRILL_SWINGS, TempoRamp
+from .tempo import SwingTempo
+
+CONTROL_HOST = "127.0.0.1"  # Loopback only: kiosks reach it through the bay PC
+CONTROL_PORT = 8765
+EVENT_QUEUE_SIZE = 256      # Events waiting for a slow client before new ones are dropped
+MAX_BODY_BYTES = 64 * 1024
+CLOSE_TIMEOUT_S = 1.0       # Time clients get to take their closing event before being cut off
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str = ""):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+def websocket_accept(key: str) -> str:
+    """Sec-WebSocket-Accept answer to a client's Sec-WebSocket-Key"""
+    return base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+
+
+def encode_frame(payload: bytes, opcode: int = OP_TEXT, mask: Optional[bytes] = None) -> bytes:
+    """One final WebSocket frame; clients must mask, the server must not"""
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 1 << 16:
+        header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, "big")
+    if mask is None:
+        return header + payload
+    header = bytes([header[0], header[1] | 0x80]) + header[2:] + mask
+    return header + bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Read one WebSocket frame, unmasking it, as (opcode, payload)"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), "big")
+    elif length == 127:
+        length = int.from_bytes(await reader.readexactly(8), "big")
+    if length > MAX_BODY_BYTES:
+        raise ValueError(f"WebSocket frame of {length} bytes is too large")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class _Subscriber:
+    """One event stream client: a bounded queue and an optional session filter"""
+
+    def __init__(self, session: Optional[str], size: int):
+        self.session = session
+        self.queue: "asyncio.Queue[Dict]" = asyncio.Queue(maxsize=size)
+        self.dropped = 0
+
+    def offer(self, event: Dict) -> None:
+        name = event.get("session", event.get("name"))
+        if self.session is not None and name is not None and name != self.session:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+
+class ControlServer:
+    """
+    HTTP and WebSocket control of a SessionManager on localhost
+    Runs on the manager's event loop, so requests change sessions between
+    scheduler ticks exactly like the scheduler itself and never touch the
+    audio thread.  Each event stream client gets a bounded queue: a slow or
+    stalled client loses events rather than holding up the scheduler.
+
+    GET    /sessions                  every session's state
+    POST   /sessions                  add {"name", "shot_type", "pro", "club", "channel", "gain", "running"}
+    GET    /sessions/{name}           one session's state
+    DELETE /sessions/{name}           remove a session
+    POST   /sessions/{name}/start     start a stopped session
+    POST   /sessions/{name}/stop      stop queuing a session's cycles
+    POST   /sessions/{name}/tempo     switch to {"shot_type", "pro", "club"} and/or {"bpm", "ratio"}
+    POST   /sessions/{name}/route     move to {"channel", "gain"}
+    POST   /sessions/{name}/drill     ramp to a tempo given like /tempo, over {"swings"}
+    GET    /events[?session=NAME]     WebSocket stream of cue, swing and session events as JSON
+    """
+
+    def __init__(self,
+                 manager: SessionManager,
+                 catalog: Optional[TempoCatalog] = None,
+                 host: str = CONTROL_HOST,
+                 port: int = CONTROL_PORT,
+                 queue_size: int = EVENT_QUEUE_SIZE):
+        self.manager = manager
+        self.catalog = catalog or default_catalog()
+        self.host = host
+        self.requested_port = port
+        self.queue_size = queue_size
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._subscribers: Set[_Subscriber] = set()
+        self._connections: Set[asyncio.Task] = set()
+
+    @property
+    def port(self) -> int:
+        """Port actually bound, useful when started with port 0"""
+        if self._server is None:
+            return self.requested_port
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.requested_port)
+        self.manager.add_listener(self._publish)
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self.manager.remove_listener(self._publish)
+        self._server.close()
+        for subscriber in list(self._subscribers):
+            subscriber.offer({"type": "closing"})
+        if self._connections:
+            # Event streams finish once they have sent the closing event; idle requests are cut off
+            _, pending = await asyncio.wait(list(self._connections), timeout=CLOSE_TIMEOUT_S)
+            for task in pending:
+                task.cancel()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def serve(self, duration: Optional[float] = None) -> None:
+        """Serve requests while the manager's scheduler runs"""
+        await self.start()
+        try:
+            await self.manager.run(duration)
+        finally:
+            await self.close()
+
+    def _publish(self, event: Dict) -> None:
+        for subscriber in self._subscribers:
+            subscriber.offer(event)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self._stream_events(target, headers, reader, writer)
+                    break
+                try:
+                    status, payload = self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except HTTPError as e:
+            await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length") from None
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: HTTPStatus, payload: Dict,
+                       keep_alive: bool = True) -> None:
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    def dispatch(self, method: str, target: str, body: bytes = b"") -> Tuple[HTTPStatus, Dict]:
+        """Apply one control request, returning its status and JSON payload"""
+        parts = [unquote(part) for part in urlsplit(target).path.strip("/").split("/") if part]
+        if not parts or parts[0] != "sessions" or len(parts) > 3:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No such resource: {target}")
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+
+        manager = self.manager
+        try:
+            if len(parts) == 1:
+                if method == "GET":
+                    return HTTPStatus.OK, {"sessions": [s.to_dict() for s in manager.sessions]}
+                if method == "POST":
+                    if not data.get("name"):
+                        raise ValueError("A new session needs a name")
+                    session = manager.add_session(data["name"], self._tempo(data),
+                                                  running=bool(data.get("running", True)),
+                                                  channel=data.get("channel"),
+                                                  gain=float(data.get("gain", 1.0)))
+                    return HTTPStatus.CREATED, session.to_dict()
+            elif len(parts) == 2:
+                name = parts[1]
+                if method == "GET":
+                    return HTTPStatus.OK, manager.get(name).to_dict()
+                if method == "DELETE":
+                    return HTTPStatus.OK, manager.remove_session(name).to_dict()
+            elif method == "POST":
+                name, action = parts[1], parts[2]
+                session = manager.get(name)
+                if action == "start":
+                    manager.start_session(name)
+                elif action == "stop":
+                    manager.stop_session(name)
+                elif action == "tempo":
+                    manager.switch_tempo(name, self._tempo(data, session.tempo))
+                elif action == "drill":
+                    ramp = TempoRamp(session.tempo, self._tempo(data, session.tempo),
+                                     int(data.get("swings", DRILL_SWINGS)))
+                    manager.start_drill(name, ramp)
+                elif action == "route":
+                    manager.route(name, int(data.get("channel", session.channel)),
+                                  float(data.get("gain", session.gain)))
+                else:
+                    raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown action: {action}")
+                return HTTPStatus.OK, session.to_dict()
+            else:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"No such resource: {target}")
+        except KeyError as e:
+            raise HTTPError(HTTPStatus.NOT_FOUND, e.args[0] if e.args else "Not found")
+        except (TypeError, ValueError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {target}")
+
+    def _tempo(self, data: Dict, current: Optional[SwingTempo] = None) -> SwingTempo:
+        """A catalog tempo named in a request, with any BPM or ratio override applied"""
+        if "pro" in data or current is None:
+            if not data.get("pro"):
+                raise ValueError("A pro from the tempo catalog is required")
+            shot_type = data.get("shot_type", current.shot_type if current else "Long Game")
+            tempo = self.catalog.get(shot_type, data["pro"], data.get("club", ""))
+        else:
+            tempo = current
+        overrides = {key: float(data[key]) for key in ("bpm", "ratio") if key in data}
+        return dataclasses.replace(tempo, **overrides) if overrides else tempo
+
+    async def _stream_events(self, target: str, headers: Dict[str, str],
+                             reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        url = urlsplit(target)
+        key = headers.get("sec-websocket-key")
+        if url.path.rstrip("/") != "/events" or not key:
+            raise HTTPError(HTTPStatus.NOT_FOUND if key else HTTPStatus.BAD_REQUEST,
+                            "WebSocket streams are served on /events")
+        session = parse_qs(url.query).get("session", [None])[0]
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {websocket_accept(key)}\r\n\r\n".encode()
+        )
+
+        subscriber = _Subscriber(session, self.queue_size)
+        snapshot = [s.to_dict() for s in self.manager.sessions if session in (None, s.name)]
+        subscriber.offer({"type": "hello", "sessions": snapshot})
+        self._subscribers.add(subscriber)
+        sender = asyncio.ensure_future(self._send_events(subscriber, writer))
+        try:
+            while not sender.done():
+                receiver = asyncio.ensure_future(read_frame(reader))
+                await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+                if not receiver.done():
+                    receiver.cancel()
+                    break
+                opcode, payload = receiver.result()
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(payload[:2], OP_CLOSE))
+                    break
+                if opcode == OP_PING:
+                    writer.write(encode_frame(payload, OP_PONG))
+        finally:
+            self._subscribers.discard(subscriber)
+            sender.cancel()
+
+    async def _send_events(self, subscriber: _Subscriber, writer: asyncio.StreamWriter) -> None:
+        while True:
+            event = await subscriber.queue.get()
+            writer.write(encode_frame(json.dumps(event).encode()))
+            await writer.drain()
+            if event["type"] == "closing":
+                writer.write(encode_frame(b"\x03\xe9", OP_CLOSE))  # 1001: going away
+                await writer.drain()
+                return
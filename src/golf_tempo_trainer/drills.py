@@ -0,0 +1,65 @@
+import dataclasses
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Iterator
+from .config import AUDIO_CONFIG
+from .tempo import SwingTempo
+from .timeline import SwingTimeline, exact
+
+DRILL_SWINGS = 20
+
+
+@dataclass(frozen=True)
+class TempoRamp:
+    """
+    A drill moving BPM and ratio in even steps from one tempo to another
+    Swing 0 plays `start` and swing `swings - 1` plays `end`; every step is
+    exact, so each swing's timeline can be built ahead of its cycle and
+    handed to a running stream.  Swings past the end hold the `end` tempo
+    """
+    start: SwingTempo
+    end: SwingTempo
+    swings: int = DRILL_SWINGS
+
+    def __post_init__(self):
+        if self.swings < 2:
+            raise ValueError(f"A ramp needs at least 2 swings, got {self.swings}")
+        if self.start.shot_type != self.end.shot_type:
+            raise ValueError(f"A ramp stays within one shot type, got "
+                             f"{self.start.shot_type} and {self.end.shot_type}")
+
+    def __len__(self) -> int:
+        return self.swings
+
+    def __iter__(self) -> Iterator[SwingTempo]:
+        return (self.tempo(swing) for swing in range(self.swings))
+
+    @property
+    def name(self) -> str:
+        if self.start.pro_name == self.end.pro_name:
+            return self.start.pro_name
+        return f"{self.start.pro_name} → {self.end.pro_name}"
+
+    def _step(self, swing: int) -> Fraction:
+        return Fraction(min(max(swing, 0), self.swings - 1), self.swings - 1)
+
+    def bpm(self, swing: int) -> Fraction:
+        start = exact(self.start.bpm)
+        return start + (exact(self.end.bpm) - start) * self._step(swing)
+
+    def ratio(self, swing: int) -> Fraction:
+        start = exact(self.start.ratio)
+        return start + (exact(self.end.ratio) - start) * self._step(swing)
+
+    def tempo(self, swing: int) -> SwingTempo:
+        """The tempo a swing of the drill is played and graded at"""
+        if swing <= 0:
+            return self.start
+        if swing >= self.swings - 1:
+            return self.end
+        return dataclasses.replace(self.start, pro_name=self.name, bpm=float(self.bpm(swing)),
+                                   ratio=float(self.ratio(swing)), frames="", club="")
+
+    def timeline(self, swing: int, sample_rate: int = AUDIO_CONFIG["sample_rate"], **options) -> SwingTimeline:
+        """Exact timeline of one swing's cycle"""
+        return SwingTimeline.from_bpm(self.bpm(swing), self.ratio(swing), sample_rate, **options)
@@ -0,0 +1,167 @@
+import os
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+from .config import AUDIO_CONFIG
+from .tempo import SwingTiming
+
+MAGIC = b"SWINGLOG"
+VERSION = 1
+HEADER = struct.Struct("<8sHH")  # magic, version, record size
+HEADER_SIZE = 64                 # Records start on an aligned offset
+DAY_S = 86400
+
+SWING_DTYPE = np.dtype([
+    ("timestamp", "<f8"),    # Unix seconds
+    ("pro", "S40"),          # UTF-8, NUL padded
+    ("shot_type", "S16"),
+    ("backswing", "<f4"),    # Seconds
+    ("downswing", "<f4"),
+    ("ratio", "<f4"),
+    ("error", "<f4"),        # Ratio error in percent of the target
+])
+
+
+def default_history_path() -> Path:
+    return Path(AUDIO_CONFIG["cache_dir"]) / AUDIO_CONFIG["history_file"]
+
+
+@dataclass(frozen=True)
+class DayTrend:
+    day_start: float    # Unix seconds at the start of the day bucket
+    swings: int
+    mean_ratio: float
+    mean_error: float
+
+
+class SwingHistory:
+    """
+    Append-only log of fixed-size swing records
+    Appends are one buffered write; reads memory-map the file, so queries run
+    as NumPy reductions over every record without loading or parsing it
+    Time Complexity: O(1) per append, O(n) per query over n swings
+    Space Complexity: O(n) on disk, only touched pages in memory
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        if self.path.exists() and self.path.stat().st_size:
+            self._check_header()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as log_file:
+                header = HEADER.pack(MAGIC, VERSION, SWING_DTYPE.itemsize)
+                log_file.write(header.ljust(HEADER_SIZE, b"\0"))
+        self._file = open(self.path, "ab")
+
+    def _check_header(self) -> None:
+        with open(self.path, "rb") as log_file:
+            header = log_file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{self.path} is not a version {VERSION} swing history")
+        magic, version, record_size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or record_size != SWING_DTYPE.itemsize:
+            raise ValueError(f"{self.path} is not a version {VERSION} swing history")
+
+    def append(self,
+               timing: SwingTiming,
+               pro: str,
+               shot_type: str,
+               error: float,
+               timestamp: Optional[float] = None) -> None:
+        """Record one swing"""
+        record = np.array(
+            [(time.time() if timestamp is None else timestamp, pro.encode("utf-8")[:40],
+              shot_type.encode("utf-8")[:16], timing.backswing, timing.downswing, timing.ratio, error)],
+            dtype=SWING_DTYPE
+        )
+        self.append_records(record)
+
+    def append_records(self, records: np.ndarray) -> None:
+        """Record many swings at once from a SWING_DTYPE array"""
+        self._file.write(np.ascontiguousarray(records, dtype=SWING_DTYPE).tobytes())
+        self._file.flush()
+
+    def __len__(self) -> int:
+        return (os.path.getsize(self.path) - HEADER_SIZE) // SWING_DTYPE.itemsize
+
+    def records(self) -> np.ndarray:
+        """Every swing so far as a read-only memory-mapped record array"""
+        count = len(self)
+        if count == 0:
+            return np.zeros(0, dtype=SWING_DTYPE)
+        return np.memmap(self.path, dtype=SWING_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+    def since(self, days: float, now: Optional[float] = None) -> np.ndarray:
+        """Swings from the last `days` days"""
+        records = self.records()
+        cutoff = (time.time() if now is None else now) - days * DAY_S
+        return records[records["timestamp"] >= cutoff]
+
+    def mean_error_by_pro(self, records: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """Mean ratio error per pro, grouped with one integer unique + bincount pass"""
+        records = self.records() if records is None else records
+        if len(records) == 0:
+            return {}
+        names = records["pro"]
+        _, first, group = np.unique(_name_keys(names), return_index=True, return_inverse=True)
+        if not np.array_equal(names[first][group], names):
+            # Two names share a hash: group by the names themselves
+            _, first, group = np.unique(names, return_index=True, return_inverse=True)
+        totals = np.bincount(group, weights=records["error"])
+        counts = np.bincount(group)
+        return {
+            records["pro"][index].decode("utf-8", errors="ignore"): float(total / count)
+            for index, total, count in zip(first, totals, counts)
+        }
+
+    def daily_trend(self, days: int = 30, now: Optional[float] = None) -> List[DayTrend]:
+        """Per-day (UTC) swing count, mean ratio and mean error over the last `days` days"""
+        records = self.since(days, now)
+        if len(records) == 0:
+            return []
+
+        day = (records["timestamp"] // DAY_S).astype(np.int64)
+        first = int(day.min())
+        bucket = day - first
+        counts = np.bincount(bucket)
+        ratios = np.bincount(bucket, weights=records["ratio"])
+        errors = np.bincount(bucket, weights=records["error"])
+        return [
+            DayTrend(float((first + i) * DAY_S), int(counts[i]),
+                     float(ratios[i] / counts[i]), float(errors[i] / counts[i]))
+            for i in np.flatnonzero(counts)
+        ]
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _name_keys(names: np.ndarray) -> np.ndarray:
+    """
+    64-bit hash of each fixed-width name
+    Sorting integers is many times faster than sorting 40-byte strings; callers
+    check the groups, since distinct names can share a hash
+    """
+    words = np.ascontiguousarray(names).view("<u8").reshape(len(names), -1)
+    keys = words[:, 0].copy()
+    for column in words[:, 1:].T:
+        keys *= np.uint64(1000003)
+        keys ^= column
+    return keys
+
+
+def format_history_report(history: SwingHistory, days: int = 30) -> str:
+    lines = [f"=== Swing History ({len(history)} swings) ===", "", "Mean ratio error by pro:"]
+    for pro, error in sorted(history.mean_error_by_pro().items()):
+        lines.append(f"  {pro:<24} {error:5.1f}%")
+
+    lines += ["", f"Last {days} days:"]
+    for trend in history.daily_trend(days):
+        day = time.strftime("%Y-%m-%d", time.gmtime(trend.day_start))
+        lines.append(f"  {day}  {trend.swings:>5} swings  ratio {trend.mean_ratio:.2f}:1  "
+                     f"error {trend.mean_error:5.1f}%")
+    return "\n".join(lines)
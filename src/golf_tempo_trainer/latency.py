@@ -0,0 +1,170 @@
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import numpy as np
+from .backends import AudioBackend
+from .config import AUDIO_CONFIG
+
+CLICK_S = 0.002        # Length of each calibration click
+CLICK_INTERVAL_S = 0.25
+CLICK_COUNT = 4
+MIN_PEAK_RATIO = 8.0   # Correlation peak over its median before a click counts as heard
+
+
+@dataclass
+class LatencyProfile:
+    """
+    Output latency of one device at one stream configuration
+    `reported` comes from PortAudio; `measured` from a loopback click, when run
+    """
+    device: str
+    sample_rate: int
+    blocksize: int
+    reported: float
+    measured: Optional[float] = None
+    calibrated_at: float = 0.0
+
+    @property
+    def latency(self) -> float:
+        """Best known time from a sample leaving the callback to it being heard"""
+        return self.reported if self.measured is None else self.measured
+
+    def matches(self, backend: AudioBackend) -> bool:
+        return (self.device == backend.device_name
+                and self.sample_rate == backend.sample_rate
+                and self.blocksize == backend.blocksize)
+
+
+def default_profiles_path() -> Path:
+    return Path(AUDIO_CONFIG["cache_dir"]) / AUDIO_CONFIG["latency_profiles_file"]
+
+
+def load_profiles(path: Optional[Union[str, Path]] = None) -> Dict[str, LatencyProfile]:
+    """Every saved profile keyed by device name; a missing file means none"""
+    path = Path(path) if path is not None else default_profiles_path()
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as profiles_file:
+        return {device: LatencyProfile(**fields) for device, fields in json.load(profiles_file).items()}
+
+
+def save_profile(profile: LatencyProfile, path: Optional[Union[str, Path]] = None) -> None:
+    """Store a profile, replacing any earlier one for the same device"""
+    path = Path(path) if path is not None else default_profiles_path()
+    profiles = load_profiles(path)
+    profiles[profile.device] = profile
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as profiles_file:
+        json.dump({device: asdict(p) for device, p in profiles.items()}, profiles_file, indent=2)
+
+
+def find_profile(backend: AudioBackend,
+                 path: Optional[Union[str, Path]] = None) -> Optional[LatencyProfile]:
+    """Saved profile for a backend's device, if it was calibrated with the same stream settings"""
+    profile = load_profiles(path).get(backend.device_name)
+    return profile if profile is not None and profile.matches(backend) else None
+
+
+def click_train(sample_rate: int,
+                clicks: int = CLICK_COUNT,
+                interval_s: float = CLICK_INTERVAL_S) -> Tuple[np.ndarray, np.ndarray]:
+    """Evenly spaced short clicks followed by a tail of silence, and their start samples"""
+    interval = round(interval_s * sample_rate)
+    click_len = max(1, round(CLICK_S * sample_rate))
+    click = np.hanning(click_len + 2)[1:-1].astype(np.float32)
+
+    positions = np.arange(clicks) * interval + interval // 2
+    signal = np.zeros((clicks + 1) * interval, dtype=np.float32)
+    for at in positions:
+        signal[at:at + click_len] = click
+    return signal, positions
+
+
+def loopback_lag(reference: np.ndarray, recorded: np.ndarray) -> int:
+    """
+    Samples by which `recorded` trails `reference`, by FFT cross-correlation
+    Raises ValueError if no clear correlation peak is found (nothing looped back)
+    Time Complexity: O(n log n) for n recorded samples
+    """
+    n = len(reference) + len(recorded)
+    size = 1 << (n - 1).bit_length()
+    spectrum = np.fft.rfft(recorded, size) * np.conj(np.fft.rfft(reference, size))
+    correlation = np.abs(np.fft.irfft(spectrum, size)[:len(recorded)])
+
+    lag = int(np.argmax(correlation))
+    floor = np.median(correlation)
+    if correlation[lag] <= 0 or correlation[lag] < MIN_PEAK_RATIO * max(floor, 1e-12):
+        raise ValueError("No loopback click detected - check the output-to-input connection")
+    return lag
+
+
+def measure_loopback(sample_rate: int,
+                     device: Optional[Union[int, str]] = None,
+                     input_device: Optional[Union[int, str]] = None,
+                     clicks: int = CLICK_COUNT,
+                     blocksize: int = 0,
+                     latency: str = 'low') -> float:
+    """
+    Output latency from a click played out and recorded back through a loopback cable
+    The round trip also contains the input path, so PortAudio's input latency is
+    subtracted from it.  Pass the output stream's blocksize and 'low'/'high'
+    latency setting so the measurement describes that stream
+    """
+    import sounddevice as sd
+
+    signal, _ = click_train(sample_rate, clicks)
+    recorded = sd.playrec(signal, samplerate=sample_rate, channels=1,
+                          device=(input_device, device), latency=latency,
+                          blocksize=blocksize, blocking=True)
+    round_trip = loopback_lag(signal, recorded[:, 0]) / sample_rate
+    input_latency = sd.query_devices(input_device, 'input')[f'default_{latency}_input_latency']
+    return max(0.0, round_trip - input_latency)
+
+
+def calibrate(backend: AudioBackend,
+              loopback: bool = False,
+              input_device: Optional[Union[int, str]] = None,
+              path: Optional[Union[str, Path]] = None) -> LatencyProfile:
+    """
+    Measure a backend's output latency and save it as the profile for its device
+    The stream is opened briefly so the host API reports its real latency
+    """
+    def silence(outdata, frames, time_info, status):
+        outdata.fill(0.0)
+
+    backend.start(silence)
+    try:
+        reported = backend.latency
+    finally:
+        backend.close()
+
+    measured = None
+    if loopback:
+        measured = measure_loopback(backend.sample_rate, getattr(backend, "device", None), input_device,
+                                    blocksize=backend.blocksize,
+                                    latency=getattr(backend, "stream_latency", 'low'))
+
+    profile = LatencyProfile(
+        device=backend.device_name,
+        sample_rate=backend.sample_rate,
+        blocksize=backend.blocksize,
+        reported=reported,
+        measured=measured,
+        calibrated_at=time.time()
+    )
+    save_profile(profile, path)
+    return profile
+
+
+def format_profile(profile: LatencyProfile) -> str:
+    lines = [
+        f"Device:    {profile.device}",
+        f"Stream:    {profile.sample_rate} Hz, {profile.blocksize}-sample blocks",
+        f"Reported:  {profile.reported * 1000:.1f}ms",
+    ]
+    if profile.measured is not None:
+        lines.append(f"Loopback:  {profile.measured * 1000:.1f}ms")
+    lines.append(f"Using:     {profile.latency * 1000:.1f}ms")
+    return "\n".join(lines)
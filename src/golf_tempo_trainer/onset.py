@@ -0,0 +1,349 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from .config import AUDIO_CONFIG
+from .tempo import SwingTempo, SwingTiming
+
+BLOCK_SIZE = 256          # Input block size; 5.8ms at 44.1 kHz
+FRAME_SIZE = 1024         # Analysis window
+HOP_SIZE = 256            # Onset time resolution
+THRESHOLD_WINDOW_S = 1.5  # Novelty history the adaptive threshold looks at
+THRESHOLD_K = 6.0         # Median absolute deviations above the median to count as an onset
+NOVELTY_FLOOR = 1e-3      # Ignores the noise floor during silence
+MIN_GAP_S = 0.12          # One onset per sound
+MAX_PHASE_S = 2.5         # Longer gaps than this end a swing
+RING_SECONDS = 2.0
+LIVE_SWINGS_KEPT = 200    # Recent swings a live listener remembers; SessionStats keeps the totals
+ONSET_METHODS = ("flux", "energy")
+
+
+@dataclass(frozen=True)
+class Onset:
+    sample: int       # Input sample index the sound starts near
+    strength: float   # Novelty value that triggered it
+
+
+class RingBuffer:
+    """
+    Single-producer, single-consumer float32 ring
+    The input callback only copies into it; analysis runs on the reader's thread
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._written = 0  # Total samples ever written / read; only the owner advances each
+        self._read = 0
+        self.dropped = 0
+
+    @property
+    def available(self) -> int:
+        return self._written - self._read
+
+    def write(self, samples: np.ndarray) -> None:
+        """Copy a block in; if the reader has fallen a full ring behind, the oldest audio is dropped"""
+        n = len(samples)
+        if n > self.capacity:
+            self.dropped += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+        start = self._written % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        self._written += n
+
+    def read(self) -> np.ndarray:
+        """Every sample written since the last read, oldest first"""
+        written = self._written
+        if written - self._read > self.capacity:
+            self.dropped += written - self._read - self.capacity
+            self._read = written - self.capacity
+        start = self._read % self.capacity
+        n = written - self._read
+        first = min(n, self.capacity - start)
+        out = np.concatenate((self._data[start:start + first], self._data[:n - first]))
+        self._read = written
+        return out
+
+
+class OnsetDetector:
+    """
+    Streaming onset detection on hop-sized analysis frames
+    "flux" sums the rise in each FFT bin (good for clicks over steady noise),
+    "energy" tracks the rise in frame RMS.  Every complete frame in a block is
+    analysed in one vectorized FFT; only the threshold walk runs per hop.
+    Time Complexity: O(h * F log F) for h hops of frame size F
+    """
+
+    def __init__(self,
+                 sample_rate: int = AUDIO_CONFIG["sample_rate"],
+                 method: str = "flux",
+                 frame_size: int = FRAME_SIZE,
+                 hop_size: int = HOP_SIZE):
+        if method not in ONSET_METHODS:
+            raise ValueError(f"Unknown onset method: {method} (choose from {', '.join(ONSET_METHODS)})")
+        self.sample_rate = sample_rate
+        self.method = method
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self._window = np.hanning(frame_size).astype(np.float32)
+        self._buffer = np.zeros(frame_size - hop_size, dtype=np.float32)
+        self._buffer_start = hop_size - frame_size  # Sample index of _buffer[0]
+        self._previous: Optional[np.ndarray] = None
+        self._history: Deque[float] = deque(maxlen=max(1, round(THRESHOLD_WINDOW_S * sample_rate / hop_size)))
+        self._min_gap = round(MIN_GAP_S * sample_rate)
+        self._last_onset = -self._min_gap
+        self._peak = 0.0  # Strongest novelty since the last onset started
+        self._unreported = False
+
+    def _novelty(self, frames: np.ndarray) -> np.ndarray:
+        """Positive change per frame against the frame before it"""
+        if self.method == "flux":
+            features = np.abs(np.fft.rfft(frames * self._window, axis=1))
+        else:
+            features = np.sqrt(np.mean(frames * frames, axis=1, keepdims=True))
+
+        previous = features[:1] if self._previous is None else self._previous[None, :]
+        rise = np.diff(features, axis=0, prepend=previous)
+        self._previous = features[-1]
+        return np.maximum(rise, 0.0).sum(axis=1) / features.shape[1] ** 0.5
+
+    def _thresholds(self, novelty: np.ndarray) -> np.ndarray:
+        """
+        Adaptive threshold for each hop from the novelty history before it
+        Once the history is full every hop's window is one row of a sliding
+        view, so a whole block is thresholded in one vectorized median
+        """
+        window = self._history.maxlen
+        history = np.asarray(self._history, dtype=np.float64)
+        if len(novelty) == 1:
+            # Live input: one hop per block, whose window is simply the history
+            windows = (history if len(history) else np.zeros(1))[None, :]
+        elif len(history) == window:
+            extended = np.concatenate((history, novelty))
+            windows = np.lib.stride_tricks.sliding_window_view(extended, window)[:len(novelty)]
+        else:
+            # Warm-up: windows still grow hop by hop
+            windows = None
+
+        if windows is not None:
+            median = np.median(windows, axis=1)
+            spread = np.median(np.abs(windows - median[:, None]), axis=1)
+            thresholds = median + THRESHOLD_K * spread
+        else:
+            thresholds = np.empty(len(novelty))
+            for i in range(len(novelty)):
+                past = np.concatenate((history, novelty[:i]))[-window:]
+                past = past if len(past) else np.zeros(1)
+                median = np.median(past)
+                thresholds[i] = median + THRESHOLD_K * np.median(np.abs(past - median))
+
+        self._history.extend(novelty.tolist())
+        return np.maximum(thresholds, NOVELTY_FLOOR)
+
+    def process(self, samples: np.ndarray) -> List[Onset]:
+        """
+        Feed the next block of input and return the onsets it completed
+        An onset is reported MIN_GAP_S after it starts, once its peak is known
+        """
+        buffer = np.concatenate((self._buffer, np.asarray(samples, dtype=np.float32)))
+        hops = (len(buffer) - self.frame_size) // self.hop_size + 1
+        if hops <= 0:
+            self._buffer = buffer
+            return []
+
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, self.frame_size)[::self.hop_size][:hops]
+        novelty = self._novelty(frames)
+
+        thresholds = self._thresholds(novelty)
+        onsets = []
+        for i, (value, threshold) in enumerate(zip(novelty.tolist(), thresholds.tolist())):
+            # Frames overlapping the silent pre-roll would see the input "start" as an onset
+            frame_start = self._buffer_start + i * self.hop_size
+            if frame_start < self.hop_size:
+                continue
+
+            # The newest hop of the frame is where new sound entered
+            sample = frame_start + self.frame_size - self.hop_size
+            since_onset = sample - self._last_onset
+            if since_onset < self._min_gap:
+                # Strength is the sound's peak, reported once the gap has passed
+                self._peak = max(self._peak, value)
+                if since_onset + self.hop_size >= self._min_gap:
+                    onsets.append(Onset(self._last_onset, float(self._peak)))
+                    self._unreported = False
+            elif value > threshold:
+                self._last_onset = sample
+                self._peak = value
+                self._unreported = True
+
+        consumed = hops * self.hop_size
+        self._buffer = buffer[consumed:]
+        self._buffer_start += consumed
+        return onsets
+
+    def flush(self) -> List[Onset]:
+        """End of input: report an onset still waiting out its gap"""
+        if not self._unreported:
+            return []
+        self._unreported = False
+        return [Onset(self._last_onset, float(self._peak))]
+
+
+class SwingSegmenter:
+    """
+    Groups onsets into takeaway, transition and impact
+    A swing is a run of onsets no more than MAX_PHASE_S apart: the first is the
+    takeaway, the loudest is impact, and the loudest between them the transition
+    """
+
+    def __init__(self, sample_rate: int = AUDIO_CONFIG["sample_rate"], max_phase_s: float = MAX_PHASE_S):
+        self.sample_rate = sample_rate
+        self._max_gap = round(max_phase_s * sample_rate)
+        self._group: List[Onset] = []
+
+    def add(self, onsets: List[Onset]) -> List[Tuple[Onset, Onset, Onset]]:
+        swings = []
+        for onset in onsets:
+            if self._group and onset.sample - self._group[-1].sample > self._max_gap:
+                swings += self._close()
+            self._group.append(onset)
+        return swings
+
+    def advance(self, sample: int) -> List[Tuple[Onset, Onset, Onset]]:
+        """Close the current swing once `sample` is past its last possible event"""
+        if self._group and sample - self._group[-1].sample > self._max_gap:
+            return self._close()
+        return []
+
+    def flush(self) -> List[Tuple[Onset, Onset, Onset]]:
+        return self._close()
+
+    def _close(self) -> List[Tuple[Onset, Onset, Onset]]:
+        group, self._group = self._group, []
+        if len(group) < 3:
+            return []  # Practice waggles and stray noises
+        impact_at = max(range(1, len(group)), key=lambda i: group[i].strength)
+        if impact_at < 2:
+            return []
+        transition_at = max(range(1, impact_at), key=lambda i: group[i].strength)
+        return [(group[0], group[transition_at], group[impact_at])]
+
+
+def swing_timing(takeaway: Onset, transition: Onset, impact: Onset, sample_rate: int) -> SwingTiming:
+    backswing = (transition.sample - takeaway.sample) / sample_rate
+    downswing = (impact.sample - transition.sample) / sample_rate
+    return SwingTiming(
+        backswing=backswing,
+        downswing=downswing,
+        total=backswing + downswing,
+        ratio=backswing / downswing if downswing > 0 else 0
+    )
+
+
+def iter_file_blocks(path: Union[str, Path], block_size: int = BLOCK_SIZE) -> Iterator[Tuple[np.ndarray, int]]:
+    """Mono float32 blocks of an audio file, with the file's sample rate"""
+    import soundfile as sf
+
+    with sf.SoundFile(str(path)) as audio_file:
+        for block in audio_file.blocks(blocksize=block_size, dtype='float32', always_2d=True):
+            yield block.mean(axis=1), audio_file.samplerate
+
+
+class SwingListener:
+    """
+    Microphone (or file) to SwingTiming pipeline
+    Live input is copied into a ring buffer by the stream callback and analysed
+    on a worker thread; files go through the same process() path block by block
+    """
+
+    def __init__(self,
+                 tempo: Optional[SwingTempo] = None,
+                 sample_rate: int = AUDIO_CONFIG["sample_rate"],
+                 method: str = "flux",
+                 on_swing: Optional[Callable[[SwingTiming], None]] = None):
+        self.tempo = tempo
+        self.sample_rate = sample_rate
+        self.on_swing = on_swing
+        self.detector = OnsetDetector(sample_rate, method)
+        # Leave room for a golfer swinging at half the pro's pace
+        max_phase_s = MAX_PHASE_S if tempo is None else 2 * tempo.backswing_time
+        self.segmenter = SwingSegmenter(sample_rate, max_phase_s)
+        self.ring = RingBuffer(round(RING_SECONDS * sample_rate))
+        # Every swing of a file; only the most recent LIVE_SWINGS_KEPT once start() listens live
+        self.timings: Deque[SwingTiming] = deque()
+        self.swing_starts: Deque[float] = deque()  # Takeaway time of each swing, in seconds of input
+        self._samples_seen = 0
+        self._stream = None
+        self._worker: Optional[threading.Thread] = None
+        self._running = threading.Event()
+        self._data_ready = threading.Event()
+
+    def process(self, samples: np.ndarray) -> List[SwingTiming]:
+        """Run one block through detection and return any swings it completed"""
+        onsets = self.detector.process(samples)
+        self._samples_seen += len(samples)
+        swings = self.segmenter.add(onsets) + self.segmenter.advance(self._samples_seen)
+        return self._emit(swings)
+
+    def finish(self) -> List[SwingTiming]:
+        """End of input: report a swing still waiting for its closing silence"""
+        return self._emit(self.segmenter.add(self.detector.flush()) + self.segmenter.flush())
+
+    def _emit(self, swings: List[Tuple[Onset, Onset, Onset]]) -> List[SwingTiming]:
+        timings = [swing_timing(*swing, self.sample_rate) for swing in swings]
+        for (takeaway, _, _), timing in zip(swings, timings):
+            self.timings.append(timing)
+            self.swing_starts.append(takeaway.sample / self.sample_rate)
+            if self.on_swing is not None:
+                self.on_swing(timing)
+        return timings
+
+    def feed_file(self, path: Union[str, Path], block_size: int = BLOCK_SIZE) -> List[SwingTiming]:
+        """Run a recording through the live pipeline, returning every swing found"""
+        timings = []
+        for block, sample_rate in iter_file_blocks(path, block_size):
+            if sample_rate != self.sample_rate:
+                raise ValueError(f"{path} is {sample_rate} Hz; the listener runs at {self.sample_rate} Hz")
+            timings += self.process(block)
+        return timings + self.finish()
+
+    def start(self, device: Optional[Union[int, str]] = None, block_size: int = BLOCK_SIZE) -> None:
+        """Listen on an input device until stop()"""
+        import sounddevice as sd
+
+        def callback(indata, frames, time_info, status):
+            self.ring.write(indata[:, 0])
+            self._data_ready.set()
+
+        # A range session can run for hours, so live swings are not all kept
+        self.timings = deque(self.timings, maxlen=LIVE_SWINGS_KEPT)
+        self.swing_starts = deque(self.swing_starts, maxlen=LIVE_SWINGS_KEPT)
+        self._running.set()
+        self._worker = threading.Thread(target=self._drain, name="swing-listener", daemon=True)
+        self._worker.start()
+        self._stream = sd.InputStream(samplerate=self.sample_rate, channels=1, dtype=np.float32,
+                                      blocksize=block_size, device=device, callback=callback)
+        self._stream.start()
+
+    def _drain(self) -> None:
+        while self._running.is_set():
+            self._data_ready.wait(0.1)
+            self._data_ready.clear()
+            if self.ring.available:
+                self.process(self.ring.read())
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        self._running.clear()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        self.finish()
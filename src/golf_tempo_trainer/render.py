@@ -0,0 +1,75 @@
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from .audio import AudioCache, load_swing_tones
+from .config import AUDIO_CONFIG
+from .mixer import MIX_HORIZON, Mixer
+from .tempo import SwingTempo
+from .timeline import SwingTimeline
+
+SESSION_BLOCK_SIZE = 65536  # Samples written to disk per chunk
+
+
+def swing_cycle_onsets(tempo: SwingTempo,
+                       sample_rate: int = AUDIO_CONFIG["sample_rate"]) -> List[Tuple[str, int]]:
+    """
+    Sample index of every cue in one swing cycle
+    Each onset is rounded once from its exact rational time, so rounding never accumulates
+    """
+    return SwingTimeline.from_tempo(tempo, sample_rate).onsets()
+
+
+def iter_timeline_blocks(timeline: SwingTimeline,
+                         tones: Dict[str, np.ndarray],
+                         swings: int,
+                         block_size: int = SESSION_BLOCK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Yield `swings` cycles of a timeline in fixed-size blocks
+    Every cue is mixed in at its own exact onset rather than by repeating a
+    whole-sample cycle buffer, so a cycle that is not a whole number of
+    samples long never drifts.  The block buffer is reused throughout, and the
+    mixer's horizon covers a whole block plus the longest tone so no tail is lost
+    """
+    total = timeline.cycle_start(swings)
+    onsets = timeline.iter_onsets()
+    name, at = next(onsets)
+    mixer = Mixer(1, horizon=max(MIX_HORIZON, block_size + max(map(len, tones.values()))))
+    block = np.empty((block_size, 1), dtype=np.float32)
+    for start in range(0, total, block_size):
+        end = min(start + block_size, total)
+        out = block[:end - start]
+
+        # Cycles past the last swing start at `total`, so this always stops
+        while at < end:
+            mixer.add(tones[name], at)
+            name, at = next(onsets)
+
+        mixer.mix(out)
+        np.clip(out, -1.0, 1.0, out=out)
+        yield out[:, 0]
+
+
+def render_session(tempo: SwingTempo,
+                   swings: int,
+                   path: Union[str, Path],
+                   cache: Optional[AudioCache] = None,
+                   block_size: int = SESSION_BLOCK_SIZE) -> int:
+    """
+    Stream a training session to an audio file, returning the frames written
+    The format (WAV, FLAC, ...) follows the file extension.  The session is
+    exactly `swings` rational cycle lengths long, rounded once at the end
+    """
+    if swings < 1:
+        raise ValueError(f"swings must be at least 1, got {swings}")
+
+    import soundfile as sf
+
+    sample_rate = AUDIO_CONFIG["sample_rate"]
+    tones = load_swing_tones(tempo.shot_type, cache or AudioCache())
+    timeline = SwingTimeline.from_tempo(tempo, sample_rate)
+
+    with sf.SoundFile(str(path), 'w', samplerate=sample_rate, channels=1) as out_file:
+        for block in iter_timeline_blocks(timeline, tones, swings, block_size):
+            out_file.write(block)
+
+    return timeline.cycle_start(swings)
@@ -0,0 +1,118 @@
+import queue
+import sys
+import threading
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, TextIO, Tuple
+
+REPORT_QUEUE_SIZE = 256    # Reports waiting for the terminal before new ones are dropped
+REPORT_INTERVAL_S = 0.05   # At most one terminal write per interval
+DASHBOARD_LOG_LINES = 20   # Recent report lines kept under the dashboard panels
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+_STOP = object()
+
+
+class Reporter:
+    """
+    Console output written by a background thread
+    report() never blocks: text goes into a bounded queue and the reporter
+    thread writes it in batches, at most once per interval, so a slow terminal
+    can only delay output and never the caller.  Reports sharing a `key`
+    coalesce, so only the newest one pending is written.  In dashboard mode
+    keyed reports become panels redrawn in place above a log of recent lines.
+    """
+
+    def __init__(self,
+                 stream: Optional[TextIO] = None,
+                 dashboard: bool = False,
+                 interval_s: float = REPORT_INTERVAL_S,
+                 max_pending: int = REPORT_QUEUE_SIZE):
+        self.stream = stream
+        self.dashboard = dashboard
+        self.interval_s = interval_s
+        self.dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._panels: "OrderedDict[str, str]" = OrderedDict()
+        self._log: Deque[str] = deque(maxlen=DASHBOARD_LOG_LINES)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="reporter", daemon=True)
+                self._thread.start()
+
+    def report(self, text: str, key: Optional[str] = None) -> bool:
+        """Queue text for the terminal; returns False if it was dropped because the queue is full"""
+        self.start()
+        try:
+            self._queue.put_nowait((key, text))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Block until everything reported so far has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self) -> None:
+        """Write what is pending, then stop the thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            reports = [item for item in batch if item is not _STOP]
+            if reports:
+                self._write(reports)
+            for _ in batch:
+                self._queue.task_done()
+            if len(reports) != len(batch):
+                return
+
+            # Rate limit; anything reported meanwhile is coalesced into the next write
+            self._stopping.wait(self.interval_s)
+
+    def _write(self, reports: List[Tuple[Optional[str], str]]) -> None:
+        lines: List[str] = []
+        latest: "OrderedDict[str, str]" = OrderedDict()
+        for key, text in reports:
+            if key is None:
+                lines.append(text)
+            else:
+                latest.pop(key, None)
+                latest[key] = text
+
+        dropped, self.dropped = self.dropped, 0
+        if dropped:
+            lines.append(f"[{dropped} reports dropped - terminal too slow]")
+
+        if self.dashboard:
+            self._panels.update(latest)
+            self._log.extend(line for text in lines for line in text.splitlines())
+            output = CLEAR_SCREEN + "\n\n".join(list(self._panels.values()) + ["\n".join(self._log)]) + "\n"
+        else:
+            output = "".join(text + "\n" for text in lines + list(latest.values()))
+
+        stream = self.stream or sys.stdout
+        try:
+            stream.write(output)
+            stream.flush()
+        except (OSError, ValueError):
+            pass  # Terminal closed; the session carries on
@@ -0,0 +1,176 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List
+from .tempo import SwingTiming, grade_ratio, ratio_error
+
+SKETCH_QUANTILES = (0.50, 0.95, 0.99)
+GRADES = ("excellent", "good", "focus")
+
+
+class RunningStats:
+    """
+    Welford mean and variance with min/max
+    Time Complexity: O(1) per value
+    Space Complexity: O(1)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate with the P-square algorithm (Jain & Chlamtac)
+    Five markers track the minimum, the quantile, the maximum and two points
+    between, adjusted by piecewise-parabolic interpolation as values arrive
+    Time Complexity: O(1) per value
+    Space Complexity: O(1)
+    """
+
+    def __init__(self, q: float):
+        if not 0 < q < 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+        self.q = q
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self._increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            offset = self._desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> float:
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            # Too few values for markers: exact nearest-rank quantile
+            return self._heights[min(self.count - 1, int(self.q * self.count))]
+        return self._heights[2]
+
+
+class DeltaStats:
+    """Running moments and p50/p95/p99 sketches of one measured-minus-target delta"""
+
+    def __init__(self):
+        self.moments = RunningStats()
+        self.quantiles = {q: P2Quantile(q) for q in SKETCH_QUANTILES}
+
+    def add(self, delta: float) -> None:
+        self.moments.add(delta)
+        for sketch in self.quantiles.values():
+            sketch.add(delta)
+
+    def percentile(self, q: float) -> float:
+        return self.quantiles[q].value
+
+
+@dataclass
+class SessionStats:
+    """
+    Live statistics of a training session in constant memory
+    Phase deltas are in milliseconds; the ratio delta is in ratio units
+    """
+    swings: int = 0
+    backswing: DeltaStats = field(default_factory=DeltaStats)
+    downswing: DeltaStats = field(default_factory=DeltaStats)
+    total: DeltaStats = field(default_factory=DeltaStats)
+    ratio: DeltaStats = field(default_factory=DeltaStats)
+    grades: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(GRADES, 0))
+
+    def add(self, timing: SwingTiming, target_backswing: float, target_downswing: float) -> None:
+        target_ratio = target_backswing / target_downswing
+        self.swings += 1
+        self.backswing.add((timing.backswing - target_backswing) * 1000)
+        self.downswing.add((timing.downswing - target_downswing) * 1000)
+        self.total.add((timing.total - target_backswing - target_downswing) * 1000)
+        self.ratio.add(timing.ratio - target_ratio)
+        self.grades[grade_ratio(ratio_error(timing.ratio, target_ratio))] += 1
+
+    def grade_share(self, grade: str) -> float:
+        """Fraction of swings in a grade band"""
+        return self.grades[grade] / self.swings if self.swings else 0.0
+
+    def live_line(self) -> str:
+        """One-line running summary printed after each swing"""
+        return (f"Session: {self.swings} swings | "
+                f"backswing Δ {self.backswing.moments.mean:+.1f}±{self.backswing.moments.std:.1f}ms | "
+                f"downswing Δ {self.downswing.moments.mean:+.1f}±{self.downswing.moments.std:.1f}ms | "
+                f"✅ {self.grade_share('excellent'):.0%}")
+
+    def format_summary(self) -> str:
+        if not self.swings:
+            return "No swings analyzed"
+        lines = [f"{'':<10} {'mean':>8} {'sd':>8} {'min':>8} {'max':>8} {'p50':>8} {'p95':>8} {'p99':>8}"]
+        for name, stats, unit in (("Backswing", self.backswing, "ms"), ("Downswing", self.downswing, "ms"),
+                                  ("Total", self.total, "ms"), ("Ratio", self.ratio, "")):
+            m = stats.moments
+            values = [m.mean, m.std, m.min, m.max] + [stats.percentile(q) for q in SKETCH_QUANTILES]
+            precision = 1 if unit else 3
+            lines.append(f"{name:<10} " + " ".join(f"{v:>8.{precision}f}" for v in values) + f" {unit}")
+        lines.append(
+            f"✅ {self.grade_share('excellent'):.0%}  "
+            f"⚠️  {self.grade_share('good'):.0%}  "
+            f"❌ {self.grade_share('focus'):.0%}"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+
+# Ratio error bands used to grade a swing, in percent of the target ratio
+EXCELLENT_RATIO_ERROR = 5
+GOOD_RATIO_ERROR = 10
+
+@dataclass(frozen=True)
+class SwingTempo:
+    """
+    One pro's tempo, immutable once built
+    Phase times are computed once here instead of on every access, so the
+    scheduler's hot path reads plain attributes
+    """
+    shot_type: str
+    pro_name: str
+    bpm: float
+    ratio: float
+    frames: str
+    description: str
+    learning_notes: str
+    club: str = ""  # Empty for the pro's default tempo
+    total_time: float = field(init=False, repr=False, compare=False)
+    backswing_time: float = field(init=False, repr=False, compare=False)
+    downswing_time: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not self.bpm > 0:
+            raise ValueError(f"BPM must be positive, got {self.bpm}")
+        if not self.ratio > 0:
+            raise ValueError(f"Ratio must be positive, got {self.ratio}")
+        total = 60.0 / self.bpm
+        object.__setattr__(self, "total_time", total)
+        object.__setattr__(self, "backswing_time", total * (self.ratio / (self.ratio + 1)))
+        object.__setattr__(self, "downswing_time", total * (1 / (self.ratio + 1)))
+
+@dataclass
+class SwingTiming:
+    backswing: float
+    downswing: float
+    total: float
+    ratio: float
+    jitter: float = 0.0  # RMS cue onset error against the ideal cycle, in seconds
+
+
+def ratio_error(ratio: float, target_ratio: float) -> float:
+    """Distance from the target ratio, in percent"""
+    return abs(ratio - target_ratio) / target_ratio * 100
+
+
+def grade_ratio(error_pct: float) -> str:
+    """Grade band of a ratio error: excellent, good or focus"""
+    if error_pct <= EXCELLENT_RATIO_ERROR:
+        return "excellent"
+    if error_pct <= GOOD_RATIO_ERROR:
+        return "good"
+    return "focus"
@@ -3,31 +3,21 @@ import numpy as np
 from pathlib import Path
 
 @pytest.fixture(autouse=True)
-def mock_audio_device():
-    """Mock sounddevice to avoid actual audio playback during tests"""
-    import sounddevice as sd
-    
-    class MockOutputStream:
-        def __init__(self, *args, **kwargs):
-            self.closed = False
-            
-        def start(self):
-            pass
-            
-        def stop(self):
-            pass
-            
-        def close(self):
-            self.closed = True
-            
-        def write(self, data):
-            pass
-    
-    sd.OutputStream = MockOutputStream
-    sd.play = lambda *args, **kwargs: None
-    sd.wait = lambda: None
-    
-    return sd
+def memory_audio_backend(monkeypatch):
+    """Route all playback to the in-memory backend so tests need no sound card"""
+    from ..config import AUDIO_CONFIG
+
+    monkeypatch.setitem(AUDIO_CONFIG, "backend", "memory")
+    monkeypatch.setitem(AUDIO_CONFIG, "backend_options", {})
+    return AUDIO_CONFIG
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(monkeypatch, tmp_path):
+    """Keep tone banks and latency profiles written by tests out of the working tree"""
+    from ..config import AUDIO_CONFIG
+
+    monkeypatch.setitem(AUDIO_CONFIG, "cache_dir", str(tmp_path / "audio_cache"))
+    return tmp_path / "audio_cache"
 
 @pytest.fixture
 def sample_audio_data():
@@ -1,10 +1,16 @@
 import pytest
+import time
 import numpy as np
-import sounddevice as sd
+from fractions import Fraction
 from unittest.mock import Mock, patch, MagicMock, call
 from pathlib import Path
-from ..audio import AudioPlayer, AudioCache, Tone, ToneGenerator
-import pyttsx3
+from ..audio import (AudioPlayer, AudioCache, Tone, ToneGenerator, ToneSpec, swing_tone_requests,
+                     warm_swing_tones)
+from ..config import AUDIO_CONFIG
+from ..voice import voice_key
+from .. import audio as audio_module
+from ..backends import MemoryBackend
+from ..latency import LatencyProfile
 
 # Fixtures
 @pytest.fixture
@@ -89,6 +95,98 @@ class TestAudioCache:
         )
         assert np.array_equal(tone, cached_tone)
 
+    def test_cache_stats(self, audio_cache):
+        """Test hit, miss and disk load counters"""
+        params = dict(name="test", freq=440, duration_s=0.1, volume=0.8, sample_rate=44100)
+        audio_cache.get_tone(**params)
+        audio_cache.get_tone(**params)
+        assert audio_cache.stats.misses == 1
+        assert audio_cache.stats.hits == 1
+        assert audio_cache.stats.disk_loads == 0
+        assert audio_cache.stats.bytes_used == 4410 * 4
+
+        # A fresh memory tier falls back to the disk tier
+        audio_cache.cached_segments.clear()
+        audio_cache.stats.bytes_used = 0
+        audio_cache.get_tone(**params)
+        assert audio_cache.stats.disk_loads == 1
+
+    def test_lru_eviction(self, audio_cache):
+        """
+        Test the memory tier stays within its byte budget
+        Time Complexity: O(1) per eviction
+        """
+        tone_bytes = 4410 * 4
+        audio_cache.max_bytes = 2 * tone_bytes
+        for freq in (440, 550, 660):
+            audio_cache.get_tone(name="test", freq=freq, duration_s=0.1,
+                                 volume=0.8, sample_rate=44100)
+
+        assert audio_cache.stats.evictions == 1
+        assert audio_cache.stats.bytes_used <= audio_cache.max_bytes
+        assert list(audio_cache.cached_segments) == [
+            audio_cache._key("test", 550, 0.1, 0.8), audio_cache._key("test", 660, 0.1, 0.8)
+        ]
+
+    def test_lru_recency(self, audio_cache):
+        """Test a recently used tone survives eviction"""
+        audio_cache.max_bytes = 2 * 4410 * 4
+        params = dict(name="test", duration_s=0.1, volume=0.8, sample_rate=44100)
+        audio_cache.get_tone(freq=440, **params)
+        audio_cache.get_tone(freq=550, **params)
+        audio_cache.get_tone(freq=440, **params)
+        audio_cache.get_tone(freq=660, **params)
+        assert audio_cache._key("test", 440, 0.1, 0.8) in audio_cache.cached_segments
+        assert audio_cache._key("test", 550, 0.1, 0.8) not in audio_cache.cached_segments
+
+    def test_engines_cache_separately(self, audio_cache, monkeypatch):
+        """Test switching synth_engine does not serve tones cached by the other engine"""
+        params = dict(name="test", freq=440, duration_s=0.1, volume=0.8, sample_rate=44100)
+        monkeypatch.setitem(AUDIO_CONFIG, "synth_engine", "numpy")
+        numpy_tone = audio_cache.get_tone(**params)
+        monkeypatch.setitem(AUDIO_CONFIG, "synth_engine", "wavetable")
+        wavetable_tone = audio_cache.get_tone(**params)
+        assert audio_cache.stats.misses == 2
+        np.testing.assert_array_equal(wavetable_tone, ToneGenerator(44100, "wavetable").generate_batch(
+            [ToneSpec(freq=440, duration_s=0.1, volume=0.8)])[0])
+        assert not np.array_equal(numpy_tone, wavetable_tone)
+
+    def test_batched_tones(self, audio_cache):
+        """Test a batch of tones is generated once and written to the bank once"""
+        requests = [("a", 440, 0.1, 0.8), ("b", 550, 0.1, 0.8), ("a", 440, 0.1, 0.8)]
+        with patch.object(audio_cache.bank, 'add_many', wraps=audio_cache.bank.add_many) as mock_add:
+            tones = audio_cache.get_tones(requests, 44100)
+            mock_add.assert_called_once()
+
+        assert tones[0] is tones[2]
+        assert audio_cache.stats.misses == 2
+        assert audio_cache.stats.bytes_used == 2 * 4410 * 4
+
+    def test_generator_reused_across_misses(self, audio_cache):
+        """Test later misses reuse the wavetables built for the first"""
+        with patch.object(audio_module, 'ToneGenerator', wraps=ToneGenerator) as generator:
+            audio_cache.get_tone("a", 440, 0.1, 0.8, 44100)
+            audio_cache.get_tone("b", 550, 0.1, 0.8, 44100)
+            audio_cache.get_tone("c", 660, 0.1, 0.8, 22050)
+        assert generator.call_count == 2
+
+    def test_warm_swing_tones(self, audio_cache):
+        """Test every shot type's cues are warmed into the cache"""
+        count = warm_swing_tones(audio_cache)
+        assert count > 0
+        assert len(audio_cache.bank) == len(audio_cache.cached_segments)
+
+    def test_player_does_not_warm_cache(self, isolated_cache_dir):
+        """Test creating a player synthesizes nothing; tones load when a session preloads them"""
+        player = AudioPlayer()
+        try:
+            cache = player.audio_cache
+            assert cache.cache_dir == isolated_cache_dir
+            requests = swing_tone_requests("long_game").values()
+            assert not any(cache._key(*request) in cache.bank for request in requests)
+        finally:
+            player.cleanup()
+
     def test_invalid_parameters(self, audio_cache):
         """Test error handling for invalid parameters"""
         with pytest.raises(ValueError):
@@ -118,6 +216,72 @@ class TestToneGenerator:
         assert isinstance(sweep, np.ndarray)
         assert sweep.dtype == np.float32
 
+    def test_batch_matches_single_tones(self):
+        """
+        Test batched synthesis matches the per-tone formulas
+        Time Complexity: O(n) where n is total sample count
+        """
+        tone_generator = ToneGenerator(sample_rate=44100, engine="numpy")
+        specs = [
+            ToneSpec(freq=440, duration_s=0.1, volume=1.0),
+            ToneSpec(freq=330, duration_s=0.05, volume=0.5),
+            ToneSpec(freq=220, end_freq=110, duration_s=0.1, volume=1.0, fade_s=0.01),
+        ]
+        tones = tone_generator.generate_batch(specs)
+
+        t = np.linspace(0, 0.1, 4410)
+        envelope = np.ones_like(t)
+        envelope[:220] = np.linspace(0, 1, 220)
+        envelope[-220:] = np.linspace(1, 0, 220)
+        expected = (np.sin(2 * np.pi * 440 * t) * envelope).astype(np.float32)
+        np.testing.assert_allclose(tones[0], expected, atol=1e-6)
+
+        assert len(tones[1]) == 2205
+        assert np.abs(tones[1]).max() <= 0.5
+
+        freq = np.exp(np.linspace(np.log(220), np.log(110), 4410))
+        envelope = np.ones_like(t)
+        envelope[:441] = np.linspace(0, 1, 441)
+        envelope[-441:] = np.linspace(1, 0, 441)
+        expected = (np.sin(2 * np.pi * freq.cumsum() / 44100) * envelope).astype(np.float32)
+        np.testing.assert_allclose(tones[2], expected, atol=1e-5)
+
+    def test_wavetable_engine_matches_sine(self):
+        """Test the wavetable engine stays within table error of np.sin"""
+        generator = ToneGenerator(sample_rate=44100, engine="wavetable")
+        tone, sweep = generator.generate_batch([
+            ToneSpec(freq=440, duration_s=0.1, volume=1.0, fade_s=0),
+            ToneSpec(freq=220, end_freq=110, duration_s=0.1, volume=1.0, fade_s=0),
+        ])
+
+        expected = np.sin(2 * np.pi * 440 * np.arange(4410) / 44100)
+        np.testing.assert_allclose(tone, expected, atol=2e-4)
+
+        freq = np.exp(np.linspace(np.log(220), np.log(110), 4410))
+        expected = np.sin(2 * np.pi * freq.cumsum() / 44100)
+        np.testing.assert_allclose(sweep, expected, atol=2e-4)
+
+    def test_wavetable_click(self):
+        """Test the harmonic wavetable click matches the summed sines"""
+        click = ToneGenerator(engine="wavetable").generate_impact_click(volume=1.0)
+        k = np.arange(1323)
+        expected = sum(
+            weight * np.sin(2 * np.pi * freq * k / 44100)
+            for freq, weight in ((1000, 1.0), (2000, 0.5), (3000, 0.25))
+        ) * np.exp(-np.linspace(0, 0.03, 1323) * 50)
+        np.testing.assert_allclose(click, expected, atol=1e-3)
+
+    def test_invalid_engine(self):
+        with pytest.raises(ValueError):
+            ToneGenerator(engine="fm")
+
+    def test_batch_invalid_spec(self, tone_generator):
+        """Test error handling for invalid batch specs"""
+        with pytest.raises(ValueError):
+            tone_generator.generate_batch([ToneSpec(freq=0, duration_s=0.1)])
+        with pytest.raises(ValueError):
+            tone_generator.generate_batch([ToneSpec(freq=440, duration_s=-0.1)])
+
 # Test Audio Player
 class TestAudioPlayer:
     def test_shot_type_setting(self, audio_player):
@@ -129,8 +293,7 @@ class TestAudioPlayer:
         audio_player.set_shot_type("invalid_type")
         assert audio_player.shot_type == "long_game"
 
-    @patch('sounddevice.OutputStream')
-    def test_preload_swing_tones(self, mock_output_stream, audio_player):
+    def test_preload_swing_tones(self, audio_player):
         """Test tone preloading"""
         audio_player.preload_swing_tones(0.9, 0.3)
         
@@ -148,131 +311,291 @@ class TestAudioPlayer:
         assert audio_player.backswing_time == backswing
         assert audio_player.downswing_time == downswing
 
-    @patch('sounddevice.play')
-    @patch('sounddevice.wait')
-    def test_play_swing_sequence(self, mock_wait, mock_play, audio_player):
+    def test_play_swing_sequence(self, audio_player):
         """Test complete swing sequence playback"""
         audio_player.set_timing(0.9, 0.3)
         audio_player.preload_swing_tones(0.9, 0.3)
         
         # Mock time.sleep to speed up test
-        with patch('time.sleep'):
+        with patch('time.sleep'), patch.object(audio_player, 'speak'):
             audio_player.play_swing_sequence()
             
-        # Verify proper sequence of tone playback
-        assert mock_play.call_count > 0
-        assert mock_wait.call_count > 0
+        # Every cue is queued on the shared stream instead of blocking
+        assert len(audio_player._pending) == 7
 
     def test_cleanup(self, audio_player):
         """Test resource cleanup"""
         audio_player.preload_swing_tones(0.9, 0.3)
         audio_player.cleanup()
-        assert len(audio_player._streams) == 0
+        assert audio_player._stream is None
+
+    def test_single_output_stream(self, audio_player):
+        """Test that all tones share one callback-driven stream"""
+        audio_player.preload_swing_tones(0.9, 0.3)
+        backend = audio_player.backend
+        audio_player.play('metronome')
+        audio_player.play('impact')
+        assert audio_player.backend is backend
+        assert isinstance(backend, MemoryBackend)
+
+    def test_backend_records_exact_positions(self, audio_player):
+        """
+        Test cues land on their exact sample index in the recorded output
+        Time Complexity: O(n) where n is rendered sample count
+        """
+        audio_player.preload_swing_tones(0.9, 0.3)
+        audio_player.schedule('backswing_start', 300)
+        audio_player.schedule('impact', 5000)
+        audio_player.backend.pump(12800)
+
+        recorded = audio_player.backend.recorded()[:, 0]
+        backswing = audio_player.cached_tones['backswing_start']
+        impact = audio_player.cached_tones['impact']
+        np.testing.assert_array_equal(recorded[300:300 + len(backswing)], backswing)
+        np.testing.assert_array_equal(recorded[5000:5000 + len(impact)], impact)
+        assert np.all(recorded[:300] == 0)
+
+    def test_cues_timestamped_on_dac_clock(self, audio_player):
+        """Test each cue is stamped from the block DAC time plus its offset"""
+        audio_player.preload_swing_tones(0.9, 0.3)
+        backend = audio_player.backend
+        audio_player.schedule('backswing_start', 300)
+        audio_player.schedule('impact', 5000)
+        backend.pump(12800)
+
+        cues = audio_player.drain_cues()
+        assert [cue.name for cue in cues] == ['backswing_start', 'impact']
+        assert [cue.sample for cue in cues] == [300, 5000]
+        start_time = cues[0].time - 300 / audio_player.sample_rate
+        assert cues[1].time == pytest.approx(start_time + 5000 / audio_player.sample_rate)
+        assert audio_player.drain_cues() == []
 
-    @patch('time.sleep')
-    def test_play_swing_sequence_with_speech(self, mock_sleep, audio_player, mock_tts_engine):
+    def test_calibrated_latency_offsets_cues(self, audio_player, monkeypatch):
+        """Test a saved device profile shifts cue times and the reported latency"""
+        profile = LatencyProfile("memory", audio_player.sample_rate, 128, reported=0.0, measured=0.042)
+        monkeypatch.setattr(audio_module, "find_profile", lambda backend: profile)
+        audio_player.preload_swing_tones(0.9, 0.3)
+        assert audio_player.output_latency == 0.042
+
+        audio_player.schedule('impact', 0)
+        audio_player.backend.pump(128)
+        cue, = audio_player.drain_cues()
+        assert cue.time == pytest.approx(audio_player.backend._start_time + 0.042)
+
+    def test_cues_rendered_ahead_by_latency(self, audio_player, monkeypatch):
+        """Test each cue is rendered the calibrated latency before its timeline onset"""
+        profile = LatencyProfile("memory", audio_player.sample_rate, 128, reported=0.0, measured=0.042)
+        monkeypatch.setattr(audio_module, "find_profile", lambda backend: profile)
+        audio_player.set_timing(0.9, 0.3)
+        audio_player.preload_swing_tones(0.9, 0.3)
+        lead = round(0.042 * audio_player.sample_rate)
+        assert audio_player.latency_samples == lead
+
+        with patch.object(audio_player, 'speak'), patch.object(audio_player, 'schedule') as schedule:
+            boundary = audio_player.play_swing_sequence()
+        origin = audio_player._timeline_origin
+        queued = [(c.args[0], c.args[1]) for c in schedule.call_args_list]
+        timeline = audio_player.timeline
+        assert queued == [(name, origin - lead + at) for name, at in timeline.onsets()]
+        assert boundary == origin - lead + timeline.cycle_start(1)
+        # Heard no sooner than the usual scheduling margin
+        assert origin - lead >= audio_player.sample_clock + round(0.05 * audio_player.sample_rate)
+
+    def test_cue_time_falls_back_to_perf_counter(self, audio_player):
+        """Test cues are still timed when the backend reports no DAC time"""
+        audio_player.preload_swing_tones(0.9, 0.3)
+        audio_player.schedule('impact', 64)
+
+        out = np.zeros((128, 1), dtype=np.float32)
+        before = time.perf_counter()
+        audio_player._callback(out, 128, None, None)
+
+        cue, = audio_player.drain_cues()
+        assert cue.time >= before + 64 / audio_player.sample_rate
+
+    def test_schedule_is_sample_accurate(self, audio_player):
+        """
+        Test that a scheduled tone lands on its exact sample index
+        Time Complexity: O(n) where n is rendered sample count
+        """
+        audio_player.preload_swing_tones(0.9, 0.3)
+        tone = audio_player.cached_tones['impact']
+        audio_player.schedule('impact', 200)
+
+        out = np.zeros((128, 1), dtype=np.float32)
+        rendered = []
+        for _ in range(4):
+            audio_player._callback(out, 128, None, None)
+            rendered.append(out[:, 0].copy())
+        rendered = np.concatenate(rendered)
+
+        assert audio_player.sample_clock == 512
+        assert np.all(rendered[:200] == 0)
+        np.testing.assert_array_equal(rendered[200:512], tone[:312])
+
+    def test_overlapping_tones_are_limited(self, audio_player):
+        """Test that overlapping tones are summed and clipped to full scale"""
+        audio_player.preload_swing_tones(0.9, 0.3)
+        audio_player.cached_tones['loud'] = np.ones(256, dtype=np.float32)
+        audio_player.schedule('loud', 0)
+        audio_player.schedule('loud', 64)
+
+        out = np.zeros((128, 1), dtype=np.float32)
+        audio_player._callback(out, 128, None, None)
+        assert np.all(out[:64, 0] == 1.0)
+        assert np.all(out[64:, 0] == 1.0)
+
+        # Both tones carry on into the next block, still summed past full scale
+        audio_player._callback(out, 128, None, None)
+        assert np.all(out[:, 0] == 1.0)
+
+    def test_multichannel_routing(self):
+        """Test tones land only on their routed channel, at their gain"""
+        player = AudioPlayer(backend=MemoryBackend(44100, channels=4))
+        try:
+            player.preload_swing_tones(0.9, 0.3)
+            tone = player.cached_tones['impact']
+            player.schedule('impact', 0, channel=2, gain=0.5)
+            player.schedule('impact', 64, channel=3)
+            player.backend.pump(len(tone) + 128)
+
+            recorded = player.backend.recorded()
+            assert recorded.shape[1] == 4
+            assert np.all(recorded[:, :2] == 0)
+            np.testing.assert_allclose(recorded[:len(tone), 2], tone * 0.5)
+            np.testing.assert_array_equal(recorded[64:64 + len(tone), 3], tone)
+            with pytest.raises(ValueError):
+                player.schedule('impact', 0, channel=4)
+        finally:
+            player.cleanup()
+
+    def test_loop_is_gapless(self, audio_player):
+        """Test a looped cycle wraps across blocks without gaps"""
+        audio_player.preload_swing_tones(0.9, 0.3)
+        cycle = np.arange(1, 301, dtype=np.float32) / 1000
+        assert audio_player.start_loop(cycle) == 0
+
+        out = np.zeros((128, 1), dtype=np.float32)
+        rendered = []
+        for _ in range(7):
+            audio_player._callback(out, 128, None, None)
+            rendered.append(out[:, 0].copy())
+        rendered = np.concatenate(rendered)
+
+        np.testing.assert_array_equal(rendered[:896], np.tile(cycle, 3)[:896])
+
+        audio_player.stop_loop()
+        audio_player._callback(out, 128, None, None)
+        assert np.all(out == 0)
+
+    def test_play_swing_sequence_with_speech(self, audio_player):
         """
         Test complete swing sequence with speech integration
         Time Complexity: O(1)
         """
         audio_player.set_timing(0.9, 0.3)
         audio_player.preload_swing_tones(0.9, 0.3)
+        audio_player.set_current_pro("Adam Scott")
         
-        with patch.object(audio_player, 'play') as mock_play:
+        with patch.object(audio_player, 'schedule') as mock_schedule, \
+                patch.object(audio_player, 'speak') as mock_speak:
             audio_player.play_swing_sequence()
             
-            # Verify speech prompts
-            expected_speech_calls = [
-                call("Address the ball"),
-                call("Start backswing"),
-                call("Start downswing"),
-                call("Impact")
+            # Prompts fill the lead-in: announcement, then "Address the ball" 0.5s later
+            start = mock_speak.call_args_list[0][0][1]
+            assert mock_speak.call_args_list == [
+                call("Starting Adam Scott", start),
+                call("Address the ball", start + 22050),
             ]
-            actual_speech_calls = [
-                call(args[0]) for args, _ in mock_tts_engine.say.call_args_list
-            ]
-            assert actual_speech_calls == expected_speech_calls
             
-            # Verify tone playback sequence
+            # Count-in at 1.5s, beats a third of the backswing apart, then the swing cues
             expected_tone_calls = [
-                call('metronome'),
-                call('metronome'),
-                call('metronome'),
-                call('metronome'),
-                call('backswing_start'),
-                call('downswing_start'),
-                call('impact')
+                call('metronome', start + 66150),
+                call('metronome', start + 79380),
+                call('metronome', start + 92610),
+                call('metronome', start + 105840),
+                call('backswing_start', start + 119070),
+                call('downswing_start', start + 158760),
+                call('impact', start + 171990)
             ]
-            assert mock_play.call_args_list == expected_tone_calls
+            assert mock_schedule.call_args_list == expected_tone_calls
 
-    def test_error_handling_tts(self, audio_player, mock_tts_engine):
-        """
-        Test TTS error handling
-        Time Complexity: O(1)
-        """
-        mock_tts_engine.say.side_effect = Exception("TTS Error")
-        
-        # Should not raise exception but log error
-        with pytest.warns(UserWarning):
-            audio_player.speak("Test speech")
-
-    @pytest.mark.parametrize("text,expected_delay", [
-        ("Short text", 0.5),
-        ("This is a longer piece of text that should take more time", 1.5)
-    ])
-    def test_speech_timing(self, text, expected_delay, audio_player, mock_tts_engine):
-        """
-        Test speech timing adaptation
-        Time Complexity: O(1)
-        """
-        with patch('time.sleep') as mock_sleep:
-            audio_player.speak(text)
-            # Verify appropriate delays based on text length
-            assert mock_tts_engine.say.called
-            assert mock_tts_engine.runAndWait.called
+    def test_swing_sequences_follow_back_to_back(self, audio_player):
+        """Test consecutive cycles start on exact multiples of the rational cycle length"""
+        audio_player.set_timing(0.9, 0.3)
+        audio_player.preload_swing_tones(0.9, 0.3)
+        timeline = audio_player.timeline
 
-    def test_concurrent_audio_speech(self, audio_player, mock_tts_engine):
-        """
-        Test handling of concurrent audio and speech
-        Time Complexity: O(1)
-        """
-        with patch.object(audio_player, 'play') as mock_play:
-            # Simulate concurrent audio and speech
-            audio_player.play('metronome')
-            audio_player.speak("Test")
-            
-            # Verify proper sequencing
-            mock_play.assert_called_once_with('metronome')
-            mock_tts_engine.say.assert_called_once_with("Test")
+        with patch.object(audio_player, 'speak'):
+            starts = [audio_player.play_swing_sequence() for _ in range(3)]
 
-# Add new test class for TTS functionality
-class TestTextToSpeech:
-    def test_tts_initialization(self, audio_player, mock_tts_engine):
-        """
-        Test TTS engine initialization and configuration
-        Time Complexity: O(1)
-        """
-        assert audio_player.tts_engine is not None
-        mock_tts_engine.setProperty.assert_has_calls([
-            call('rate', 150),
-            call('volume', 0.9)
-        ])
+        origin = starts[0] - timeline.cycle_start(1)
+        assert starts == [origin + timeline.cycle_start(n) for n in (1, 2, 3)]
+        assert [event.start for event in audio_player._pending][-1] == origin + timeline.onsets(2)[-1][1]
+
+    def test_late_sequence_is_reanchored(self, audio_player):
+        """Test a cycle queued after its start time plays whole instead of partly in the past"""
+        audio_player.set_timing(0.9, 0.3)
+        audio_player.preload_swing_tones(0.9, 0.3)
+        with patch.object(audio_player, 'speak'):
+            audio_player.play_swing_sequence()
+            audio_player._sample_clock += 10 * 44100
+            audio_player.play_swing_sequence()
+        assert audio_player._pending[-7].start > audio_player.sample_clock
+
+    def test_timeline_sequence_is_sample_exact(self, audio_player):
+        """Test the callback queues timeline cues at their onsets across cycles"""
+        from ..timeline import SwingTimeline
 
-    def test_speak_method(self, audio_player, mock_tts_engine):
+        audio_player.preload_swing_tones(0.9, 0.3)
+        timeline = SwingTimeline(Fraction(1, 100), Fraction(1, 300), 44100, rest=Fraction(1, 1000))
+        assert audio_player.start_timeline(timeline) == 0
+
+        out = np.zeros((128, 1), dtype=np.float32)
+        for _ in range(50):
+            audio_player._callback(out, 128, None, None)
+
+        played = [(cue.name, cue.sample) for cue in audio_player.drain_cues()]
+        expected = []
+        for name, at in timeline.iter_onsets():
+            if at >= 50 * 128:
+                break
+            expected.append((name, at))
+        assert played == expected
+
+        audio_player.stop_timeline()
+        assert audio_player._sequence is None
+
+    def test_speak_plays_cached_clip(self, audio_player):
         """
-        Test speak method execution
+        Test a rendered prompt is queued on the output stream
         Time Complexity: O(1)
         """
-        test_text = "Test speech"
-        audio_player.speak(test_text)
-        
-        mock_tts_engine.say.assert_called_once_with(test_text)
-        mock_tts_engine.runAndWait.assert_called_once()
+        clip = np.full(2205, 0.1, dtype=np.float32)
+        audio_player.audio_cache.add_clips({voice_key("Test speech"): clip})
 
-    def test_cleanup_includes_tts(self, audio_player, mock_tts_engine):
+        assert audio_player.speak("Test speech") is True
+        assert audio_player._pending[-1].samples is clip
+        assert audio_player._pending[-1].start == audio_player.sample_clock
+
+    def test_speak_never_blocks_on_tts(self, audio_player, mock_tts_engine):
+        """Test an unrendered prompt is queued for rendering and skipped"""
+        with patch.object(audio_player.voice, 'prerender') as mock_prerender:
+            assert audio_player.speak("Not rendered yet") is False
+            mock_prerender.assert_called_once_with(["Not rendered yet"])
+
+        mock_tts_engine.say.assert_not_called()
+        mock_tts_engine.runAndWait.assert_not_called()
+        assert len(audio_player._pending) == 0
+
+    def test_concurrent_audio_speech(self, audio_player):
         """
-        Test TTS cleanup during AudioPlayer cleanup
+        Test tones and speech mix on the same stream
         Time Complexity: O(1)
         """
-        audio_player.cleanup()
-        mock_tts_engine.stop.assert_called_once() 
\ No newline at end of file
+        audio_player.preload_swing_tones(0.9, 0.3)
+        audio_player.audio_cache.add_clips({voice_key("Test"): np.zeros(100, dtype=np.float32)})
+
+        audio_player.play('metronome')
+        audio_player.speak("Test")
+        assert len(audio_player._pending) == 2
@@ -0,0 +1,81 @@
+import time
+import pytest
+import numpy as np
+from ..backends import (
+    FileBackend,
+    MemoryBackend,
+    NullBackend,
+    SoundDeviceBackend,
+    create_backend,
+)
+
+SAMPLE_RATE = 44100
+
+def ramp_callback(outdata, frames, time_info, status):
+    """Fill each block with a running sample counter"""
+    start = ramp_callback.clock
+    outdata[:, 0] = np.arange(start, start + frames)
+    ramp_callback.clock += frames
+
+@pytest.fixture(autouse=True)
+def reset_ramp():
+    ramp_callback.clock = 0
+
+class TestCreateBackend:
+    @pytest.mark.parametrize("name,cls", [
+        ("sounddevice", SoundDeviceBackend),
+        ("null", NullBackend),
+        ("memory", MemoryBackend),
+        ("file", FileBackend),
+    ])
+    def test_backend_by_name(self, name, cls):
+        assert isinstance(create_backend(name, SAMPLE_RATE), cls)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_backend("alsa", SAMPLE_RATE)
+
+class TestVirtualBackends:
+    def test_memory_backend_records_blocks(self):
+        """
+        Test pumped blocks are captured sample for sample
+        Time Complexity: O(n) where n is rendered sample count
+        """
+        backend = MemoryBackend(SAMPLE_RATE, blocksize=128)
+        backend.start(ramp_callback)
+        backend.pump(300)
+
+        recorded = backend.recorded()[:, 0]
+        assert backend.frames_rendered == 384
+        np.testing.assert_array_equal(recorded, np.arange(384))
+
+    def test_virtual_dac_time_follows_sample_clock(self):
+        """Test virtual DAC times advance by exactly one block per callback"""
+        times = []
+        backend = NullBackend(SAMPLE_RATE, blocksize=441, realtime=False)
+        backend.start(lambda out, frames, time_info, status: times.append(time_info.outputBufferDacTime))
+        backend.pump(441 * 3)
+        assert np.diff(times) == pytest.approx([0.01, 0.01])
+
+    def test_realtime_null_backend_advances(self):
+        """Test the realtime null sink keeps rendering on its own thread"""
+        backend = NullBackend(SAMPLE_RATE, blocksize=128, realtime=True)
+        backend.start(ramp_callback)
+        time.sleep(0.05)
+        backend.close()
+        assert backend.closed
+        assert backend.frames_rendered > 0
+
+    def test_file_backend(self, tmp_path):
+        """Test the file sink writes every rendered block"""
+        import soundfile as sf
+
+        backend = FileBackend(SAMPLE_RATE, blocksize=128, path=tmp_path / "out.wav", realtime=False)
+        backend.start(lambda out, frames, time_info, status: out.fill(0.5))
+        backend.pump(1280)
+        backend.close()
+
+        data, sample_rate = sf.read(str(tmp_path / "out.wav"), dtype='float32')
+        assert sample_rate == SAMPLE_RATE
+        assert len(data) == 1280
+        assert data == pytest.approx(0.5, abs=1e-4)
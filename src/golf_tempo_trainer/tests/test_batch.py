@@ -0,0 +1,94 @@
+import csv
+import pytest
+import numpy as np
+import soundfile as sf
+from ..batch import analyze_directory, analyze_file, find_audio_files, format_summary, write_summary
+from ..tempo import SwingTempo
+
+SAMPLE_RATE = 44100
+
+@pytest.fixture
+def swing_tempo():
+    return SwingTempo(
+        shot_type="Long Game",
+        pro_name="Adam Scott",
+        bpm=73,
+        ratio=3.0,
+        frames="24/8",
+        description="Smooth, classic tempo",
+        learning_notes=""
+    )
+
+def recording(swings, seconds=6.0, sample_rate=SAMPLE_RATE):
+    """Quiet noise with a knock for each (takeaway, transition, impact) swing"""
+    rng = np.random.default_rng(2)
+    signal = rng.normal(0, 0.002, int(seconds * sample_rate)).astype(np.float32)
+    n = int(0.03 * sample_rate)
+    t = np.arange(n) / sample_rate
+    knock = np.sin(2 * np.pi * 1500 * t) * np.exp(-t * 120)
+    for swing in swings:
+        for at, amplitude in zip(swing, (0.1, 0.2, 0.9)):
+            start = int(at * sample_rate)
+            signal[start:start + n] += amplitude * knock
+    return signal
+
+@pytest.fixture
+def session_dir(tmp_path):
+    sf.write(str(tmp_path / "bay1.wav"), recording([(0.5, 1.25, 1.5), (3.5, 4.5, 4.9)]), SAMPLE_RATE)
+    nested = tmp_path / "monday"
+    nested.mkdir()
+    sf.write(str(nested / "bay2.flac"), recording([(1.0, 1.6, 1.9)]), SAMPLE_RATE)
+    (tmp_path / "notes.txt").write_text("not audio")
+    return tmp_path
+
+class TestBatchAnalysis:
+    def test_finds_audio_recursively(self, session_dir):
+        names = [path.name for path in find_audio_files(session_dir)]
+        assert names == ["bay1.wav", "bay2.flac"]
+
+    def test_analyze_file(self, session_dir, swing_tempo):
+        """Test each swing is timed and graded against the pro's ratio"""
+        result = analyze_file(session_dir / "bay1.wav", swing_tempo)
+
+        assert result.error is None
+        assert [swing.swing for swing in result.swings] == [1, 2]
+        first, second = result.swings
+        assert first.start_s == pytest.approx(0.5, abs=0.006)
+        assert first.ratio == pytest.approx(3.0, rel=0.05)
+        assert first.grade == "excellent"
+        assert second.ratio == pytest.approx(2.5, rel=0.05)
+        assert second.grade == "focus"
+
+    def test_other_sample_rates(self, tmp_path, swing_tempo):
+        path = tmp_path / "phone.wav"
+        sf.write(str(path), recording([(0.5, 1.25, 1.5)], sample_rate=48000), 48000)
+        swing, = analyze_file(path, swing_tempo).swings
+        assert swing.backswing == pytest.approx(0.75, abs=0.006)
+
+    def test_bad_file_is_reported(self, tmp_path, swing_tempo):
+        path = tmp_path / "broken.wav"
+        path.write_bytes(b"not a wav file")
+        result = analyze_file(path, swing_tempo)
+        assert result.swings == []
+        assert result.error
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_directory_across_workers(self, session_dir, swing_tempo, workers):
+        """Test the process pool returns the same results, in file order"""
+        results = analyze_directory(session_dir, swing_tempo, workers=workers)
+        assert [len(result.swings) for result in results] == [2, 1]
+        assert results[1].path.endswith("bay2.flac")
+
+    def test_summary_table(self, session_dir, swing_tempo, tmp_path):
+        results = analyze_directory(session_dir, swing_tempo, workers=1)
+        path = tmp_path / "summary.csv"
+        assert write_summary(results, path) == 3
+
+        with open(path, newline="") as summary_file:
+            rows = list(csv.DictReader(summary_file))
+        assert [row["swing"] for row in rows] == ["1", "2", "1"]
+        assert {"backswing", "downswing", "ratio", "ratio_error", "grade"} <= set(rows[0])
+
+        report = format_summary(results, swing_tempo)
+        assert "bay1.wav" in report
+        assert "2 files, 3 swings" in report
@@ -0,0 +1,150 @@
+import asyncio
+import pytest
+from ..backends import NullBackend
+from ..bays import SessionManager
+from ..catalog import default_catalog
+
+SAMPLE_RATE = 44100
+TICK_FRAMES = 882  # One 20ms scheduler tick
+
+@pytest.fixture
+def backend():
+    return NullBackend(SAMPLE_RATE, blocksize=128, realtime=False)
+
+@pytest.fixture
+def manager(backend):
+    manager = SessionManager(backend=backend)
+    yield manager
+    manager.close()
+
+def tempo(shot_type="Long Game", pro_name="Adam Scott"):
+    return default_catalog().get(shot_type, pro_name)
+
+def advance(manager, backend, seconds):
+    for _ in range(round(seconds * SAMPLE_RATE / TICK_FRAMES)):
+        manager.tick()
+        backend.pump(TICK_FRAMES)
+
+class TestSessionManager:
+    def test_sessions_are_independent(self, manager, backend):
+        """Test each bay keeps its own tempo, cycle count and stats"""
+        manager.add_session("Bay 1", tempo())
+        manager.add_session("Bay 2", tempo("Putting", "Jake Armijo"))
+        advance(manager, backend, 10)
+
+        bay1, bay2 = manager.get("Bay 1"), manager.get("Bay 2")
+        assert bay1.stats.swings > 0 and bay2.stats.swings > 0
+        assert bay1.last_timing.ratio == pytest.approx(3.0, abs=0.01)
+        assert bay2.last_timing.ratio == pytest.approx(2.0, abs=0.01)
+        assert bay1.resyncs == bay2.resyncs == 0
+
+    def test_cycles_follow_exact_timeline(self, manager, backend):
+        session = manager.add_session("Bay 1", tempo())
+        manager.tick()
+        origin = session.next_start - session.timeline.cycle_start(1)
+        advance(manager, backend, 10)
+        assert session.next_start == origin + session.timeline.cycle_start(session.cycles)
+
+    def test_stopped_session_queues_nothing(self, manager, backend):
+        session = manager.add_session("Bay 1", tempo(), running=False)
+        advance(manager, backend, 1)
+        assert session.cycles == 0
+
+        manager.start_session("Bay 1")
+        manager.tick()
+        assert session.cycles == 1
+
+    def test_switch_tempo_on_cycle_boundary(self, manager, backend):
+        session = manager.add_session("Bay 1", tempo())
+        manager.tick()
+        boundary = session.next_start
+
+        manager.switch_tempo("Bay 1", tempo("Long Game", "Rory McIlroy"))
+        assert session.next_start == boundary
+        assert session.tempo.bpm == 98
+
+    def test_scheduler_falling_behind_resyncs(self, manager, backend):
+        session = manager.add_session("Bay 1", tempo())
+        manager.tick()
+        backend.pump(10 * SAMPLE_RATE)
+        manager.tick()
+        assert session.resyncs == 1
+        assert session.next_start > manager.player.sample_clock
+
+    def test_drill_steps_each_cycle(self, manager, backend):
+        from ..drills import TempoRamp
+        session = manager.add_session("Bay 1", tempo())
+        manager.tick()
+        boundary = session.next_start
+        ramp = TempoRamp(tempo(), tempo("Long Game", "Rory McIlroy"), 3)
+        manager.start_drill("Bay 1", ramp)
+        assert session.next_start == boundary
+        assert session.to_dict()["drill"] == {"swing": 1, "swings": 3, "to": "Rory McIlroy"}
+
+        advance(manager, backend, 12)
+        assert session.drill is None
+        assert session.tempo is ramp.end
+        assert session.stats.swings >= 3
+        assert session.last_timing.total == pytest.approx(60 / 98, abs=0.006)
+
+    def test_duplicate_and_unknown_sessions(self, manager):
+        manager.add_session("Bay 1", tempo())
+        with pytest.raises(ValueError):
+            manager.add_session("Bay 1", tempo())
+        with pytest.raises(KeyError):
+            manager.get("Bay 9")
+        manager.remove_session("Bay 1")
+        assert manager.sessions == []
+
+    def test_many_sessions_share_one_output(self, manager, backend):
+        for i in range(50):
+            manager.add_session(f"Bay {i + 1}", tempo())
+        # Impacts land at about 1.7s and 4.8s
+        advance(manager, backend, 4)
+        assert manager.player.backend is backend
+        assert all(session.stats.swings == 1 for session in manager.sessions)
+
+    def test_sessions_routed_to_channels(self):
+        """Test bays take channels in turn and each plays only on its own"""
+        backend = NullBackend(SAMPLE_RATE, channels=2, blocksize=128, realtime=False)
+        manager = SessionManager(backend=backend, channels=2)
+        try:
+            bays = [manager.add_session(f"Bay {i + 1}", tempo()) for i in range(3)]
+            assert [bay.channel for bay in bays] == [0, 1, 0]
+            manager.route("Bay 3", 1, gain=0.5)
+            assert (bays[2].channel, bays[2].gain) == (1, 0.5)
+            with pytest.raises(ValueError):
+                manager.route("Bay 1", 2)
+            with pytest.raises(ValueError):
+                manager.add_session("Bay 4", tempo(), channel=5)
+            advance(manager, backend, 2)
+            assert all(bay.stats.swings == 1 for bay in bays)
+            assert "ch 2" in manager.format_report()
+        finally:
+            manager.close()
+
+    def test_listeners_get_events(self, manager, backend):
+        events = []
+        manager.add_listener(events.append)
+        manager.add_session("Bay 1", tempo())
+        advance(manager, backend, 2)
+        manager.stop_session("Bay 1")
+        manager.remove_listener(events.append)
+        manager.start_session("Bay 1")
+
+        types = [event["type"] for event in events]
+        assert types[0] == "session" and events[0]["change"] == "added"
+        assert types.count("cue") == 7
+        assert types.count("swing") == 1
+        assert events[-1]["change"] == "stopped"
+        swing = next(event for event in events if event["type"] == "swing")
+        assert swing["grade"] == "excellent"
+
+    def test_run_until_duration(self):
+        manager = SessionManager(backend="null")
+        manager.add_session("Bay 1", tempo())
+        try:
+            asyncio.run(manager.run(duration=0.1))
+        finally:
+            manager.close()
+        assert manager.get("Bay 1").cycles == 1
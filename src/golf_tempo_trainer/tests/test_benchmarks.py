@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from ..benchmarks import (
+    bench_bays,
+    bench_cache,
+    bench_scheduler,
+    compare_results,
+    format_regressions,
+    format_startup_report,
+    load_results,
+    measure_startup,
+    save_results,
+)
+
+PACKAGE_ROOT = str(Path(__file__).resolve().parents[2])
+
+def loaded_modules(code: str) -> set:
+    """Modules loaded after running code in a fresh interpreter"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_ROOT, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code + "\nimport sys; print(' '.join(sys.modules))"],
+        capture_output=True, text=True, env=env, check=True
+    )
+    return set(result.stdout.split())
+
+class TestLazyImports:
+    def test_menu_path_skips_heavy_backends(self):
+        """Test the CLI menu loads without NumPy, PortAudio or the speech engine"""
+        modules = loaded_modules("import golf_tempo_trainer.__main__")
+        assert "numpy" not in modules
+        assert "sounddevice" not in modules
+        assert "pyttsx3" not in modules
+        assert "pydub" not in modules
+
+    def test_player_defers_device(self):
+        """Test constructing an AudioPlayer opens neither PortAudio nor TTS"""
+        modules = loaded_modules(
+            "from golf_tempo_trainer.audio import AudioPlayer\n"
+            "player = AudioPlayer()\n"
+            "player.voice.shutdown()"
+        )
+        assert "sounddevice" not in modules
+
+class TestStartupBenchmark:
+    def test_measure_startup(self):
+        """Test every startup step is reported in seconds"""
+        results = measure_startup(repeat=1)
+        assert "import golf_tempo_trainer.__main__" in results
+        assert "first cue" in results
+        assert all(seconds is None or seconds > 0 for seconds in results.values())
+
+    def test_report_format(self):
+        report = format_startup_report({"import x": 0.0123, "first cue": None})
+        assert "12.3 ms" in report
+        assert "unavailable" in report
+
+class TestBenchmarkSuite:
+    def test_cache_paths(self, tmp_path):
+        """Test cold, disk and memory lookups are all measured, fastest from memory"""
+        results = bench_cache(2, tmp_path)
+        assert set(results) == {"AudioCache cold", "AudioCache disk", "AudioCache memory"}
+        assert results["AudioCache memory"] < results["AudioCache cold"]
+
+    def test_scheduler_on_null_sink(self):
+        results = bench_scheduler()
+        assert "null sink p99 block lateness" in results
+        assert all(seconds is None or seconds >= 0 for seconds in results.values())
+
+    def test_bay_sessions_on_null_sink(self):
+        results = bench_bays(sessions=5, seconds=2.0, channels=2)
+        assert list(results) == ["5 bay sessions on 2 channels (2s of audio)"]
+        assert results["5 bay sessions on 2 channels (2s of audio)"] > 0
+
+    def test_results_round_trip(self, tmp_path):
+        results = {"numpy sweep 1s": 0.001, "first cue": None}
+        path = tmp_path / "results.json"
+        save_results(results, path)
+        assert load_results(path) == results
+
+class TestBaselineComparison:
+    def test_regression_detected(self):
+        regressions = compare_results({"render": 0.030}, {"render": 0.020}, tolerance=0.25)
+        assert [r.name for r in regressions] == ["render"]
+        assert regressions[0].change == pytest.approx(0.5)
+        assert "+50%" in format_regressions(regressions)
+
+    def test_within_tolerance(self):
+        assert compare_results({"render": 0.024}, {"render": 0.020}, tolerance=0.25) == []
+
+    def test_noise_floor(self):
+        """Test tiny absolute slowdowns on microbenchmarks are not regressions"""
+        assert compare_results({"click": 40e-6}, {"click": 10e-6}) == []
+
+    def test_missing_results_skipped(self):
+        assert compare_results({"first cue": None, "new": 1.0}, {"first cue": 0.1}) == []
@@ -0,0 +1,132 @@
+import dataclasses
+import json
+import pytest
+from ..catalog import CatalogError, TempoCatalog, default_catalog, load_catalog, parse_frames
+from ..config import TEMPO_CONFIG
+
+CUSTOM = {
+    "Long Game": {
+        "description": "Custom long game",
+        "learning_notes": "Custom notes",
+        "pros": {
+            "Club Pro": {
+                "bpm": 70,
+                "ratio": 3.0,
+                "frames": "27/9",
+                "description": "Slow default",
+                "clubs": {
+                    "Driver": {"bpm": 66, "frames": "27/9"},
+                    "Wedge": {"bpm": 84, "frames": "21/7", "description": "Quick wedges"}
+                }
+            }
+        }
+    }
+}
+
+@pytest.fixture
+def catalog():
+    return TempoCatalog.from_config(CUSTOM)
+
+class TestCompile:
+    def test_builtin_catalog(self):
+        catalog = default_catalog()
+        pro_count = sum(len(shot["pros"]) for shot in TEMPO_CONFIG.values())
+        assert len(catalog) == pro_count
+        assert catalog.shot_types() == list(TEMPO_CONFIG)
+        assert catalog.pros("Putting") == list(TEMPO_CONFIG["Putting"]["pros"])
+
+    def test_records_are_immutable(self, catalog):
+        tempo = catalog.get("Long Game", "Club Pro")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            tempo.bpm = 90
+        assert tempo.total_time == pytest.approx(60 / 70)
+        assert tempo.backswing_time == pytest.approx(60 / 70 * 0.75)
+
+    def test_clubs_inherit_from_pro(self, catalog):
+        assert catalog.clubs("Long Game", "Club Pro") == ["", "Driver", "Wedge"]
+        driver = catalog.get("Long Game", "Club Pro", "Driver")
+        assert driver.bpm == 66
+        assert driver.ratio == 3.0
+        assert driver.description == "Slow default"
+        assert catalog.get("Long Game", "Club Pro", "Wedge").description == "Quick wedges"
+
+    @pytest.mark.parametrize("change, message", [
+        ({"bpm": -70}, "'bpm' must be a positive number"),
+        ({"ratio": "fast"}, "'ratio' must be a positive number"),
+        ({"frames": "27-9"}, "Frames must look like"),
+        ({"frames": "24/6"}, "frames 24/6 do not match ratio"),
+    ])
+    def test_invalid_entry_is_named(self, change, message):
+        config = {"Long Game": {"pros": {"Bad Pro": {"bpm": 70, "ratio": 3.0, "frames": "27/9", **change}}}}
+        with pytest.raises(CatalogError, match=f"Long Game / Bad Pro: {message}"):
+            TempoCatalog.from_config(config)
+
+    def test_invalid_club_is_named(self):
+        config = {"Long Game": {"pros": {"Pro": {"bpm": 70, "ratio": 3.0, "frames": "27/9",
+                                                 "clubs": {"Driver": {"bpm": 0}}}}}}
+        with pytest.raises(CatalogError, match="Long Game / Pro / Driver"):
+            TempoCatalog.from_config(config)
+
+    def test_half_frames(self):
+        assert parse_frames("15/7.5") == (15.0, 7.5)
+
+class TestLookup:
+    def test_unknown_names(self, catalog):
+        with pytest.raises(ValueError, match="Unknown shot type"):
+            catalog.get("Chipping", "Club Pro")
+        with pytest.raises(ValueError, match="Unknown pro"):
+            catalog.get("Long Game", "Nobody")
+        with pytest.raises(ValueError, match="choose from Driver, Wedge"):
+            catalog.get("Long Game", "Club Pro", "Putter")
+
+    def test_by_frames_and_pro(self, catalog):
+        assert [tempo.club for tempo in catalog.by_frames("27/9")] == ["", "Driver"]
+        assert [tempo.club for tempo in catalog.by_frames("21 / 7")] == ["Wedge"]
+        assert catalog.by_frames("18/6") == ()
+        assert len(catalog.by_pro("Club Pro")) == 3
+
+    def test_nearest_bpm(self, catalog):
+        assert catalog.nearest_bpm(67).club == "Driver"
+        assert catalog.nearest_bpm(68).club == "Driver"  # Tie goes to the slower tempo
+        assert catalog.nearest_bpm(200).club == "Wedge"
+        assert catalog.nearest_bpm(10).club == "Driver"
+
+    def test_nearest_ratio_by_shot(self):
+        catalog = default_catalog()
+        assert catalog.nearest_ratio(2.2, "Short Game").ratio == 2.0
+        assert catalog.nearest_ratio(2.9).ratio == 3.0
+
+    def test_bpm_between(self, catalog):
+        assert [tempo.bpm for tempo in catalog.bpm_between(66, 70)] == [66, 70]
+
+class TestLoad:
+    def test_json_layered_over_builtin(self, tmp_path):
+        path = tmp_path / "custom.json"
+        path.write_text(json.dumps(CUSTOM))
+        catalog = load_catalog(path)
+        assert "Club Pro" in catalog.pros("Long Game")
+        assert "Adam Scott" in catalog.pros("Long Game")
+        assert catalog.get("Long Game", "Adam Scott").learning_notes == "Custom notes"
+
+    def test_toml(self, tmp_path):
+        pytest.importorskip("tomllib")
+        path = tmp_path / "custom.toml"
+        path.write_text(
+            '["Short Game".pros."Toml Pro"]\n'
+            'bpm = 90\nratio = 2.0\nframes = "16/8"\n'
+            '["Short Game".pros."Toml Pro".clubs.Wedge]\n'
+            'bpm = 95\n'
+        )
+        catalog = load_catalog(path, include_builtin=False)
+        assert catalog.shot_types() == ["Short Game"]
+        assert catalog.get("Short Game", "Toml Pro", "Wedge").bpm == 95
+
+    def test_errors_name_the_file(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps({"Putting": {"pros": {"Pro": {"bpm": 80}}}}))
+        with pytest.raises(CatalogError, match="bad.json"):
+            load_catalog(path)
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(CatalogError, match="Unsupported catalog format"):
+            load_catalog(tmp_path / "catalog.yaml")
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import os
+import pytest
+from ..backends import NullBackend
+from ..bays import SessionManager
+from ..catalog import default_catalog
+from ..control import (OP_CLOSE, OP_PING, OP_PONG, ControlServer, encode_frame, read_frame,
+                       websocket_accept)
+
+SAMPLE_RATE = 44100
+TICK_FRAMES = 882
+
+@pytest.fixture
+def backend():
+    return NullBackend(SAMPLE_RATE, blocksize=128, realtime=False)
+
+@pytest.fixture
+def manager(backend):
+    manager = SessionManager(backend=backend)
+    yield manager
+    manager.close()
+
+def tempo(pro_name):
+    return default_catalog().get("Long Game", pro_name)
+
+def serve(manager, test, **options):
+    """Run `test(server)` against a control server on an ephemeral localhost port"""
+    async def main():
+        server = ControlServer(manager, port=0, **options)
+        await server.start()
+        try:
+            await test(server)
+        finally:
+            await server.close()
+    asyncio.run(main())
+
+async def request(server, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    data = b"" if body is None else json.dumps(body).encode()
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+async def open_events(server, query=""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    key = "dGhlIHNhbXBsZSBub25jZQ=="
+    writer.write(f"GET /events{query} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                 f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                 "Sec-WebSocket-Version: 13\r\n\r\n".encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 101")
+    assert websocket_accept(key).encode() in head
+    return reader, writer
+
+async def next_event(reader, type_):
+    while True:
+        opcode, payload = await asyncio.wait_for(read_frame(reader), 2)
+        event = json.loads(payload)
+        if event["type"] == type_:
+            return event
+
+async def advance(manager, backend, seconds):
+    for _ in range(round(seconds * SAMPLE_RATE / TICK_FRAMES)):
+        manager.tick()
+        backend.pump(TICK_FRAMES)
+        await asyncio.sleep(0)
+
+class TestWebSocketFrames:
+    def test_accept_key(self):
+        """Test the handshake answer from RFC 6455's example"""
+        assert websocket_accept("dGhlIHNhbXBsZSBub25jZQ==") == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+
+    def test_masked_round_trip(self):
+        async def main():
+            for size in (5, 300, 70000):
+                payload = os.urandom(size)
+                reader = asyncio.StreamReader()
+                reader.feed_data(encode_frame(payload, mask=b"\x01\x02\x03\x04"))
+                if size <= 65536:
+                    assert await read_frame(reader) == (0x1, payload)
+                else:
+                    with pytest.raises(ValueError):
+                        await read_frame(reader)
+        asyncio.run(main())
+
+class TestControlServer:
+    def test_session_lifecycle(self, manager):
+        async def test(server):
+            status, session = await request(server, "POST", "/sessions",
+                                            {"name": "Bay 1", "shot_type": "Long Game", "pro": "Adam Scott"})
+            assert status == 201
+            assert (session["pro"], session["bpm"], session["running"]) == ("Adam Scott", 73, True)
+
+            status, session = await request(server, "POST", "/sessions/Bay%201/stop")
+            assert (status, session["running"]) == (200, False)
+            status, session = await request(server, "POST", "/sessions/Bay%201/tempo",
+                                            {"pro": "Rory McIlroy"})
+            assert (session["pro"], session["bpm"]) == ("Rory McIlroy", 98)
+            status, session = await request(server, "POST", "/sessions/Bay%201/tempo", {"bpm": 85})
+            assert (session["pro"], session["bpm"], session["ratio"]) == ("Rory McIlroy", 85, 3.0)
+
+            status, session = await request(server, "POST", "/sessions/Bay%201/drill",
+                                            {"pro": "Adam Scott", "swings": 10})
+            assert session["drill"] == {"swing": 1, "swings": 10, "to": "Adam Scott"}
+            assert (await request(server, "POST", "/sessions/Bay%201/drill", {"swings": 1}))[0] == 400
+
+            status, listing = await request(server, "GET", "/sessions")
+            assert [s["name"] for s in listing["sessions"]] == ["Bay 1"]
+            status, _ = await request(server, "DELETE", "/sessions/Bay%201")
+            assert status == 200
+            assert manager.sessions == []
+        serve(manager, test)
+
+    def test_errors(self, manager):
+        async def test(server):
+            assert (await request(server, "GET", "/sessions/Bay%209"))[0] == 404
+            assert (await request(server, "GET", "/swings"))[0] == 404
+            assert (await request(server, "PUT", "/sessions"))[0] == 405
+            status, body = await request(server, "POST", "/sessions", {"name": "Bay 1", "pro": "Nobody"})
+            assert status == 400 and "Nobody" in body["error"]
+            await request(server, "POST", "/sessions", {"name": "Bay 1", "pro": "Adam Scott"})
+            assert (await request(server, "POST", "/sessions", {"name": "Bay 1", "pro": "Adam Scott"}))[0] == 400
+            assert (await request(server, "POST", "/sessions/Bay%201/route", {"channel": 3}))[0] == 400
+        serve(manager, test)
+
+    def test_bad_content_length(self, manager):
+        async def test(server):
+            for length in ("ten", "-1"):
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(f"POST /sessions HTTP/1.1\r\nHost: localhost\r\n"
+                             f"Content-Length: {length}\r\n\r\n".encode())
+                response = await reader.read()
+                writer.close()
+                head, _, body = response.partition(b"\r\n\r\n")
+                assert int(head.split()[1]) == 400
+                assert "Content-Length" in json.loads(body)["error"]
+        serve(manager, test)
+
+    def test_streams_cue_and_swing_events(self, manager, backend):
+        async def test(server):
+            manager.add_session("Bay 1", tempo("Adam Scott"))
+            manager.add_session("Bay 2", tempo("Rory McIlroy"))
+            reader, writer = await open_events(server, "?session=Bay%202")
+            hello = await next_event(reader, "hello")
+            assert [s["name"] for s in hello["sessions"]] == ["Bay 2"]
+
+            await advance(manager, backend, 4)
+            cue = await next_event(reader, "cue")
+            assert cue["session"] == "Bay 2" and cue["cue"] == "metronome"
+            swing = await next_event(reader, "swing")
+            assert swing["session"] == "Bay 2"
+            assert swing["ratio"] == pytest.approx(3.0, abs=0.01)
+            assert swing["grade"] == "excellent"
+
+            # Pings are answered and a close is echoed
+            writer.write(encode_frame(b"hi", OP_PING, mask=b"abcd"))
+            while True:
+                opcode, payload = await asyncio.wait_for(read_frame(reader), 2)
+                if opcode == OP_PONG:
+                    break
+            assert payload == b"hi"
+            writer.write(encode_frame(b"\x03\xe8", OP_CLOSE, mask=b"abcd"))
+            while opcode != OP_CLOSE:
+                opcode, _ = await asyncio.wait_for(read_frame(reader), 2)
+            writer.close()
+        serve(manager, test)
+
+    def test_slow_client_drops_events(self, manager, backend):
+        """Test a client that never reads loses events instead of stalling the scheduler"""
+        async def test(server):
+            manager.add_session("Bay 1", tempo("Adam Scott"))
+            reader, writer = await open_events(server)
+            await asyncio.sleep(0.05)
+            subscriber = next(iter(server._subscribers))
+            for _ in range(40):
+                manager.tick()
+                backend.pump(10 * TICK_FRAMES)
+            assert subscriber.dropped > 0
+            assert subscriber.queue.qsize() == 2
+            writer.close()
+        serve(manager, test, queue_size=2)
+
+    def test_close_ends_event_streams(self, manager):
+        async def test(server):
+            reader, writer = await open_events(server)
+            await next_event(reader, "hello")
+            await server.close()
+            assert (await next_event(reader, "closing"))["type"] == "closing"
+            opcode, payload = await asyncio.wait_for(read_frame(reader), 2)
+            assert (opcode, payload) == (OP_CLOSE, b"\x03\xe9")
+            assert server.subscribers == 0
+        serve(manager, test)
+
+    def test_serve_runs_scheduler(self, manager, backend):
+        manager.add_session("Bay 1", tempo("Adam Scott"))
+        asyncio.run(ControlServer(manager, port=0).serve(duration=0.1))
+        assert manager.get("Bay 1").cycles == 1
@@ -0,0 +1,78 @@
+import pytest
+from fractions import Fraction
+from unittest.mock import patch
+from ..audio import PROMPT_LEAD_S, AudioPlayer
+from ..catalog import default_catalog
+from ..drills import TempoRamp
+from ..timeline import SwingTimeline
+from ..trainer import TempoTrainer
+
+SAMPLE_RATE = 44100
+
+@pytest.fixture
+def ramp():
+    catalog = default_catalog()
+    return TempoRamp(catalog.get("Long Game", "Adam Scott"), catalog.get("Long Game", "Rory McIlroy"), 20)
+
+class TestTempoRamp:
+    def test_steps_are_exact(self, ramp):
+        assert ramp.bpm(0) == 73 and ramp.bpm(19) == 98
+        assert ramp.bpm(1) == 73 + Fraction(25, 19)
+        assert ramp.ratio(10) == 3
+        assert [tempo.bpm for tempo in ramp][:2] == [73, pytest.approx(74.316, abs=1e-3)]
+
+    def test_endpoints_and_hold(self, ramp):
+        assert ramp.tempo(0) is ramp.start
+        assert ramp.tempo(19) is ramp.end
+        assert ramp.tempo(40) is ramp.end
+        assert ramp.tempo(5).pro_name == "Adam Scott → Rory McIlroy"
+        assert ramp.timeline(19, SAMPLE_RATE) == SwingTimeline.from_tempo(ramp.end, SAMPLE_RATE)
+
+    def test_invalid_ramps(self, ramp):
+        with pytest.raises(ValueError):
+            TempoRamp(ramp.start, ramp.end, 1)
+        with pytest.raises(ValueError):
+            TempoRamp(ramp.start, default_catalog().get("Putting", "Tiger Woods"))
+
+class TestSwitchTimeline:
+    def test_next_cycle_starts_on_boundary(self, ramp):
+        """Test a new timeline's cues follow on from the running schedule, with no re-init"""
+        player = AudioPlayer()
+        try:
+            player.preload_swing_tones(0.75, 0.25)
+            stream, tones = player.backend, player.cached_tones
+            player.set_timeline(ramp.timeline(0, SAMPLE_RATE, lead_in=PROMPT_LEAD_S))
+            boundary = player.play_swing_sequence()
+
+            faster = ramp.timeline(1, SAMPLE_RATE, lead_in=PROMPT_LEAD_S)
+            player.switch_timeline(faster)
+            with patch.object(player, 'schedule') as schedule:
+                next_boundary = player.play_swing_sequence()
+            queued = [(call.args[0], call.args[1]) for call in schedule.call_args_list]
+            assert queued == [(name, boundary + at) for name, at in faster.onsets()]
+            assert next_boundary == boundary + faster.cycle_start(1)
+            assert player.backend is stream and player.cached_tones is tones
+        finally:
+            player.cleanup()
+
+class TestDrill:
+    def test_drill_grades_each_swing_at_its_own_tempo(self, ramp):
+        trainer = TempoTrainer()
+        short = TempoRamp(ramp.start, ramp.end, 3)
+        player = trainer.audio_player
+        targets = []
+
+        def wait_for_sample(sample):
+            player.backend.pump(sample - player.sample_clock)
+
+        def record(backswing, downswing, target_backswing, target_downswing, jitter_s=0.0):
+            targets.append(target_backswing + target_downswing)
+            assert backswing / downswing == pytest.approx(3.0, abs=0.02)
+            assert backswing == pytest.approx(target_backswing, abs=0.006)
+
+        with patch.object(trainer, '_wait_for_sample', side_effect=wait_for_sample), \
+                patch.object(trainer, 'analyze_timing', side_effect=record):
+            trainer.drill(short)
+
+        assert trainer.cycle_count == 3
+        assert targets == pytest.approx([60 / 73, 60 / 85.5, 60 / 98])
@@ -0,0 +1,125 @@
+import time
+from pathlib import Path
+import pytest
+import numpy as np
+from ..config import AUDIO_CONFIG
+from ..history import DAY_S, SWING_DTYPE, SwingHistory, default_history_path
+from ..tempo import SwingTiming
+
+NOW = 1_760_000_000.0
+
+@pytest.fixture
+def history(tmp_path):
+    log = SwingHistory(tmp_path / "swing_history.bin")
+    yield log
+    log.close()
+
+def timing(backswing: float, downswing: float) -> SwingTiming:
+    return SwingTiming(backswing, downswing, backswing + downswing, backswing / downswing)
+
+def synthetic_records(n: int, now: float = NOW) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    records = np.zeros(n, dtype=SWING_DTYPE)
+    records["timestamp"] = now - rng.uniform(0, 60 * DAY_S, n)
+    records["pro"] = rng.choice([b"Adam Scott", b"Rory McIlroy", b"Tiger Woods"], n)
+    records["shot_type"] = b"Long Game"
+    records["backswing"] = 0.75
+    records["downswing"] = 0.25
+    records["ratio"] = rng.normal(3.0, 0.2, n)
+    records["error"] = np.abs(records["ratio"] - 3.0) / 3.0 * 100
+    return records
+
+class TestSwingHistory:
+    def test_append_and_read_back(self, history):
+        history.append(timing(0.75, 0.25), "Adam Scott", "Long Game", 0.0, timestamp=NOW)
+        history.append(timing(0.8, 0.25), "Rory McIlroy", "Long Game", 6.7, timestamp=NOW + 1)
+
+        records = history.records()
+        assert len(history) == 2
+        assert records["pro"].tolist() == [b"Adam Scott", b"Rory McIlroy"]
+        assert records["ratio"][1] == pytest.approx(3.2)
+        assert records["error"][1] == pytest.approx(6.7)
+
+    def test_survives_reopen(self, history):
+        history.append(timing(0.75, 0.25), "Adam Scott", "Long Game", 0.0)
+        history.close()
+
+        reopened = SwingHistory(history.path)
+        reopened.append(timing(0.75, 0.25), "Adam Scott", "Long Game", 0.0)
+        assert len(reopened) == 2
+        reopened.close()
+
+    def test_default_path_is_in_cache_dir(self):
+        """Test the log lives beside the tone bank rather than in the working directory"""
+        assert default_history_path().parent == Path(AUDIO_CONFIG["cache_dir"])
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"TONEBANK" + bytes(100))
+        with pytest.raises(ValueError):
+            SwingHistory(path)
+
+    def test_rejects_truncated_header(self, tmp_path):
+        """Test a file cut short inside the header is rejected, not a struct.error"""
+        path = tmp_path / "truncated.bin"
+        path.write_bytes(b"SWING")
+        with pytest.raises(ValueError, match="swing history"):
+            SwingHistory(path)
+
+    def test_empty_history(self, history):
+        assert len(history.records()) == 0
+        assert history.mean_error_by_pro() == {}
+        assert history.daily_trend(7, now=NOW) == []
+
+    def test_mean_error_by_pro(self, history):
+        history.append(timing(0.75, 0.25), "Adam Scott", "Long Game", 2.0)
+        history.append(timing(0.75, 0.25), "Adam Scott", "Long Game", 4.0)
+        history.append(timing(0.75, 0.25), "Tiger Woods", "Long Game", 10.0)
+        assert history.mean_error_by_pro() == {"Adam Scott": 3.0, "Tiger Woods": 10.0}
+
+    def test_hash_collisions_keep_pros_apart(self, history, monkeypatch):
+        """Test pros whose name hashes collide are still reported separately"""
+        from .. import history as history_module
+        monkeypatch.setattr(history_module, "_name_keys", lambda names: np.zeros(len(names), np.uint64))
+        history.append(timing(0.75, 0.25), "Adam Scott", "Long Game", 2.0)
+        history.append(timing(0.75, 0.25), "Tiger Woods", "Long Game", 10.0)
+        assert history.mean_error_by_pro() == {"Adam Scott": 2.0, "Tiger Woods": 10.0}
+
+    def test_daily_trend(self, history):
+        """Test swings are bucketed per day and older ones left out"""
+        today = (NOW // DAY_S) * DAY_S + 3600
+        for day, error in [(0, 2.0), (0, 4.0), (-1, 8.0), (-40, 50.0)]:
+            history.append(timing(0.75, 0.25), "Adam Scott", "Long Game", error,
+                           timestamp=today + day * DAY_S)
+
+        trend = history.daily_trend(7, now=today + 7200)
+        assert [t.swings for t in trend] == [1, 2]
+        assert [t.mean_error for t in trend] == [8.0, 3.0]
+        assert trend[1].day_start == today - 3600
+
+    def test_append_is_fast(self, history):
+        """Test a single append costs microseconds"""
+        swing = timing(0.75, 0.25)
+        start = time.perf_counter()
+        for _ in range(1000):
+            history.append(swing, "Adam Scott", "Long Game", 1.0)
+        assert (time.perf_counter() - start) / 1000 < 200e-6
+
+    def test_queries_over_a_million_swings(self, history):
+        """
+        Test aggregate queries over 1M swings stay sub-second
+        Time Complexity: O(n) where n is swing count
+        """
+        records = synthetic_records(1_000_000)
+        history.append_records(records)
+
+        start = time.perf_counter()
+        by_pro = history.mean_error_by_pro()
+        trend = history.daily_trend(30, now=NOW)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert set(by_pro) == {"Adam Scott", "Rory McIlroy", "Tiger Woods"}
+        adam = records[records["pro"] == b"Adam Scott"]
+        assert by_pro["Adam Scott"] == pytest.approx(adam["error"].mean(), rel=1e-4)
+        assert sum(t.swings for t in trend) == np.count_nonzero(records["timestamp"] >= NOW - 30 * DAY_S)
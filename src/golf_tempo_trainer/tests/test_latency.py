@@ -0,0 +1,141 @@
+import sys
+import types
+import pytest
+import numpy as np
+from ..backends import MemoryBackend, NullBackend, SoundDeviceBackend
+from ..latency import (
+    LatencyProfile,
+    calibrate,
+    click_train,
+    find_profile,
+    load_profiles,
+    loopback_lag,
+    measure_loopback,
+    save_profile,
+)
+
+SAMPLE_RATE = 44100
+
+@pytest.fixture
+def profiles_path(tmp_path):
+    return tmp_path / "latency_profiles.json"
+
+class TestProfiles:
+    def test_measured_latency_wins(self):
+        profile = LatencyProfile("usb", SAMPLE_RATE, 128, reported=0.01)
+        assert profile.latency == 0.01
+        profile.measured = 0.042
+        assert profile.latency == 0.042
+
+    def test_save_and_load(self, profiles_path):
+        """Test one profile is kept per device"""
+        save_profile(LatencyProfile("usb", SAMPLE_RATE, 128, 0.01), profiles_path)
+        save_profile(LatencyProfile("usb", SAMPLE_RATE, 128, 0.01, measured=0.045), profiles_path)
+        save_profile(LatencyProfile("onboard", SAMPLE_RATE, 256, 0.02), profiles_path)
+
+        profiles = load_profiles(profiles_path)
+        assert set(profiles) == {"usb", "onboard"}
+        assert profiles["usb"].latency == 0.045
+
+    def test_missing_file(self, profiles_path):
+        assert load_profiles(profiles_path) == {}
+
+    def test_profile_must_match_stream(self, profiles_path):
+        """Test a profile from another blocksize is not applied"""
+        save_profile(LatencyProfile("null", SAMPLE_RATE, 256, 0.03), profiles_path)
+        assert find_profile(NullBackend(SAMPLE_RATE, blocksize=128), profiles_path) is None
+        assert find_profile(NullBackend(SAMPLE_RATE, blocksize=256), profiles_path).reported == 0.03
+
+class TestLoopback:
+    @pytest.mark.parametrize("delay", [0, 37, 1800])
+    def test_lag_of_delayed_click_train(self, delay):
+        """
+        Test the loopback delay is recovered from a noisy, attenuated recording
+        Time Complexity: O(n log n) where n is recording length
+        """
+        signal, _ = click_train(SAMPLE_RATE)
+        rng = np.random.default_rng(0)
+        recorded = np.zeros_like(signal)
+        recorded[delay:] = 0.3 * signal[:len(signal) - delay]
+        recorded += rng.normal(0, 0.002, len(recorded)).astype(np.float32)
+
+        assert loopback_lag(signal, recorded) == delay
+
+    def test_silence_is_rejected(self):
+        signal, _ = click_train(SAMPLE_RATE)
+        rng = np.random.default_rng(0)
+        with pytest.raises(ValueError):
+            loopback_lag(signal, rng.normal(0, 0.01, len(signal)))
+
+class TestCalibrate:
+    def test_calibrate_saves_profile(self, profiles_path):
+        backend = MemoryBackend(SAMPLE_RATE)
+        profile = calibrate(backend, path=profiles_path)
+
+        assert backend.closed
+        assert profile.device == "memory"
+        assert profile.measured is None
+        assert load_profiles(profiles_path)["memory"] == profile
+
+    def test_loopback_runs_at_low_latency(self, monkeypatch):
+        """Test the round trip uses the latency setting whose input latency is subtracted"""
+        lag = 2205
+        calls = {}
+
+        def playrec(signal, **kwargs):
+            calls.update(kwargs)
+            recorded = np.zeros((len(signal), 1))
+            recorded[lag:, 0] = signal[:-lag]
+            return recorded
+
+        fake = types.SimpleNamespace(
+            playrec=playrec,
+            query_devices=lambda device, kind: {'default_low_input_latency': 0.01}
+        )
+        monkeypatch.setitem(sys.modules, "sounddevice", fake)
+
+        measured = measure_loopback(SAMPLE_RATE, blocksize=256)
+        assert calls["latency"] == 'low'
+        assert calls["blocksize"] == 256
+        assert measured == pytest.approx(lag / SAMPLE_RATE - 0.01)
+
+    def test_loopback_matches_stream_latency(self, profiles_path, monkeypatch):
+        """Test calibration measures at the latency setting the output stream opens with"""
+        opened, recorded = {}, {}
+
+        class OutputStream:
+            latency = 0.08
+
+            def __init__(self, **kwargs):
+                opened.update(kwargs)
+
+            def start(self):
+                pass
+
+            def stop(self):
+                pass
+
+            def close(self):
+                pass
+
+        def playrec(signal, **kwargs):
+            recorded.update(kwargs)
+            out = np.zeros((len(signal), 1))
+            out[441:, 0] = signal[:-441]
+            return out
+
+        fake = types.SimpleNamespace(
+            OutputStream=OutputStream,
+            playrec=playrec,
+            query_devices=lambda device, kind: {'name': "Interface", 'hostapi': 0,
+                                                'default_high_input_latency': 0.002},
+            query_hostapis=lambda index: {'name': "ALSA"}
+        )
+        monkeypatch.setitem(sys.modules, "sounddevice", fake)
+
+        backend = SoundDeviceBackend(SAMPLE_RATE, blocksize=256, stream_latency='high')
+        backend.start(lambda *args: None)
+        backend.close()
+        profile = calibrate(backend, loopback=True, path=profiles_path)
+        assert opened["latency"] == recorded["latency"] == 'high'
+        assert profile.measured == pytest.approx(0.01 - 0.002)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from ..mixer import Mixer
+
+def render(mixer, frames, block_size=64):
+    out = np.empty((frames, mixer.channels), dtype=np.float32)
+    for start in range(0, frames, block_size):
+        mixer.mix(out[start:start + block_size])
+    return out
+
+class TestMixer:
+    def test_routing_and_gain(self):
+        mixer = Mixer(channels=3)
+        voice = np.ones(10, dtype=np.float32)
+        mixer.add(voice, 5, channel=1)
+        mixer.add(voice, 8, channel=1, gain=0.5)
+        mixer.add(voice, 0, channel=2, gain=0.25)
+        out = render(mixer, 32)
+
+        assert np.all(out[:, 0] == 0)
+        np.testing.assert_allclose(out[5:8, 1], 1.0)
+        np.testing.assert_allclose(out[8:15, 1], 1.5)
+        np.testing.assert_allclose(out[15:18, 1], 0.5)
+        assert np.all(out[18:, 1] == 0)
+        np.testing.assert_allclose(out[:10, 2], 0.25)
+
+    def test_voice_wraps_around_ring(self):
+        mixer = Mixer(horizon=64)
+        render(mixer, 48)
+        voice = np.arange(1, 33, dtype=np.float32)
+        mixer.add(voice, 50)
+        out = render(mixer, 96, block_size=16)
+        np.testing.assert_array_equal(out[2:34, 0], voice)
+        assert np.all(out[34:, 0] == 0)
+
+    def test_long_voice_deferred_past_horizon(self):
+        """Test a voice longer than the ring is written in pieces as the clock moves"""
+        mixer = Mixer(horizon=64)
+        voice = np.arange(1, 201, dtype=np.float32)
+        mixer.add(voice, 10)
+        mixer.add(voice[:5], 500)
+        assert mixer.deferred == 2
+        out = render(mixer, 512, block_size=32)
+        np.testing.assert_array_equal(out[10:210, 0], voice)
+        np.testing.assert_array_equal(out[500:505, 0], voice[:5])
+        assert mixer.deferred == 0
+
+    def test_late_voice_starts_now(self):
+        mixer = Mixer()
+        render(mixer, 128)
+        assert mixer.add(np.ones(4, dtype=np.float32), 100) == 128
+        assert np.all(render(mixer, 4)[:, 0] == 1)
+
+    def test_bad_channel(self):
+        mixer = Mixer(channels=2)
+        with pytest.raises(ValueError):
+            mixer.add(np.ones(4, dtype=np.float32), 0, channel=2)
+        with pytest.raises(ValueError):
+            Mixer(channels=0)
+
+    def test_reset(self):
+        mixer = Mixer()
+        mixer.add(np.ones(4, dtype=np.float32), 0)
+        mixer.reset(1000)
+        assert mixer.clock == 1000
+        assert np.all(render(mixer, 8) == 0)
@@ -0,0 +1,155 @@
+import sys
+import time
+import types
+import pytest
+import numpy as np
+import soundfile as sf
+from .. import onset as onset_module
+from ..onset import OnsetDetector, RingBuffer, SwingListener
+
+SAMPLE_RATE = 44100
+
+# (time, amplitude) of takeaway, transition and impact sounds in each swing
+SWINGS = [
+    [(1.0, 0.1), (1.75, 0.2), (2.0, 0.8)],
+    [(5.0, 0.1), (5.9, 0.15), (6.2, 0.9)],
+]
+
+def burst(signal: np.ndarray, at: float, amplitude: float) -> None:
+    """Add a short decaying 1.5 kHz knock at `at` seconds"""
+    n = int(0.03 * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    start = int(at * SAMPLE_RATE)
+    signal[start:start + n] += amplitude * np.sin(2 * np.pi * 1500 * t) * np.exp(-t * 120)
+
+@pytest.fixture
+def practice_audio():
+    rng = np.random.default_rng(1)
+    signal = rng.normal(0, 0.003, SAMPLE_RATE * 8).astype(np.float32)
+    for swing in SWINGS:
+        for at, amplitude in swing:
+            burst(signal, at, amplitude)
+    return signal
+
+@pytest.fixture
+def practice_file(tmp_path, practice_audio):
+    path = tmp_path / "range_session.wav"
+    sf.write(str(path), practice_audio, SAMPLE_RATE)
+    return path
+
+class TestRingBuffer:
+    def test_wraps_around(self):
+        ring = RingBuffer(8)
+        ring.write(np.arange(6, dtype=np.float32))
+        np.testing.assert_array_equal(ring.read(), np.arange(6))
+        ring.write(np.arange(6, 12, dtype=np.float32))
+        assert ring.available == 6
+        np.testing.assert_array_equal(ring.read(), np.arange(6, 12))
+        assert ring.dropped == 0
+
+    def test_overrun_drops_oldest(self):
+        ring = RingBuffer(4)
+        ring.write(np.arange(3, dtype=np.float32))
+        ring.write(np.arange(3, 6, dtype=np.float32))
+        np.testing.assert_array_equal(ring.read(), [2, 3, 4, 5])
+        assert ring.dropped == 2
+
+class TestOnsetDetector:
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            OnsetDetector(method="phase")
+
+    @pytest.mark.parametrize("method", ["flux", "energy"])
+    def test_finds_every_knock(self, method, practice_audio):
+        """Test each sound is found within one hop of where it starts"""
+        detector = OnsetDetector(SAMPLE_RATE, method)
+        onsets = []
+        for start in range(0, len(practice_audio), 256):
+            onsets += detector.process(practice_audio[start:start + 256])
+
+        expected = [at for swing in SWINGS for at, _ in swing]
+        found = [onset.sample / SAMPLE_RATE for onset in onsets]
+        assert found == pytest.approx(expected, abs=256 / SAMPLE_RATE)
+
+    def test_silence_has_no_onsets(self):
+        detector = OnsetDetector(SAMPLE_RATE)
+        assert detector.process(np.zeros(SAMPLE_RATE, dtype=np.float32)) == []
+
+class TestSwingListener:
+    def test_recorded_swings(self, practice_file):
+        """Test a WAV file yields one SwingTiming per swing"""
+        timings = SwingListener().feed_file(practice_file)
+
+        assert len(timings) == 2
+        for timing, swing in zip(timings, SWINGS):
+            (takeaway, _), (transition, _), (impact, _) = swing
+            assert timing.backswing == pytest.approx(transition - takeaway, abs=0.006)
+            assert timing.downswing == pytest.approx(impact - transition, abs=0.006)
+            assert timing.ratio == pytest.approx(timing.backswing / timing.downswing)
+
+    @pytest.mark.parametrize("block_size", [64, 256, 4096])
+    def test_block_size_does_not_change_results(self, practice_file, block_size):
+        reference = SwingListener().feed_file(practice_file, block_size=256)
+        assert SwingListener().feed_file(practice_file, block_size=block_size) == reference
+
+    def test_waggle_is_not_a_swing(self):
+        """Test two isolated sounds are not reported as a swing"""
+        signal = np.zeros(SAMPLE_RATE * 5, dtype=np.float32)
+        burst(signal, 1.0, 0.5)
+        burst(signal, 1.5, 0.5)
+        listener = SwingListener()
+        assert listener.process(signal) == [] and listener.finish() == []
+
+    def test_keeps_up_with_realtime(self, practice_audio):
+        """
+        Test 256-sample blocks are analysed much faster than they arrive
+        Time Complexity: O(n) where n is input sample count
+        """
+        listener = SwingListener()
+        start = time.perf_counter()
+        for offset in range(0, len(practice_audio), 256):
+            listener.process(practice_audio[offset:offset + 256])
+        elapsed = time.perf_counter() - start
+        assert elapsed < len(practice_audio) / SAMPLE_RATE / 4
+
+    def test_callback_sees_each_swing(self, practice_file):
+        seen = []
+        SwingListener(on_swing=seen.append).feed_file(practice_file)
+        assert len(seen) == 2
+
+    def test_sound_at_end_of_input(self):
+        """Test an impact right before the input stops is still reported"""
+        signal = np.zeros(SAMPLE_RATE * 2, dtype=np.float32)
+        for at, amplitude in [(0.5, 0.2), (1.4, 0.3), (1.95, 0.9)]:
+            burst(signal, at, amplitude)
+        listener = SwingListener()
+        timings = listener.process(signal) + listener.finish()
+        assert len(timings) == 1
+        assert timings[0].downswing == pytest.approx(0.55, abs=0.006)
+
+    def test_live_swings_are_bounded(self, practice_audio, monkeypatch):
+        """Test a live listener only remembers its most recent swings"""
+        class InputStream:
+            def __init__(self, **kwargs):
+                pass
+
+            def start(self):
+                pass
+
+            def stop(self):
+                pass
+
+            def close(self):
+                pass
+
+        monkeypatch.setitem(sys.modules, "sounddevice", types.SimpleNamespace(InputStream=InputStream))
+        monkeypatch.setattr(onset_module, "LIVE_SWINGS_KEPT", 3)
+        listener = SwingListener()
+        listener.start()
+        try:
+            for _ in range(3):
+                listener.process(practice_audio)
+        finally:
+            listener.stop()
+        assert len(listener.timings) == len(listener.swing_starts) == 3
+        assert listener.swing_starts[-1] > 2 * len(practice_audio) / SAMPLE_RATE
@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+from ..trainer import SwingTempo
+from ..render import (
+    iter_timeline_blocks,
+    render_session,
+    swing_cycle_onsets,
+)
+from ..timeline import COUNT_IN_BEATS
+
+SAMPLE_RATE = 44100
+
+@pytest.fixture
+def swing_tempo():
+    return SwingTempo(
+        shot_type="Long Game",
+        pro_name="Rory McIlroy",
+        bpm=98,
+        ratio=3.0,
+        frames="18/6",
+        description="Power tempo for maximum distance",
+        learning_notes="Practice notes"
+    )
+
+@pytest.fixture
+def tones():
+    return {
+        name: np.full(100, 0.25, dtype=np.float32)
+        for name in ('metronome', 'backswing_start', 'downswing_start', 'impact')
+    }
+
+class TestSwingCycleOnsets:
+    def test_onsets_are_integer_samples(self, swing_tempo):
+        """Test every cue is placed on an integer sample index"""
+        onsets = swing_cycle_onsets(swing_tempo, SAMPLE_RATE)
+        names = [name for name, _ in onsets]
+        assert names == ['metronome'] * COUNT_IN_BEATS + [
+            'backswing_start', 'downswing_start', 'impact'
+        ]
+        assert all(isinstance(at, int) for _, at in onsets)
+
+    def test_phase_spacing(self, swing_tempo):
+        """Test backswing and downswing spacing match the tempo"""
+        onsets = dict(swing_cycle_onsets(swing_tempo, SAMPLE_RATE)[COUNT_IN_BEATS:])
+        backswing = onsets['downswing_start'] - onsets['backswing_start']
+        downswing = onsets['impact'] - onsets['downswing_start']
+        assert abs(backswing - swing_tempo.backswing_time * SAMPLE_RATE) <= 1
+        assert abs(downswing - swing_tempo.downswing_time * SAMPLE_RATE) <= 1
+
+class TestRenderSession:
+    def test_render_session_to_wav(self, swing_tempo, tmp_path):
+        """
+        Test a rendered session file holds every swing cycle
+        Time Complexity: O(n) where n is session length in samples
+        """
+        import soundfile as sf
+
+        path = tmp_path / "session.wav"
+        frames = render_session(swing_tempo, swings=3, path=path, block_size=4096)
+
+        data, sample_rate = sf.read(str(path), dtype='float32')
+        assert sample_rate == SAMPLE_RATE
+        assert len(data) == frames
+
+        cycle_length = frames // 3
+        np.testing.assert_allclose(data[:cycle_length], data[cycle_length:2 * cycle_length],
+                                   atol=1e-4)
+
+    def test_invalid_swing_count(self, swing_tempo, tmp_path):
+        """Test error handling for an empty session"""
+        with pytest.raises(ValueError):
+            render_session(swing_tempo, swings=0, path=tmp_path / "empty.wav")
+
+    def test_session_follows_exact_timeline(self, tones):
+        """Test every cue of a long session lands on its exact rational onset"""
+        from ..timeline import SwingTimeline
+
+        # 73 BPM cycles are not a whole number of samples, so looping one buffer would drift
+        timeline = SwingTimeline.from_tempo(
+            SwingTempo("Long Game", "Test Pro", 73, 3.0, "24/8", "", ""), SAMPLE_RATE)
+        clicks = {name: np.ones(1, dtype=np.float32) for name in tones}
+        swings = 200
+        session = np.concatenate([block.copy() for block in
+                                  iter_timeline_blocks(timeline, clicks, swings, block_size=4096)])
+
+        assert len(session) == timeline.cycle_start(swings)
+        expected = sorted(at for cycle in range(swings) for _, at in timeline.onsets(cycle))
+        np.testing.assert_array_equal(np.flatnonzero(session), expected)
+
+    def test_blocks_larger_than_mix_horizon(self, tones):
+        """Test a block bigger than the default mixer horizon keeps every cue"""
+        from ..mixer import MIX_HORIZON
+        from ..timeline import SwingTimeline
+
+        timeline = SwingTimeline.from_tempo(
+            SwingTempo("Long Game", "Test Pro", 73, 3.0, "24/8", "", ""), SAMPLE_RATE)
+        clicks = {name: np.ones(1, dtype=np.float32) for name in tones}
+        swings = 20
+        blocks = [block.copy() for block in
+                  iter_timeline_blocks(timeline, clicks, swings, block_size=MIX_HORIZON + 38000)]
+
+        assert len(blocks[0]) == MIX_HORIZON + 38000
+        session = np.concatenate(blocks)
+        expected = sorted(at for cycle in range(swings) for _, at in timeline.onsets(cycle))
+        np.testing.assert_array_equal(np.flatnonzero(session), expected)
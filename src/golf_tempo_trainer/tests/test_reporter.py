@@ -0,0 +1,93 @@
+import io
+import threading
+import time
+from ..reporter import CLEAR_SCREEN, Reporter
+
+class SlowStream(io.StringIO):
+    """A terminal that takes `delay` seconds per write"""
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text):
+        time.sleep(self.delay)
+        self.writes += 1
+        return super().write(text)
+
+class TestReporter:
+    def test_reports_in_order(self):
+        stream = io.StringIO()
+        reporter = Reporter(stream, interval_s=0)
+        for i in range(5):
+            reporter.report(f"line {i}")
+        reporter.stop()
+        assert stream.getvalue() == "".join(f"line {i}\n" for i in range(5))
+
+    def test_slow_terminal_never_blocks_caller(self):
+        """
+        Test report() returns immediately even when every write takes 100ms
+        Time Complexity: O(n) for n reports
+        """
+        stream = SlowStream(0.1)
+        reporter = Reporter(stream, interval_s=0)
+        start = time.perf_counter()
+        for i in range(50):
+            reporter.report(f"swing {i}")
+        assert time.perf_counter() - start < 0.05
+        reporter.stop()
+        assert stream.getvalue().count("swing") == 50
+        assert stream.writes < 50  # Batched
+
+    def test_keyed_reports_coalesce(self):
+        """Test only the newest pending report per key is written"""
+        stream = SlowStream(0.05)
+        reporter = Reporter(stream, interval_s=0)
+        reporter.report("first")
+        time.sleep(0.01)  # The reporter is now busy writing "first"
+        for i in range(10):
+            reporter.report(f"live {i}", key="session")
+        reporter.stop()
+        assert "live 0" not in stream.getvalue()
+        assert stream.getvalue().endswith("live 9\n")
+
+    def test_full_queue_drops_and_notes_it(self):
+        gate = threading.Event()
+
+        class BlockedStream(io.StringIO):
+            def write(self, text):
+                gate.wait()
+                return super().write(text)
+
+        stream = BlockedStream()
+        reporter = Reporter(stream, interval_s=0, max_pending=2)
+        reporter.report("a")
+        time.sleep(0.02)  # "a" is taken; the writer blocks on the terminal
+        accepted = [reporter.report(str(i)) for i in range(5)]
+        assert accepted == [True, True, False, False, False]
+        gate.set()
+        reporter.report("after")
+        reporter.stop()
+        assert "reports dropped" in stream.getvalue()
+
+    def test_flush_waits_for_output(self):
+        stream = SlowStream(0.02)
+        reporter = Reporter(stream, interval_s=0)
+        reporter.report("done")
+        reporter.flush()
+        assert stream.getvalue() == "done\n"
+        reporter.stop()
+
+    def test_dashboard_redraws_panels(self):
+        stream = io.StringIO()
+        reporter = Reporter(stream, dashboard=True, interval_s=0)
+        reporter.report("Session: 1 swings", key="session")
+        reporter.flush()
+        reporter.report("Session: 2 swings", key="session")
+        reporter.report("swing log line")
+        reporter.stop()
+
+        last_frame = stream.getvalue().split(CLEAR_SCREEN)[-1]
+        assert "Session: 2 swings" in last_frame
+        assert "Session: 1 swings" not in last_frame
+        assert "swing log line" in last_frame
@@ -0,0 +1,83 @@
+import math
+import pytest
+import numpy as np
+from ..stats import P2Quantile, RunningStats, SessionStats
+from ..tempo import SwingTiming
+
+def timing(backswing: float, downswing: float) -> SwingTiming:
+    return SwingTiming(backswing, downswing, backswing + downswing, backswing / downswing)
+
+class TestRunningStats:
+    def test_matches_numpy(self):
+        values = np.random.default_rng(4).normal(20, 5, 1000)
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+        assert stats.count == 1000
+        assert stats.mean == pytest.approx(values.mean())
+        assert stats.variance == pytest.approx(values.var(ddof=1))
+        assert (stats.min, stats.max) == (values.min(), values.max())
+
+    def test_single_value(self):
+        stats = RunningStats()
+        stats.add(3.0)
+        assert stats.variance == 0.0
+
+class TestP2Quantile:
+    def test_invalid_quantile(self):
+        with pytest.raises(ValueError):
+            P2Quantile(1.5)
+
+    def test_empty(self):
+        assert math.isnan(P2Quantile(0.5).value)
+
+    def test_few_values_are_exact(self):
+        sketch = P2Quantile(0.5)
+        for value in (3.0, 1.0, 2.0):
+            sketch.add(value)
+        assert sketch.value == 2.0
+
+    @pytest.mark.parametrize("q", [0.5, 0.95, 0.99])
+    def test_tracks_percentile(self, q):
+        """
+        Test the five-marker sketch lands near the exact percentile
+        Time Complexity: O(n) for n values, O(1) memory
+        """
+        values = np.random.default_rng(5).normal(0, 10, 20000)
+        sketch = P2Quantile(q)
+        for value in values:
+            sketch.add(value)
+        assert sketch.value == pytest.approx(np.percentile(values, q * 100), abs=0.5)
+
+class TestSessionStats:
+    def test_deltas_and_grades(self):
+        stats = SessionStats()
+        stats.add(timing(0.75, 0.25), 0.75, 0.25)   # Exact: excellent
+        stats.add(timing(0.80, 0.25), 0.75, 0.25)   # Ratio 3.2: good
+        stats.add(timing(0.90, 0.25), 0.75, 0.25)   # Ratio 3.6: focus
+
+        assert stats.swings == 3
+        assert stats.backswing.moments.mean == pytest.approx(200 / 3)
+        assert stats.backswing.moments.max == pytest.approx(150.0)
+        assert stats.downswing.moments.std == pytest.approx(0.0)
+        assert stats.grades == {"excellent": 1, "good": 1, "focus": 1}
+        assert stats.grade_share("excellent") == pytest.approx(1 / 3)
+
+    def test_constant_memory(self):
+        """Test state does not grow with the number of swings"""
+        stats = SessionStats()
+        stats.add(timing(0.75, 0.25), 0.75, 0.25)
+        sizes = [len(stats.backswing.quantiles[0.95]._heights)]
+        for _ in range(5000):
+            stats.add(timing(0.76, 0.25), 0.75, 0.25)
+        sizes.append(len(stats.backswing.quantiles[0.95]._heights))
+        assert sizes == [1, 5]
+
+    def test_summary(self):
+        stats = SessionStats()
+        assert stats.format_summary() == "No swings analyzed"
+        stats.add(timing(0.75, 0.25), 0.75, 0.25)
+        summary = stats.format_summary()
+        assert "Backswing" in summary and "p99" in summary
+        assert "✅ 100%" in summary
+        assert "1 swings" in stats.live_line()
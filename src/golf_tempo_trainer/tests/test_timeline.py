@@ -0,0 +1,67 @@
+import pytest
+from fractions import Fraction
+from ..tempo import SwingTempo
+from ..timeline import COUNT_IN_BEATS, SwingTimeline, exact
+
+SAMPLE_RATE = 44100
+
+def make_tempo(bpm=73, ratio=3.0, frames="24/8"):
+    return SwingTempo("Long Game", "Test Pro", bpm, ratio, frames, "", "")
+
+class TestExact:
+    def test_decimal_floats_are_exact(self):
+        assert exact(0.1) == Fraction(1, 10)
+        assert exact(7.5) == Fraction(15, 2)
+        assert exact(Fraction(1, 3)) == Fraction(1, 3)
+
+class TestSwingTimeline:
+    def test_phases_from_bpm_and_ratio(self):
+        timeline = SwingTimeline.from_tempo(make_tempo(bpm=73, ratio=3.0), SAMPLE_RATE)
+        assert timeline.backswing == Fraction(45, 73)
+        assert timeline.downswing == Fraction(15, 73)
+
+    def test_phases_from_frames(self):
+        """Test '24/8' at 30 fps is a 0.8s backswing and a 4/15s downswing"""
+        timeline = SwingTimeline.from_tempo(make_tempo(), SAMPLE_RATE, fps=30)
+        assert timeline.backswing == Fraction(4, 5)
+        assert timeline.downswing == Fraction(4, 15)
+        half = SwingTimeline.from_tempo(make_tempo(ratio=2.0, frames="15/7.5"), SAMPLE_RATE, fps=30)
+        assert half.downswing == Fraction(1, 4)
+
+    def test_cycle_layout(self):
+        timeline = SwingTimeline(Fraction(3, 4), Fraction(1, 4), SAMPLE_RATE, lead_in=Fraction(1, 2))
+        onsets = timeline.onsets()
+        assert [name for name, _ in onsets] == ['metronome'] * COUNT_IN_BEATS + [
+            'backswing_start', 'downswing_start', 'impact'
+        ]
+        assert onsets[0][1] == 22050
+        assert onsets[COUNT_IN_BEATS][1] == 22050 + 44100
+        assert timeline.cycle_length == Fraction(1, 2) + 1 + 1 + Fraction(3, 2)
+
+    def test_long_session_does_not_drift(self):
+        """
+        Test a 3-hour session ends exactly where the math says
+        Adding per-cycle whole-sample lengths would be off by hundreds of samples
+        """
+        timeline = SwingTimeline.from_tempo(make_tempo(bpm=73), SAMPLE_RATE)
+        cycles = int(3 * 3600 / timeline.cycle_length)
+        exact_end = cycles * timeline.cycle_length * SAMPLE_RATE
+        assert abs(timeline.cycle_start(cycles) - exact_end) <= Fraction(1, 2)
+        assert abs(cycles * timeline.cycle_start(1) - exact_end) > 100
+
+        impact = timeline.onsets(cycles - 1)[-1][1]
+        assert impact == round((cycles - 1) * timeline.cycle_length * SAMPLE_RATE
+                               + timeline.cue_offsets[-1][1] * SAMPLE_RATE)
+
+    def test_iter_onsets_continues_across_cycles(self):
+        timeline = SwingTimeline(Fraction(3, 10), Fraction(1, 10), SAMPLE_RATE)
+        onsets = timeline.iter_onsets(origin=1000)
+        first = [next(onsets) for _ in range(14)]
+        assert first[:7] == [(name, 1000 + at) for name, at in timeline.onsets(0)]
+        assert first[7:] == [(name, 1000 + at) for name, at in timeline.onsets(1)]
+
+    def test_invalid_phases(self):
+        with pytest.raises(ValueError):
+            SwingTimeline(Fraction(0), Fraction(1, 4))
+        with pytest.raises(ValueError):
+            SwingTimeline(Fraction(3, 4), Fraction(1, 4), rest=Fraction(-1))
@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from ..timer import (
+    MAX_SPIN_S,
+    MIN_SPIN_S,
+    OvershootEstimator,
+    TimerService,
+    jitter_stats,
+)
+
+@pytest.fixture(params=["low_jitter", "low_cpu"])
+def timer(request):
+    service = TimerService(request.param)
+    yield service
+    service.stop()
+
+class TestOvershootEstimator:
+    def test_learns_constant_overshoot(self):
+        estimator = OvershootEstimator()
+        for _ in range(500):
+            estimator.update(0.0025)
+        assert estimator.mean == pytest.approx(0.0025, rel=1e-3)
+        assert estimator.spin_threshold() == pytest.approx(0.0025, rel=1e-2)
+
+    def test_threshold_is_clamped(self):
+        estimator = OvershootEstimator(initial=0.0)
+        assert estimator.spin_threshold() == MIN_SPIN_S
+        for _ in range(100):
+            estimator.update(0.05)
+        assert estimator.spin_threshold() == MAX_SPIN_S
+
+class TestJitterStats:
+    def test_percentiles(self):
+        stats = jitter_stats([i / 1000 for i in range(100)])
+        assert stats.count == 100
+        assert stats.p50 == 0.050
+        assert stats.p95 == 0.095
+        assert stats.max == 0.099
+
+    def test_empty(self):
+        assert jitter_stats([]).count == 0
+
+class TestTimerService:
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            TimerService("realtime")
+
+    def test_callbacks_fire_in_deadline_order(self, timer):
+        """Test deadlines scheduled out of order fire in time order"""
+        fired = []
+        done = threading.Event()
+        start = time.perf_counter()
+        timer.call_at(start + 0.03, fired.append, "late")
+        timer.call_at(start + 0.01, fired.append, "early")
+        timer.call_at(start + 0.04, done.set)
+
+        assert done.wait(1.0)
+        assert fired == ["early", "late"]
+        assert timer.jitter().count == 3
+
+    def test_cancelled_callback_does_not_fire(self, timer):
+        fired = []
+        handle = timer.call_at(time.perf_counter() + 0.01, fired.append, "cancelled")
+        handle.cancel()
+        timer.sleep_until(time.perf_counter() + 0.02)
+        assert fired == []
+
+    def test_sleep_until(self, timer):
+        """
+        Test the caller wakes at, and not before, its deadline
+        Time Complexity: O(k) for k deadlines
+        """
+        for _ in range(5):
+            deadline = time.perf_counter() + 0.005
+            timer.sleep_until(deadline)
+            if timer.mode == "low_jitter":
+                assert time.perf_counter() >= deadline
+            assert time.perf_counter() - deadline < 0.05
+
+    def test_stop_drops_pending(self, timer):
+        fired = []
+        timer.call_at(time.perf_counter() + 10, fired.append, "never")
+        timer.stop()
+        assert fired == []
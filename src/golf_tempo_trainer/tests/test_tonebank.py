@@ -0,0 +1,118 @@
+import pytest
+import numpy as np
+from ..tonebank import ToneBank
+
+@pytest.fixture
+def tones():
+    t = np.linspace(0, 0.1, 4410)
+    return {
+        "backswing_440_0.1_1.0": np.sin(2 * np.pi * 440 * t).astype(np.float32),
+        "impact_659.25_0.1_1.0": np.sin(2 * np.pi * 659.25 * t).astype(np.float32),
+    }
+
+class TestToneBank:
+    def test_round_trip(self, tmp_path, tones):
+        """Test tones written to a bank read back unchanged"""
+        ToneBank.write(tmp_path / "tones.bank", tones)
+        bank = ToneBank(tmp_path / "tones.bank")
+
+        assert len(bank) == 2
+        for key, samples in tones.items():
+            np.testing.assert_array_equal(bank.get(key), samples)
+        assert bank.get("missing") is None
+
+    def test_float32_views_are_zero_copy(self, tmp_path, tones):
+        """Test float32 tones are served straight from the mapping"""
+        ToneBank.write(tmp_path / "tones.bank", tones)
+        bank = ToneBank(tmp_path / "tones.bank")
+
+        view = bank.get("impact_659.25_0.1_1.0")
+        assert view.dtype == np.float32
+        assert not view.flags.owndata
+        assert not view.flags.writeable
+
+    def test_int16_storage(self, tmp_path, tones):
+        """Test int16 banks are half the size and stay within quantization error"""
+        ToneBank.write(tmp_path / "f32.bank", tones, storage="float32")
+        ToneBank.write(tmp_path / "i16.bank", tones, storage="int16")
+        f32_size = (tmp_path / "f32.bank").stat().st_size
+        i16_size = (tmp_path / "i16.bank").stat().st_size
+        assert i16_size < f32_size * 0.55
+
+        bank = ToneBank(tmp_path / "i16.bank")
+        assert bank.storage == "int16"
+        samples = bank.get("backswing_440_0.1_1.0")
+        assert samples.dtype == np.float32
+        np.testing.assert_allclose(samples, tones["backswing_440_0.1_1.0"], atol=1 / 32767)
+
+    def test_add_keeps_existing_tones(self, tmp_path, tones):
+        """
+        Test adding a tone keeps earlier tones and views of them
+        Time Complexity: O(n) where n is total stored samples
+        """
+        bank = ToneBank(tmp_path / "tones.bank")
+        bank.add("backswing_440_0.1_1.0", tones["backswing_440_0.1_1.0"])
+        held = bank.get("backswing_440_0.1_1.0")
+        bank.add("impact_659.25_0.1_1.0", tones["impact_659.25_0.1_1.0"])
+
+        reopened = ToneBank(tmp_path / "tones.bank")
+        assert set(reopened) == set(tones)
+        np.testing.assert_array_equal(held, tones["backswing_440_0.1_1.0"])
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["tones.bank", "tones.bank.lock"]
+
+    def test_add_appends_without_moving_tones(self, tmp_path, tones):
+        """Test an add leaves stored samples in place and writes only the new ones"""
+        path = tmp_path / "tones.bank"
+        first = {"backswing_440_0.1_1.0": tones["backswing_440_0.1_1.0"]}
+        ToneBank.write(path, first)
+        before = path.read_bytes()
+        data_len = 4 * 4410
+
+        ToneBank(path).add("impact_659.25_0.1_1.0", tones["impact_659.25_0.1_1.0"])
+        after = path.read_bytes()
+        assert after[64:64 + data_len] == before[64:64 + data_len]
+        assert len(after) < len(before) + 2 * data_len
+
+    def test_torn_append_keeps_previous_index(self, tmp_path, tones):
+        """Test samples appended without their header update are ignored, then overwritten"""
+        path = tmp_path / "tones.bank"
+        ToneBank.write(path, {"backswing_440_0.1_1.0": tones["backswing_440_0.1_1.0"]})
+        with open(path, "ab") as bank_file:
+            bank_file.write(b"\x7f" * 1000)
+
+        bank = ToneBank(path)
+        assert list(bank) == ["backswing_440_0.1_1.0"]
+        bank.add("impact_659.25_0.1_1.0", tones["impact_659.25_0.1_1.0"])
+        reopened = ToneBank(path)
+        for key, samples in tones.items():
+            np.testing.assert_array_equal(reopened.get(key), samples)
+
+    def test_writers_keep_each_others_tones(self, tmp_path, tones):
+        """Test two banks open on one file, e.g. in two processes, merge their additions"""
+        first = ToneBank(tmp_path / "tones.bank")
+        second = ToneBank(tmp_path / "tones.bank")
+        first.add("backswing_440_0.1_1.0", tones["backswing_440_0.1_1.0"])
+        second.add("impact_659.25_0.1_1.0", tones["impact_659.25_0.1_1.0"])
+        assert set(ToneBank(tmp_path / "tones.bank")) == {"backswing_440_0.1_1.0", "impact_659.25_0.1_1.0"}
+
+    def test_empty_or_short_file_is_empty_bank(self, tmp_path, tones):
+        path = tmp_path / "tones.bank"
+        ToneBank.write(path, tones)
+        data = path.read_bytes()
+        for content in (b"", data[:10], data[:20]):
+            path.write_bytes(content)
+            bank = ToneBank(path)
+            assert len(bank) == 0
+        bank.add("impact_659.25_0.1_1.0", tones["impact_659.25_0.1_1.0"])
+        assert list(ToneBank(path)) == ["impact_659.25_0.1_1.0"]
+
+    def test_invalid_file(self, tmp_path):
+        """Test error handling for files that are not tone banks"""
+        path = tmp_path / "tones.bank"
+        path.write_bytes(b"not a tone bank at all")
+        with pytest.raises(ValueError):
+            ToneBank(path)
+
+    def test_invalid_storage(self, tmp_path):
+        with pytest.raises(ValueError):
+            ToneBank(tmp_path / "tones.bank", storage="int8")
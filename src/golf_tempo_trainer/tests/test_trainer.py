@@ -1,6 +1,12 @@
+import time
 import pytest
+import numpy as np
+from fractions import Fraction
 from unittest.mock import Mock, patch
-from ..trainer import TempoTrainer, SwingTempo, SwingTiming
+from ..audio import CueTiming
+from ..history import SwingHistory
+from ..render import swing_cycle_onsets
+from ..trainer import TempoTrainer, SwingTempo, SwingTiming, measure_swing
 
 @pytest.fixture
 def trainer():
@@ -48,6 +54,46 @@ class TestSwingTempo:
                 learning_notes="Test notes"
             )
 
+class TestMeasureSwing:
+    SAMPLE_RATE = 44100
+
+    def played_cycle(self, tempo, start=10.0, delays=None):
+        """Cue timestamps of a cycle played from `start`, with optional per-cue delays"""
+        delays = delays or {}
+        return [
+            CueTiming(name, at, start + at / self.SAMPLE_RATE + delays.get(name, 0.0))
+            for name, at in swing_cycle_onsets(tempo, self.SAMPLE_RATE)
+        ]
+
+    def test_exact_cycle(self, swing_tempo):
+        """Test a perfectly played cycle measures its target timings"""
+        timing = measure_swing(self.played_cycle(swing_tempo), swing_tempo, self.SAMPLE_RATE)
+
+        assert timing.backswing == pytest.approx(swing_tempo.backswing_time, abs=1e-4)
+        assert timing.downswing == pytest.approx(swing_tempo.downswing_time, abs=1e-4)
+        assert timing.ratio == pytest.approx(swing_tempo.ratio, rel=1e-3)
+        assert timing.jitter == pytest.approx(0.0, abs=1e-9)
+
+    def test_constant_latency_is_not_jitter(self, swing_tempo):
+        """Test a fixed output delay shifts every cue without adding jitter"""
+        cues = self.played_cycle(swing_tempo, start=10.25)
+        timing = measure_swing(cues, swing_tempo, self.SAMPLE_RATE)
+        assert timing.jitter == pytest.approx(0.0, abs=1e-9)
+
+    def test_late_cue(self, swing_tempo):
+        """Test a late downswing cue shows up in the phases and jitter"""
+        cues = self.played_cycle(swing_tempo, delays={'downswing_start': 0.02})
+        timing = measure_swing(cues, swing_tempo, self.SAMPLE_RATE)
+
+        assert timing.backswing == pytest.approx(swing_tempo.backswing_time + 0.02, abs=1e-4)
+        assert timing.downswing == pytest.approx(swing_tempo.downswing_time - 0.02, abs=1e-4)
+        assert timing.jitter > 0.005
+
+    def test_missing_cues(self, swing_tempo):
+        """Test a cycle whose swing cues never played is not measured"""
+        cues = [cue for cue in self.played_cycle(swing_tempo) if cue.name != 'impact']
+        assert measure_swing(cues, swing_tempo, self.SAMPLE_RATE) is None
+
 class TestTempoTrainer:
     def test_initialization(self, trainer):
         """Test trainer initialization"""
@@ -68,49 +114,80 @@ class TestTempoTrainer:
         assert trainer.last_timing.ratio == 3.0
         assert trainer.last_timing.total == 1.0
 
-    @patch('time.perf_counter_ns')
-    def test_precise_sleep(self, mock_time, trainer):
-        """Test precise sleep implementation"""
-        mock_time.return_value = 0
-        
-        with patch('time.sleep') as mock_sleep:
-            trainer._precise_sleep_until(0.1)
-            assert mock_sleep.called
-
-    @patch('time.perf_counter_ns')
-    def test_swing_cycle(self, mock_time, trainer, swing_tempo):
-        """Test complete swing cycle execution"""
-        mock_time.return_value = 0
-        
-        with patch.object(trainer.audio_player, 'play') as mock_play:
-            trainer._play_swing_cycle(swing_tempo)
-            
-            # Verify correct sequence of tone playback
-            expected_calls = ['backswing', 'downswing', 'impact']
-            actual_calls = [call[0][0] for call in mock_play.call_args_list]
-            assert actual_calls == expected_calls
+    def test_precise_sleep(self, trainer):
+        """Test waits go through the timer service and wake near their deadline"""
+        deadline = time.perf_counter() + 0.005
+        with patch.object(trainer.timer, 'sleep_until', wraps=trainer.timer.sleep_until) as sleep_until:
+            trainer._precise_sleep_until(deadline)
+        sleep_until.assert_called_once_with(deadline)
+        assert time.perf_counter() - deadline < 0.05
+
+    def test_session_statistics(self, trainer):
+        """Test every analyzed swing feeds the running session statistics"""
+        trainer.analyze_timing(0.75, 0.25, 0.75, 0.25)
+        trainer.analyze_timing(0.77, 0.25, 0.75, 0.25)
+        assert trainer.session_stats.swings == 2
+        assert trainer.session_stats.backswing.moments.mean == pytest.approx(10.0)
+
+    def test_swings_recorded_in_history(self, swing_tempo, tmp_path):
+        """Test every analyzed swing is appended to the history log"""
+        history = SwingHistory(tmp_path / "history.bin")
+        trainer = TempoTrainer(history=history)
+        trainer.current_pro = swing_tempo.pro_name
+        trainer.current_shot_type = swing_tempo.shot_type
+        trainer.analyze_timing(0.75, 0.25, 0.75, 0.25)
+        trainer.analyze_timing(0.8, 0.2, 0.75, 0.25)
+
+        records = history.records()
+        assert records["pro"].tolist() == [swing_tempo.pro_name.encode()] * 2
+        assert records["error"].tolist() == pytest.approx([0.0, 100 / 3])
+        history.close()
+
+    def test_analyze_recording(self, trainer, swing_tempo, tmp_path):
+        """Test swings in a recording are graded against the pro's tempo"""
+        import soundfile as sf
+
+        sample_rate = 44100
+        signal = np.zeros(sample_rate * 4, dtype=np.float32)
+        n = int(0.02 * sample_rate)
+        knock = np.sin(2 * np.pi * 1500 * np.arange(n) / sample_rate) * np.exp(-np.arange(n) / 400)
+        for at, amplitude in [(0.5, 0.2), (1.4, 0.3), (1.7, 0.9)]:
+            start = int(at * sample_rate)
+            signal[start:start + n] += amplitude * knock
+        path = tmp_path / "swing.wav"
+        sf.write(str(path), signal, sample_rate)
+
+        timings = trainer.analyze_recording(str(path), swing_tempo)
+        assert len(timings) == 1
+        assert trainer.last_timing.backswing == pytest.approx(0.9, abs=0.006)
+        assert trainer.last_timing.downswing == pytest.approx(0.3, abs=0.006)
+        assert trainer.cycle_count == 1
 
     def test_practice_mode(self, trainer, swing_tempo):
-        """Test practice mode execution"""
-        with patch.object(trainer.audio_player, 'play_swing_sequence') as mock_play:
-            with patch('time.sleep'):
-                # Simulate KeyboardInterrupt after first cycle
-                with pytest.raises(KeyboardInterrupt):
+        """Test practice mode plays the tempo's exact timeline"""
+        with patch.object(trainer.audio_player, 'start_timeline') as mock_start:
+            with patch.object(trainer.audio_player, 'stop_timeline') as mock_stop:
+                # Simulate Ctrl+C while the cycles are playing
+                with patch('time.sleep', side_effect=KeyboardInterrupt):
                     trainer.practice_mode(swing_tempo)
-                
-                assert mock_play.called
+
+                timeline = mock_start.call_args[0][0]
+                assert timeline.backswing + timeline.downswing == Fraction(60, 84)
+                mock_stop.assert_called_once()
 
     def test_train_method(self, trainer, swing_tempo):
-        """Test training session execution"""
-        with patch.object(trainer.audio_player, 'set_shot_type') as mock_set_type:
-            with patch.object(trainer.audio_player, 'set_timing') as mock_set_timing:
-                with patch.object(trainer.audio_player, 'preload_swing_tones'):
-                    # Simulate KeyboardInterrupt after setup
-                    with pytest.raises(KeyboardInterrupt):
-                        trainer.train(swing_tempo)
-                    
-                    mock_set_type.assert_called_once_with(swing_tempo.shot_type)
-                    mock_set_timing.assert_called_once_with(
-                        swing_tempo.backswing_time,
-                        swing_tempo.downswing_time
-                    ) 
\ No newline at end of file
+        """Test a session sets up the player and ends cleanly on Ctrl+C"""
+        with patch.object(trainer.audio_player, 'set_shot_type') as mock_set_type, \
+                patch.object(trainer.audio_player, 'set_timing') as mock_set_timing, \
+                patch.object(trainer, '_wait_for_sample', side_effect=KeyboardInterrupt), \
+                patch.object(trainer, '_end_session', wraps=trainer._end_session) as mock_end:
+            trainer.train(swing_tempo)
+
+        mock_set_type.assert_called_once_with(swing_tempo.shot_type)
+        mock_set_timing.assert_called_once_with(
+            swing_tempo.backswing_time,
+            swing_tempo.downswing_time
+        )
+        mock_end.assert_called_once_with(None)
+        assert trainer.cycle_count == 1
+        assert trainer.session_stats.swings == 0
\ No newline at end of file
@@ -0,0 +1,79 @@
+import pytest
+import warnings
+import numpy as np
+import soundfile as sf
+from unittest.mock import MagicMock, patch
+from ..audio import AudioCache
+from ..voice import VoicePrompts, announcement, default_prompts, voice_key
+
+@pytest.fixture
+def audio_cache(tmp_path):
+    cache = AudioCache()
+    cache.cache_dir = tmp_path / "audio_cache"
+    cache.cache_dir.mkdir(exist_ok=True)
+    return cache
+
+@pytest.fixture
+def mock_tts_engine():
+    """pyttsx3 engine that writes a 22.05 kHz stereo WAV per prompt"""
+    engine = MagicMock()
+    queued = []
+    engine.save_to_file.side_effect = lambda text, path: queued.append(path)
+
+    def run_and_wait():
+        for path in queued:
+            sf.write(path, np.full((2205, 2), 0.25, dtype=np.float32), 22050)
+        queued.clear()
+
+    engine.runAndWait.side_effect = run_and_wait
+    with patch('pyttsx3.init', return_value=engine):
+        yield engine
+
+class TestVoicePrompts:
+    def test_default_prompts(self):
+        """Test voice prompts and pro announcements are all pre-rendered"""
+        texts = default_prompts()
+        assert "Address the ball" in texts
+        assert announcement("Adam Scott") in texts
+        assert len(texts) == len(set(texts))
+
+    def test_prerender_stores_clips(self, audio_cache, mock_tts_engine):
+        """
+        Test prompts are rendered once, resampled and cached as float32
+        Time Complexity: O(n) where n is rendered sample count
+        """
+        voice = VoicePrompts(audio_cache, sample_rate=44100)
+        assert voice.prerender(["Address the ball", "Stay relaxed"]).result() == 2
+
+        clip = voice.get("Address the ball")
+        assert clip.dtype == np.float32
+        assert len(clip) == 4410
+        assert clip[0] == pytest.approx(0.25)
+        assert voice_key("Stay relaxed") in audio_cache.bank
+
+        mock_tts_engine.setProperty.assert_any_call('rate', 150)
+        mock_tts_engine.runAndWait.assert_called_once()
+        voice.shutdown()
+
+    def test_cached_prompts_are_not_rerendered(self, audio_cache, mock_tts_engine):
+        voice = VoicePrompts(audio_cache)
+        voice.prerender(["Address the ball"]).result()
+        assert voice.prerender(["Address the ball"]).result() == 0
+        assert mock_tts_engine.save_to_file.call_count == 1
+        voice.shutdown()
+
+    def test_error_handling_tts(self, audio_cache, mock_tts_engine):
+        """Test TTS failures warn instead of raising"""
+        mock_tts_engine.save_to_file.side_effect = Exception("TTS Error")
+        voice = VoicePrompts(audio_cache)
+
+        with pytest.warns(UserWarning):
+            assert voice.prerender(["Address the ball"]).result() == 0
+        assert voice.get("Address the ball") is None
+
+        # A failed prompt is not resubmitted on every speak()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert voice.prerender(["Address the ball"]).result() == 0
+        assert mock_tts_engine.save_to_file.call_count == 1
+        voice.shutdown()
@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+from ..wavetable import Oscillator, Wavetable
+
+SAMPLE_RATE = 44100
+
+@pytest.fixture
+def sine():
+    return Wavetable(sample_rate=SAMPLE_RATE)
+
+class TestWavetable:
+    def test_band_limiting(self):
+        """Test harmonics above Nyquist are dropped from the table"""
+        table = Wavetable(harmonics=(1.0, 0.5, 0.25), sample_rate=SAMPLE_RATE)
+        assert table.harmonics_below_nyquist(1000) == 3
+        assert table.harmonics_below_nyquist(8000) == 2
+        assert table.harmonics_below_nyquist(15000) == 1
+
+    def test_interpolation_is_more_accurate(self, sine):
+        """Test linear interpolation tightens the lookup error"""
+        osc = Oscillator(sine, freq=441.3)
+        nearest = osc.render(4096)
+        osc = Oscillator(sine, freq=441.3, interpolate=True)
+        linear = osc.render(4096)
+
+        expected = np.sin(2 * np.pi * 441.3 * np.arange(4096) / SAMPLE_RATE)
+        assert np.abs(nearest - expected).max() < 2e-4
+        assert np.abs(linear - expected).max() < 1e-5
+
+class TestOscillator:
+    def test_blocks_are_continuous(self, sine):
+        """
+        Test block-by-block rendering equals one long render
+        Time Complexity: O(n) where n is sample count
+        """
+        whole = Oscillator(sine, freq=440).render(1280)
+        osc = Oscillator(sine, freq=440)
+        blocks = np.concatenate([osc.render(128) for _ in range(10)])
+        np.testing.assert_array_equal(blocks, whole)
+
+    def test_sweep_blocks_are_continuous(self, sine):
+        """Test a sweep rendered in blocks tracks the exponential ramp"""
+        osc = Oscillator(sine, freq=660, end_freq=220, duration_s=0.1)
+        blocks = np.concatenate([osc.render(147) for _ in range(30)])
+
+        freq = np.exp(np.linspace(np.log(660), np.log(220), 4410))
+        expected = np.sin(2 * np.pi * freq.cumsum() / SAMPLE_RATE)
+        np.testing.assert_allclose(blocks, expected, atol=1e-3)
+
+    def test_render_into_buffer(self, sine):
+        """Test rendering into a preallocated callback buffer"""
+        out = np.empty(128, dtype=np.float32)
+        result = Oscillator(sine, freq=440).render(128, out=out)
+        assert result is out
+
+    def test_invalid_parameters(self, sine):
+        with pytest.raises(ValueError):
+            Oscillator(sine, freq=-440)
+        with pytest.raises(ValueError):
+            Oscillator(sine, freq=440, end_freq=220)
@@ -0,0 +1,104 @@
+from dataclasses import dataclass, field
+from fractions import Fraction
+from itertools import count
+from numbers import Rational
+from typing import Iterator, List, Optional, Tuple, Union
+from .config import AUDIO_CONFIG
+from .tempo import SwingTempo
+
+COUNT_IN_BEATS = 4     # Metronome beats before the takeaway
+BACKSWING_BEATS = 3    # The count-in beat divides the backswing into three
+REST_S = Fraction(3, 2)  # Silence after impact before the next cycle
+
+Number = Union[int, float, str, Fraction]
+
+
+def exact(value: Number) -> Fraction:
+    """
+    A config number as the exact value it was written as
+    Floats go through their shortest repr, so 0.1 becomes 1/10 rather than
+    the nearest binary fraction
+    """
+    if isinstance(value, Rational):
+        return Fraction(value)
+    return Fraction(str(value))
+
+
+@dataclass(frozen=True)
+class SwingTimeline:
+    """
+    Cue offsets of a swing cycle in exact rational seconds
+    Every onset is rounded to a sample only once, from its exact absolute time,
+    so cycle N of a session starts where N * cycle_length says it does however
+    long the session runs
+    """
+    backswing: Fraction
+    downswing: Fraction
+    sample_rate: int = AUDIO_CONFIG["sample_rate"]
+    lead_in: Fraction = Fraction(0)  # Silence before the count-in, e.g. for voice prompts
+    rest: Fraction = REST_S
+    count_in_beats: int = COUNT_IN_BEATS
+    cue_offsets: Tuple[Tuple[str, Fraction], ...] = field(init=False, repr=False, compare=False)
+    cycle_length: Fraction = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for name in ("backswing", "downswing", "lead_in", "rest"):
+            value = exact(getattr(self, name))
+            if value < 0 or (value == 0 and name in ("backswing", "downswing")):
+                raise ValueError(f"{name} must be positive, got {value}")
+            object.__setattr__(self, name, value)
+
+        beat = self.backswing / BACKSWING_BEATS
+        takeaway = self.lead_in + self.count_in_beats * beat
+        offsets = [('metronome', self.lead_in + i * beat) for i in range(self.count_in_beats)]
+        offsets += [
+            ('backswing_start', takeaway),
+            ('downswing_start', takeaway + self.backswing),
+            ('impact', takeaway + self.backswing + self.downswing),
+        ]
+        object.__setattr__(self, "cue_offsets", tuple(offsets))
+        object.__setattr__(self, "cycle_length", offsets[-1][1] + self.rest)
+
+    @classmethod
+    def from_tempo(cls,
+                   tempo: SwingTempo,
+                   sample_rate: int = AUDIO_CONFIG["sample_rate"],
+                   fps: Optional[Number] = None,
+                   **options) -> "SwingTimeline":
+        """
+        Timeline of a pro's tempo, from BPM and ratio or, given `fps`, from the
+        frame counts ("24/8" at 30 fps is a 0.8s backswing and 0.267s downswing)
+        """
+        if fps is not None:
+            back, down = (exact(part.strip()) for part in tempo.frames.split("/"))
+            return cls(back / exact(fps), down / exact(fps), sample_rate, **options)
+        return cls.from_bpm(tempo.bpm, tempo.ratio, sample_rate, **options)
+
+    @classmethod
+    def from_bpm(cls,
+                 bpm: Number,
+                 ratio: Number,
+                 sample_rate: int = AUDIO_CONFIG["sample_rate"],
+                 **options) -> "SwingTimeline":
+        """Timeline of a swing lasting one beat at `bpm`, split backswing:downswing by `ratio`"""
+        total = 60 / exact(bpm)
+        ratio = exact(ratio)
+        return cls(total * ratio / (ratio + 1), total / (ratio + 1), sample_rate, **options)
+
+    def to_sample(self, seconds: Fraction) -> int:
+        return round(seconds * self.sample_rate)
+
+    def cycle_start(self, cycle: int) -> int:
+        """Sample index cycle `cycle` starts on, counting from the first at 0"""
+        return self.to_sample(cycle * self.cycle_length)
+
+    def onsets(self, cycle: int = 0) -> List[Tuple[str, int]]:
+        """Sample index of every cue in one cycle"""
+        start = cycle * self.cycle_length
+        return [(name, self.to_sample(start + offset)) for name, offset in self.cue_offsets]
+
+    def iter_onsets(self, origin: int = 0, first_cycle: int = 0) -> Iterator[Tuple[str, int]]:
+        """Every cue of every cycle from `first_cycle` on, as absolute samples after `origin`"""
+        for cycle in count(first_cycle):
+            for name, at in self.onsets(cycle):
+                yield name, origin + at
@@ -0,0 +1,180 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Tuple
+from .config import AUDIO_CONFIG
+
+TIMER_MODES = ("low_jitter", "low_cpu")
+OVERSHOOT_ALPHA = 0.05       # EWMA weight of each new sleep overshoot sample
+INITIAL_OVERSHOOT = 0.001    # Prior until the OS has been measured: the old 1ms spin window
+SPIN_MARGIN_SIGMAS = 4.0
+MIN_SPIN_S = 0.0002
+MAX_SPIN_S = 0.005
+JITTER_HISTORY = 1024        # Recent deadlines kept for the jitter distribution
+
+
+@dataclass(frozen=True)
+class JitterStats:
+    """Lateness of fired deadlines in seconds (negative means early)"""
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+def jitter_stats(samples: List[float]) -> JitterStats:
+    if not samples:
+        return JitterStats(0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    ordered = sorted(samples)
+
+    def percentile(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return JitterStats(
+        count=len(ordered),
+        mean=sum(ordered) / len(ordered),
+        p50=percentile(0.50),
+        p95=percentile(0.95),
+        p99=percentile(0.99),
+        max=ordered[-1]
+    )
+
+
+class OvershootEstimator:
+    """Running mean and deviation of how late the OS wakes a sleeping thread"""
+
+    def __init__(self, alpha: float = OVERSHOOT_ALPHA, initial: float = INITIAL_OVERSHOOT):
+        self.alpha = alpha
+        self.mean = initial
+        self.variance = 0.0
+        self.samples = 0
+
+    def update(self, overshoot: float) -> None:
+        delta = overshoot - self.mean
+        self.mean += self.alpha * delta
+        self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+        self.samples += 1
+
+    def spin_threshold(self) -> float:
+        """How early to stop sleeping so a wake-up is almost never late"""
+        threshold = self.mean + SPIN_MARGIN_SIGMAS * self.variance ** 0.5
+        return min(MAX_SPIN_S, max(MIN_SPIN_S, threshold))
+
+
+class TimerHandle:
+    __slots__ = ("deadline", "callback", "args", "cancelled")
+
+    def __init__(self, deadline: float, callback: Callable, args: Tuple):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class TimerService:
+    """
+    One thread that fires callbacks at absolute perf_counter deadlines
+    It sleeps until just before each deadline, learning the OS sleep overshoot
+    as it goes.  "low_jitter" spins out the learned threshold for sub-ms
+    accuracy; "low_cpu" never spins and instead wakes early by the mean
+    overshoot, trading some jitter for an idle core.
+    Time Complexity: O(log n) per scheduled deadline
+    """
+
+    def __init__(self, mode: Optional[str] = None, history: int = JITTER_HISTORY):
+        mode = mode or AUDIO_CONFIG["timer_mode"]
+        if mode not in TIMER_MODES:
+            raise ValueError(f"Unknown timer mode: {mode} (choose from {', '.join(TIMER_MODES)})")
+        self.mode = mode
+        self.overshoot = OvershootEstimator()
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._lateness: Deque[float] = deque(maxlen=history)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @property
+    def wake_early(self) -> float:
+        """Seconds before a deadline the thread stops sleeping"""
+        if self.mode == "low_cpu":
+            return self.overshoot.mean
+        return self.overshoot.spin_threshold()
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="timer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread; pending deadlines are dropped"""
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def call_at(self, deadline: float, callback: Callable, *args) -> TimerHandle:
+        """Run callback(*args) on the timer thread at a perf_counter deadline"""
+        self.start()
+        handle = TimerHandle(deadline, callback, args)
+        with self._cond:
+            heapq.heappush(self._heap, (deadline, next(self._seq), handle))
+            self._cond.notify()
+        return handle
+
+    def sleep_until(self, deadline: float) -> None:
+        """Block the calling thread until a perf_counter deadline"""
+        if deadline <= time.perf_counter():
+            return
+        fired = threading.Event()
+        self.call_at(deadline, fired.set)
+        fired.wait()
+
+    def jitter(self) -> JitterStats:
+        """Distribution of how late recent deadlines fired"""
+        return jitter_stats(list(self._lateness))
+
+    def _next_due(self) -> Optional[TimerHandle]:
+        """Sleep until the earliest deadline is within the wake-early window and pop it"""
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline = self._heap[0][0]
+                sleep_for = deadline - time.perf_counter() - self.wake_early
+                if sleep_for <= 0:
+                    return heapq.heappop(self._heap)[2]
+
+                wake_at = time.perf_counter() + sleep_for
+                if not self._cond.wait(sleep_for):
+                    # Timed out rather than notified, so this measures the OS
+                    self.overshoot.update(max(0.0, time.perf_counter() - wake_at))
+            return None
+
+    def _run(self) -> None:
+        while True:
+            handle = self._next_due()
+            if handle is None:
+                return
+            if handle.cancelled:
+                continue
+            if self.mode == "low_jitter":
+                while time.perf_counter() < handle.deadline:
+                    pass
+            self._lateness.append(time.perf_counter() - handle.deadline)
+            handle.callback(*handle.args)
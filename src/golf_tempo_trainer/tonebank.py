@@ -0,0 +1,223 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MAGIC = b"TONEBANK"
+VERSION = 2
+HEADER = struct.Struct("<8sHHQI")  # magic, version, storage code, index offset, index length
+DATA_ALIGNMENT = 64
+
+STORAGE_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "int16": np.dtype("<i2"),
+}
+_STORAGE_CODES = {"float32": 0, "int16": 1}
+_STORAGE_NAMES = {code: name for name, code in _STORAGE_CODES.items()}
+
+
+class ToneBank:
+    """
+    Single-file tone store: a header, contiguous sample data, then an index
+    The file is opened with mmap, so float32 tones are served as zero-copy views
+    and every process reading the bank shares the same pages.  int16 storage
+    halves the file size at the cost of a conversion when a tone is read.
+    New tones are appended with a fresh index after them, and only then does
+    the header switch to that index, so stored samples never move and a torn
+    append leaves the previous index in force.  Writers hold a lock file, so
+    processes adding tones at once never drop each other's tones.
+    Time Complexity: O(1) for reads, O(k + i) to add k samples to an i-entry index
+    Space Complexity: O(n) on disk, only touched pages in memory
+    """
+
+    def __init__(self, path: Union[str, Path], storage: str = "float32"):
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"Unsupported tone bank storage: {storage}")
+        self.path = Path(path)
+        self.storage = storage
+        self._mmap: Optional[mmap.mmap] = None
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._data_start = 0
+        self._end = 0
+        if self.path.exists():
+            self._open()
+
+    def _open(self) -> None:
+        """Map the bank file and parse its header index"""
+        self._index = {}
+        self._data_start = 0
+        self._end = 0
+        with open(self.path, "rb") as bank_file:
+            size = os.fstat(bank_file.fileno()).st_size
+            if size < HEADER.size:
+                if not MAGIC.startswith(bank_file.read(len(MAGIC))):
+                    raise ValueError(f"{self.path} is not a version {VERSION} tone bank")
+                # Empty or cut short before its header: nothing to read, rewritten on the next add
+                return
+            self._mmap = mmap.mmap(bank_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, code, index_offset, index_len = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._close()
+            raise ValueError(f"{self.path} is not a version {VERSION} tone bank")
+
+        if size < index_offset + index_len:
+            self._close()
+            return
+
+        # The file's own storage format wins over the requested one
+        self.storage = _STORAGE_NAMES[code]
+        index = json.loads(self._mmap[index_offset:index_offset + index_len].decode("utf-8"))
+        self._index = {key: (offset, length) for key, (offset, length) in index.items()}
+        self._data_start = _align(HEADER.size)
+        self._end = index_offset + index_len
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def _view(self, key: str) -> np.ndarray:
+        """Raw stored samples for a tone, as a read-only view of the mapping"""
+        offset, length = self._index[key]
+        dtype = STORAGE_DTYPES[self.storage]
+        return np.frombuffer(self._mmap, dtype=dtype, count=length,
+                             offset=self._data_start + offset * dtype.itemsize)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Float32 samples for a tone, or None if the bank does not hold it"""
+        if key not in self._index:
+            return None
+        samples = self._view(key)
+        if self.storage == "int16":
+            return samples.astype(np.float32) / 32767
+        return samples
+
+    def add(self, key: str, samples: np.ndarray) -> None:
+        """Add or replace one tone"""
+        self.add_many({key: samples})
+
+    def add_many(self, tones: Dict[str, np.ndarray]) -> None:
+        """
+        Add or replace tones by appending them and a new index to the bank file
+        A replaced tone's old samples stay in the file until it is rewritten
+        """
+        with _locked(self.path):
+            # Another process may have added tones since this bank was opened
+            self._close()
+            if self.path.exists():
+                self._open()
+            if self._mmap is None:
+                self.write(self.path, tones, self.storage)
+            else:
+                self._append(tones)
+            self._close()
+            self._open()
+
+    def _append(self, tones: Dict[str, np.ndarray]) -> None:
+        """Write tones and an index past the current index, then point the header at it"""
+        dtype = STORAGE_DTYPES[self.storage]
+        index = dict(self._index)
+        with open(self.path, "r+b") as bank_file:
+            bank_file.seek(_align(self._end))
+            for key, samples in tones.items():
+                index[key] = ((bank_file.tell() - self._data_start) // dtype.itemsize, len(samples))
+                bank_file.write(_encode(samples, dtype).tobytes())
+            index_offset = bank_file.tell()
+            index_bytes = json.dumps(index).encode("utf-8")
+            bank_file.write(index_bytes)
+            bank_file.flush()
+            os.fsync(bank_file.fileno())
+
+            bank_file.seek(0)
+            bank_file.write(HEADER.pack(MAGIC, VERSION, _STORAGE_CODES[self.storage],
+                                        index_offset, len(index_bytes)))
+
+    def _close(self) -> None:
+        """Unmap the file; views handed out earlier keep the old mapping alive on their own"""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+
+    @staticmethod
+    def write(path: Union[str, Path], tones: Dict[str, np.ndarray], storage: str = "float32") -> None:
+        """Write a complete bank, replacing any existing file atomically"""
+        dtype = STORAGE_DTYPES[storage]
+        path = Path(path)
+
+        index = {}
+        offset = 0
+        for key, samples in tones.items():
+            index[key] = (offset, len(samples))
+            offset += len(samples)
+        index_bytes = json.dumps(index).encode("utf-8")
+        data_start = _align(HEADER.size)
+        index_offset = data_start + offset * dtype.itemsize
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as bank_file:
+                bank_file.write(HEADER.pack(MAGIC, VERSION, _STORAGE_CODES[storage],
+                                            index_offset, len(index_bytes)))
+                bank_file.write(b"\0" * (data_start - HEADER.size))
+                for samples in tones.values():
+                    bank_file.write(_encode(samples, dtype).tobytes())
+                bank_file.write(index_bytes)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on `path`.lock, blocking until other writers are done"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _align(size: int) -> int:
+    return -(-size // DATA_ALIGNMENT) * DATA_ALIGNMENT
+
+
+def _encode(samples: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Convert samples to the bank's storage dtype"""
+    if samples.dtype == dtype:
+        return samples
+    if dtype.kind == "i":
+        return np.round(np.clip(samples, -1.0, 1.0) * 32767).astype(dtype)
+    if samples.dtype.kind == "i":
+        return (samples.astype(np.float32) / 32767).astype(dtype)
+    return samples.astype(dtype)
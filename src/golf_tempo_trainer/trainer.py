@@ -1,49 +1,83 @@
+import queue
+import statistics
 import time
-from typing import Dict, Optional
-from dataclasses import dataclass
-from .audio import AudioPlayer
-
-@dataclass
-class SwingTempo:
-    shot_type: str
-    pro_name: str
-    bpm: float
-    ratio: float
-    frames: str
-    description: str
-    learning_notes: str
-    
-    @property
-    def total_time(self) -> float:
-        return 60.0 / self.bpm
-    
-    @property
-    def backswing_time(self) -> float:
-        return self.total_time * (self.ratio / (self.ratio + 1))
-    
-    @property
-    def downswing_time(self) -> float:
-        return self.total_time * (1 / (self.ratio + 1))
-
-@dataclass
-class SwingTiming:
-    backswing: float
-    downswing: float
-    total: float
-    ratio: float
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Union
+from .audio import PROMPT_LEAD_S, AudioPlayer, CueTiming
+from .backends import AudioBackend
+from .config import AUDIO_CONFIG
+from .drills import TempoRamp
+from .history import SwingHistory
+from .onset import SwingListener
+from .reporter import Reporter
+from .render import swing_cycle_onsets
+from .stats import SessionStats
+from .tempo import SwingTempo, SwingTiming, grade_ratio, ratio_error
+from .timeline import SwingTimeline
+from .timer import TimerService
+
+NEXT_CYCLE_LEAD_S = 0.25  # Wake this long before the next cycle to analyze the swing and queue it
+
+
+def measure_swing(cues: Sequence[CueTiming],
+                  tempo: SwingTempo,
+                  sample_rate: int = AUDIO_CONFIG["sample_rate"]) -> Optional[SwingTiming]:
+    """
+    Real phase timings of one played cycle from its cue timestamps
+    Jitter is the RMS spread of every cue's onset error against the ideal
+    schedule, so a constant output delay does not count as jitter
+    Returns None if the swing cues never reached the output
+    """
+    played: Dict[str, List[float]] = defaultdict(list)
+    for cue in cues:
+        played[cue.name].append(cue.time)
+    if not all(played[name] for name in ('backswing_start', 'downswing_start', 'impact')):
+        return None
+
+    ideal: Dict[str, List[float]] = defaultdict(list)
+    for name, at in swing_cycle_onsets(tempo, sample_rate):
+        ideal[name].append(at / sample_rate)
+    errors = [
+        actual - target
+        for name, targets in ideal.items()
+        for actual, target in zip(played[name], targets)
+    ]
+
+    backswing = played['downswing_start'][0] - played['backswing_start'][0]
+    downswing = played['impact'][0] - played['downswing_start'][0]
+    return SwingTiming(
+        backswing=backswing,
+        downswing=downswing,
+        total=backswing + downswing,
+        ratio=backswing / downswing if downswing > 0 else 0,
+        jitter=statistics.pstdev(errors) if len(errors) > 1 else 0.0
+    )
+
 
 class TempoTrainer:
-    def __init__(self):
-        self.audio_player = AudioPlayer()
+    def __init__(self,
+                 backend: Optional[Union[str, AudioBackend]] = None,
+                 backend_options: Optional[Dict] = None,
+                 timer_mode: Optional[str] = None,
+                 history: Optional[SwingHistory] = None,
+                 dashboard: bool = False):
+        self.audio_player = AudioPlayer(backend=backend, backend_options=backend_options)
+        self.timer = TimerService(timer_mode)
+        self.history = history  # Every analyzed swing is appended when set
+        # Terminal output is written by a reporter thread so it never delays a cue
+        self.reporter = Reporter(dashboard=dashboard)
         self.cycle_count = 0
         self.last_timing: Optional[SwingTiming] = None
+        self.session_stats = SessionStats()
         self.current_pro = ""
+        self.current_shot_type = ""
         self.current_frames = ""
         self.current_bpm = 0.0
         self.current_description = ""
 
-    def analyze_timing(self, backswing_s: float, downswing_s: float, target_backswing: float, target_downswing: float) -> None:
-        """Analyze and display detailed timing information"""
+    def analyze_timing(self, backswing_s: float, downswing_s: float, target_backswing: float, target_downswing: float,
+                       jitter_s: float = 0.0) -> None:
+        """Analyze timing and queue the report for the terminal"""
         total_s = backswing_s + downswing_s
         ratio = backswing_s / downswing_s if downswing_s > 0 else 0
         target_total = target_backswing + target_downswing
@@ -53,34 +87,50 @@ class TempoTrainer:
             backswing=backswing_s,
             downswing=downswing_s,
             total=total_s,
-            ratio=ratio
+            ratio=ratio,
+            jitter=jitter_s
         )
 
-        print(f"\n=== Swing #{self.cycle_count} - {self.current_pro} ({self.current_frames}) ===")
-        print(f"Pro Style: {self.current_description}")
-        
+        lines = [
+            f"\n=== Swing #{self.cycle_count} - {self.current_pro} ({self.current_frames}) ===",
+            f"Pro Style: {self.current_description}",
+        ]
+
         # Timing Analysis
-        print("\nTiming:")
-        print(f"Backswing  {backswing_s:.3f}s vs {target_backswing:.3f}s (Δ {(backswing_s - target_backswing)*1000:.1f}ms)")
-        print(f"Downswing  {downswing_s:.3f}s vs {target_downswing:.3f}s (Δ {(downswing_s - target_downswing)*1000:.1f}ms)")
-        print(f"Total      {total_s:.3f}s vs {target_total:.3f}s (Δ {(total_s - target_total)*1000:.1f}ms)")
-        print(f"Ratio      {ratio:.2f}:1 vs {target_ratio:.1f}:1")
+        lines.append("\nTiming:")
+        lines.append(f"Backswing  {backswing_s:.3f}s vs {target_backswing:.3f}s (Δ {(backswing_s - target_backswing)*1000:.1f}ms)")
+        lines.append(f"Downswing  {downswing_s:.3f}s vs {target_downswing:.3f}s (Δ {(downswing_s - target_downswing)*1000:.1f}ms)")
+        lines.append(f"Total      {total_s:.3f}s vs {target_total:.3f}s (Δ {(total_s - target_total)*1000:.1f}ms)")
+        lines.append(f"Ratio      {ratio:.2f}:1 vs {target_ratio:.1f}:1")
+        lines.append(f"Jitter     {jitter_s*1000:.1f}ms RMS")
         
+        self.session_stats.add(self.last_timing, target_backswing, target_downswing)
+        error = ratio_error(ratio, target_ratio)
+        if self.history is not None:
+            self.history.append(self.last_timing, self.current_pro, self.current_shot_type, error)
+
         # Quick Performance Indicator
-        ratio_error = abs(ratio - target_ratio)/target_ratio * 100
-        if ratio_error <= 5:
-            print("\n✅ Excellent tempo")
-        elif ratio_error <= 10:
-            print("\n⚠️  Good - minor adjustments needed")
+        grade = grade_ratio(error)
+        if grade == "excellent":
+            lines.append("\n✅ Excellent tempo")
+        elif grade == "good":
+            lines.append("\n⚠️  Good - minor adjustments needed")
         else:
-            print("\n❌ Focus on matching rhythm")
+            lines.append("\n❌ Focus on matching rhythm")
 
-        print("-" * 50)
+        # The live line coalesces: a backed-up terminal only shows the newest one
+        self.reporter.report("\n".join(lines))
+        self.reporter.report(self.session_stats.live_line() + "\n" + "-" * 50, key="session")
 
-    def train(self, settings: SwingTempo) -> None:
-        """Run the training session with timing analysis"""
+    def train(self, settings: SwingTempo, listen: bool = False) -> None:
+        """
+        Run the training session with timing analysis
+        With listen=True the microphone times the golfer's own swing; use
+        headphones so the cues themselves are not picked up
+        """
         # Store current pro details for analysis
         self.current_pro = settings.pro_name
+        self.current_shot_type = settings.shot_type
         self.current_frames = settings.frames
         self.current_bpm = settings.bpm
         self.current_description = settings.description
@@ -88,6 +138,8 @@ class TempoTrainer:
         # Set the appropriate shot type and timing
         self.audio_player.set_shot_type(settings.shot_type)
         self.audio_player.set_timing(settings.backswing_time, settings.downswing_time)
+        self.audio_player.set_timeline(SwingTimeline.from_tempo(
+            settings, self.audio_player.sample_rate, lead_in=PROMPT_LEAD_S))
         
         print("\n=== Training Session Details ===")
         print(f"Shot Type: {settings.shot_type}")
@@ -114,120 +166,182 @@ class TempoTrainer:
             settings.downswing_time
         )
 
+        listener = None
+        detected: "queue.Queue[SwingTiming]" = queue.Queue()
+        if listen:
+            listener = SwingListener(settings, self.audio_player.sample_rate, on_swing=detected.put)
+            listener.start()
+
         try:
             while True:
                 self.cycle_count += 1
-                print(f"=== Swing #{self.cycle_count} ===")
+                self.reporter.report(f"=== Swing #{self.cycle_count} ===")
                 
-                # Play the sequence and measure timing
-                start_time = time.perf_counter()
-                self.audio_player.play_swing_sequence()
-                end_time = time.perf_counter()
+                # Queue the cycle, then time it from when each cue actually played
+                self.audio_player.drain_cues()
+                next_cycle = self.audio_player.play_swing_sequence()
+                self._wait_for_sample(next_cycle - round(NEXT_CYCLE_LEAD_S * self.audio_player.sample_rate))
+                if listener is not None:
+                    self._analyze_detected(detected, settings)
+                    continue
 
-                # Calculate actual timing
-                total_time = end_time - start_time
-                backswing_time = settings.backswing_time
-                downswing_time = settings.downswing_time
+                timing = measure_swing(
+                    self.audio_player.drain_cues(),
+                    settings,
+                    self.audio_player.sample_rate
+                )
+                if timing is None:
+                    self.reporter.report("Cue timing unavailable - the audio output did not play this swing")
+                    continue
 
                 # Analyze timing
                 self.analyze_timing(
-                    backswing_time,
-                    downswing_time,
+                    timing.backswing,
+                    timing.downswing,
                     settings.backswing_time,
-                    settings.downswing_time
+                    settings.downswing_time,
+                    jitter_s=timing.jitter
                 )
 
         except KeyboardInterrupt:
-            print(f"\n=== Session Summary ===")
-            print(f"Total swings: {self.cycle_count}")
-            self.audio_player.cleanup()
+            self._end_session(listener)
 
-    def _precise_sleep_until(self, target_time: float) -> None:
-        """Ultra-precise sleep implementation with busy-wait"""
+    def drill(self, ramp: TempoRamp, listen: bool = False) -> None:
+        """
+        Run a tempo ramp drill, one swing cycle per step of the ramp
+        Tones and the stream are set up once; each cycle's timeline is handed
+        to the running stream before its boundary, so every tempo change lands
+        exactly where the previous cycle ends
+        """
+        first = ramp.tempo(0)
+        self.current_pro = ramp.name
+        self.current_shot_type = first.shot_type
+        self.current_frames = f"{ramp.start.frames} → {ramp.end.frames}"
+        self.current_description = f"Tempo drill over {len(ramp)} swings"
+
+        sample_rate = self.audio_player.sample_rate
+        self.audio_player.set_shot_type(first.shot_type)
+        self.audio_player.set_timeline(ramp.timeline(0, sample_rate, lead_in=PROMPT_LEAD_S))
+        self.audio_player.preload_swing_tones(first.backswing_time, first.downswing_time)
+
+        print("\n=== Tempo Drill ===")
+        print(f"Shot Type: {first.shot_type}")
+        print(f"From: {ramp.start.pro_name} - {ramp.start.bpm:.0f} BPM, {ramp.start.ratio:.1f}:1")
+        print(f"To:   {ramp.end.pro_name} - {ramp.end.bpm:.0f} BPM, {ramp.end.ratio:.1f}:1")
+        print(f"Over {len(ramp)} swings - press Ctrl+C to end early")
+        print("\n" + "="*50 + "\n")
+
+        listener = None
+        detected: "queue.Queue[SwingTiming]" = queue.Queue()
+        if listen:
+            # Detection is graded against each swing's own target below
+            listener = SwingListener(first, sample_rate, on_swing=detected.put)
+            listener.start()
+
+        try:
+            for swing in range(len(ramp)):
+                tempo = ramp.tempo(swing)
+                if swing:
+                    self.audio_player.switch_timeline(ramp.timeline(swing, sample_rate, lead_in=PROMPT_LEAD_S))
+                self.cycle_count += 1
+                self.current_bpm = tempo.bpm
+                self.reporter.report(f"=== Drill swing {swing + 1}/{len(ramp)}: "
+                                     f"{tempo.bpm:.1f} BPM, {tempo.ratio:.2f}:1 ===")
+
+                self.audio_player.drain_cues()
+                next_cycle = self.audio_player.play_swing_sequence()
+                self._wait_for_sample(next_cycle - round(NEXT_CYCLE_LEAD_S * sample_rate))
+                if listener is not None:
+                    self._analyze_detected(detected, tempo)
+                    continue
+
+                timing = measure_swing(self.audio_player.drain_cues(), tempo, sample_rate)
+                if timing is None:
+                    self.reporter.report("Cue timing unavailable - the audio output did not play this swing")
+                    continue
+                self.analyze_timing(timing.backswing, timing.downswing,
+                                    tempo.backswing_time, tempo.downswing_time, jitter_s=timing.jitter)
+        except KeyboardInterrupt:
+            pass
+        self._end_session(listener)
+
+    def _end_session(self, listener: Optional[SwingListener] = None) -> None:
+        # Timing has stopped, so the summary can go straight to the terminal
+        self.reporter.stop()
+        print(f"\n=== Session Summary ===")
+        print(f"Total swings: {self.cycle_count}")
+        print(self.session_stats.format_summary())
+        self._print_timer_jitter()
+        self.timer.stop()
+        if listener is not None:
+            listener.stop()
+        self.audio_player.cleanup()
+
+    def _analyze_detected(self, detected: "queue.Queue[SwingTiming]", settings: SwingTempo) -> None:
+        """Compare every swing the microphone picked up since the last cycle to the pro"""
+        found = False
         while True:
-            now = time.perf_counter_ns() / 1e9
-            if now >= target_time:
+            try:
+                timing = detected.get_nowait()
+            except queue.Empty:
                 break
-            remaining = target_time - now
-            if remaining > 0.001:  # If more than 1ms remaining
-                time.sleep(remaining * 0.8)  # Sleep for 80% of remaining time
+            found = True
+            self.analyze_timing(timing.backswing, timing.downswing,
+                                settings.backswing_time, settings.downswing_time)
+        if not found:
+            self.reporter.report("No swing detected - check the microphone")
 
-    def _play_swing_cycle(self, tempo: SwingTempo) -> None:
-        # Adjusted latency compensation
-        latency_compensation = 0.015  # 15ms compensation
-        
-        # Pre-calculate all target times
-        cycle_start = time.perf_counter_ns() / 1e9
-        backswing_end = cycle_start + tempo.backswing_duration - latency_compensation
-        downswing_end = backswing_end + tempo.downswing_duration - latency_compensation
-        
-        # Start backswing
-        print(f"\nBackswing  [{tempo.backswing_duration:.3f}s] "
-              f"({60/tempo.backswing_duration:.1f} BPM)")
-        self.audio_player.play('backswing')
-        
-        # Wait for backswing end
-        self._precise_sleep_until(backswing_end)
-        
-        # Start downswing
-        downswing_start = time.perf_counter_ns() / 1e9
-        print(f"Downswing  [{tempo.downswing_duration:.3f}s] "
-              f"({60/tempo.downswing_duration:.1f} BPM)")
-        self.audio_player.play('downswing')
-        
-        # Wait for downswing end
-        self._precise_sleep_until(downswing_end)
-        
-        # Impact
-        impact_start = time.perf_counter_ns() / 1e9
-        print(f"Impact     [0.030s]")
-        self.audio_player.play('impact')
-        
-        # Calculate actual timings
-        actual_backswing = downswing_start - cycle_start
-        actual_downswing = impact_start - downswing_start
-        actual_cycle = impact_start - cycle_start
-        actual_ratio = actual_backswing / actual_downswing if actual_downswing > 0 else 0
-        
-        # Print timing analysis
-        print(f"\nTiming Analysis:")
-        print(f"• Backswing: {actual_backswing:.6f}s vs target {tempo.backswing_duration:.6f}s "
-              f"(error: {(actual_backswing - tempo.backswing_duration)*1000:.3f}ms)")
-        print(f"• Downswing: {actual_downswing:.6f}s vs target {tempo.downswing_duration:.6f}s "
-              f"(error: {(actual_downswing - tempo.downswing_duration)*1000:.3f}ms)")
-        print(f"• Total:     {actual_cycle:.6f}s vs target {tempo.cycle_duration:.6f}s "
-              f"(error: {(actual_cycle - tempo.cycle_duration)*1000:.3f}ms)")
-        print(f"• Ratio:     {actual_ratio:.3f}:1 vs target {tempo.ratio:.1f}:1 "
-              f"(error: {abs(actual_ratio - tempo.ratio)/tempo.ratio*100:.3f}%)")
-        
-        # Small pause between cycles
-        time.sleep(0.2)
-
-    def _format_session_info(self, tempo: SwingTempo) -> str:
-        return f"""
-Training Session Details:
-------------------------
-Shot Type: {tempo.shot_type}
-Pro: {tempo.pro_name}
-Overall Tempo: {tempo.bpm} BPM
-Swing Ratio: {tempo.ratio}:1
-
-Target Timing:
-• Backswing:  {tempo.backswing_duration:.3f}s ({60/tempo.backswing_duration:.1f} BPM)
-• Downswing:  {tempo.downswing_duration:.3f}s ({60/tempo.downswing_duration:.1f} BPM)
-• Full Cycle: {tempo.cycle_duration:.3f}s ({tempo.bpm} BPM)
-
-Press Ctrl+C to end session
-"""
+    def analyze_recording(self, path: str, settings: SwingTempo) -> List[SwingTiming]:
+        """Time every swing in a recorded practice file against a pro's tempo"""
+        self.current_pro = settings.pro_name
+        self.current_shot_type = settings.shot_type
+        self.current_frames = settings.frames
+        self.current_description = settings.description
+
+        timings = SwingListener(settings).feed_file(path)
+        for timing in timings:
+            self.cycle_count += 1
+            self.analyze_timing(timing.backswing, timing.downswing,
+                                settings.backswing_time, settings.downswing_time)
+        self.reporter.flush()
+        return timings
+
+    def _print_timer_jitter(self) -> None:
+        """Report how closely the timer thread hit its deadlines"""
+        stats = self.timer.jitter()
+        if stats.count:
+            print(f"Timer ({self.timer.mode}): p50 {stats.p50*1000:.3f}ms, "
+                  f"p95 {stats.p95*1000:.3f}ms, p99 {stats.p99*1000:.3f}ms, "
+                  f"max {stats.max*1000:.3f}ms over {stats.count} deadlines")
+
+    def _precise_sleep_until(self, target_time: float) -> None:
+        """Wait for a perf_counter deadline; any spinning happens on the timer thread"""
+        self.timer.sleep_until(target_time)
+
+    def _wait_for_sample(self, sample: int) -> None:
+        """Wait until the output stream is about to render a sample index"""
+        self._precise_sleep_until(time.perf_counter() + self.audio_player.seconds_until(sample))
 
     def practice_mode(self, settings: SwingTempo) -> None:
         """Listen to the tempo without swinging"""
         print("\nPractice Mode - Just listen to internalize the tempo")
         print("Press Ctrl+C to exit practice mode")
-        
+
+        self.audio_player.set_shot_type(settings.shot_type)
+        self.audio_player.set_timing(settings.backswing_time, settings.downswing_time)
+        self.audio_player.preload_swing_tones(
+            settings.backswing_time,
+            settings.downswing_time
+        )
+
+        # The output callback queues every cue at its exact onset, cycle after cycle
+        self.audio_player.start_timeline(
+            SwingTimeline.from_tempo(settings, self.audio_player.sample_rate))
+
         try:
             while True:
-                self.audio_player.play_swing_sequence()
-                time.sleep(2)  # Longer pause between sequences
+                time.sleep(1)
         except KeyboardInterrupt:
             print("\nExiting practice mode")
+        finally:
+            self.audio_player.stop_timeline()
@@ -0,0 +1,122 @@
+import tempfile
+import threading
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+import numpy as np
+from .config import AUDIO_CONFIG, TEMPO_CONFIG, VOICE_PROMPTS
+
+if TYPE_CHECKING:
+    from .audio import AudioCache
+
+VOICE_RATE = 150    # Speed of speech
+VOICE_VOLUME = 0.9  # Volume level
+
+
+def voice_key(text: str) -> str:
+    """Tone cache key of a rendered voice prompt"""
+    return f"voice_{text}"
+
+
+def announcement(pro_name: str) -> str:
+    return f"Starting {pro_name}"
+
+
+def default_prompts() -> List[str]:
+    """Every VOICE_PROMPTS line plus an announcement for each pro"""
+    texts = [text for prompts in VOICE_PROMPTS.values() for text in prompts]
+    texts += [
+        announcement(pro_name)
+        for shot_config in TEMPO_CONFIG.values()
+        for pro_name in shot_config["pros"]
+    ]
+    return list(dict.fromkeys(texts))
+
+
+class VoicePrompts:
+    """
+    Speech rendered once to PCM and kept in the tone cache
+    pyttsx3 only ever runs on one worker thread, so callers never wait on it
+    """
+
+    def __init__(self, cache: "AudioCache", sample_rate: int = AUDIO_CONFIG["sample_rate"]):
+        self.cache = cache
+        self.sample_rate = sample_rate
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._engine = None  # Created and used on the worker thread only
+        self._queued = set()
+        self._failed = set()  # Prompts the engine could not render; never retried
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Rendered samples for a prompt, or None if it is not ready yet"""
+        return self.cache.get_clip(voice_key(text))
+
+    def prerender(self, texts: Iterable[str]) -> Future:
+        """Render prompts in the background, skipping ones cached, already queued or failed"""
+        with self._lock:
+            missing = [
+                text for text in dict.fromkeys(texts)
+                if text not in self._queued and text not in self._failed and self.get(text) is None
+            ]
+            self._queued.update(missing)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice")
+            return self._executor.submit(self._render_all, missing)
+
+    def _render_all(self, texts: List[str]) -> int:
+        """Render prompts to WAV with pyttsx3 and store them as float32 clips"""
+        if not texts:
+            return 0
+
+        clips: Dict[str, np.ndarray] = {}
+        try:
+            if self._engine is None:
+                # Imported here so the speech engine never loads on the caller's thread
+                import pyttsx3
+
+                self._engine = pyttsx3.init()
+                self._engine.setProperty('rate', VOICE_RATE)
+                self._engine.setProperty('volume', VOICE_VOLUME)
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                paths = [Path(tmp_dir) / f"prompt_{i}.wav" for i in range(len(texts))]
+                for text, path in zip(texts, paths):
+                    self._engine.save_to_file(text, str(path))
+                self._engine.runAndWait()  # One run renders every queued file
+
+                for text, path in zip(texts, paths):
+                    clips[voice_key(text)] = self._load(path)
+
+            self.cache.add_clips(clips)
+        except Exception as e:
+            clips = {}
+            with self._lock:
+                self._failed.update(texts)
+            warnings.warn(f"Could not render voice prompts: {e}", UserWarning)
+        finally:
+            with self._lock:
+                self._queued.difference_update(texts)
+
+        return len(clips)
+
+    def _load(self, path: Path) -> np.ndarray:
+        """Read a rendered prompt as mono float32 at the output sample rate"""
+        import soundfile as sf
+
+        data, sample_rate = sf.read(str(path), dtype='float32', always_2d=True)
+        clip = data.mean(axis=1)
+        if sample_rate != self.sample_rate and len(clip) > 1:
+            length = int(round(len(clip) * self.sample_rate / sample_rate))
+            positions = np.linspace(0, len(clip) - 1, length)
+            clip = np.interp(positions, np.arange(len(clip)), clip)
+        return clip.astype(np.float32)
+
+    def shutdown(self) -> None:
+        """Stop the worker without waiting for queued renders"""
+        if self._executor is not None:
+            if self._engine is not None:
+                self._executor.submit(self._engine.stop)
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,139 @@
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+
+PHASE_BITS = 32   # Phase accumulators wrap exactly at one cycle
+TABLE_BITS = 16   # 65536-entry tables: nearest lookup stays within 1e-4 of np.sin
+TABLE_SIZE = 1 << TABLE_BITS
+PHASE_MASK = (1 << PHASE_BITS) - 1
+
+_INDEX_SHIFT = np.uint32(PHASE_BITS - TABLE_BITS)
+_FRAC_MASK = np.uint32((1 << (PHASE_BITS - TABLE_BITS)) - 1)
+_FRAC_SCALE = np.float32(1.0 / (1 << (PHASE_BITS - TABLE_BITS)))
+_RAMP_CHUNK = 4096
+
+
+def phase_increment(freq: float, sample_rate: int) -> float:
+    """Per-sample phase step of a frequency, in accumulator units"""
+    return freq / sample_rate * (1 << PHASE_BITS)
+
+
+def geometric_ramp(ratio: np.ndarray, n: int) -> np.ndarray:
+    """
+    ratio**k for k in [0, n) along the last axis, for a (rows, 1) ratio column
+    Built as an outer product of per-chunk bases and one chunk-sized table, so
+    exp runs on n / chunk + chunk values instead of on every sample
+    """
+    ratio = np.asarray(ratio, dtype=np.float64).reshape(-1, 1)
+    chunk = max(1, min(n, _RAMP_CHUNK))
+    chunks = -(-n // chunk)
+    log_ratio = np.log(ratio)
+    within = np.exp(np.arange(chunk) * log_ratio)
+    bases = np.exp(np.arange(chunks) * chunk * log_ratio)
+    ramp = bases[:, :, None] * within[:, None, :]
+    return ramp.reshape(len(ratio), chunks * chunk)[:, :n]
+
+
+class Wavetable:
+    """
+    Band-limited single-cycle tables for one harmonic recipe
+    One table is built per number of harmonics that fit below Nyquist, so a
+    lookup never aliases whatever the fundamental frequency
+    Time Complexity: O(TABLE_SIZE) per table on first use, O(n) per lookup
+    Space Complexity: O(TABLE_SIZE * k) for k distinct harmonic counts
+    """
+
+    def __init__(self, harmonics: Sequence[float] = (1.0,), sample_rate: int = 44100):
+        self.harmonics = tuple(harmonics)
+        self.sample_rate = sample_rate
+        self._tables: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _table(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Table holding the first `count` harmonics, and its per-entry slopes"""
+        if count not in self._tables:
+            cycle = np.arange(TABLE_SIZE + 1) / TABLE_SIZE
+            table = np.zeros(TABLE_SIZE + 1)
+            for harmonic, weight in enumerate(self.harmonics[:count], start=1):
+                table += weight * np.sin(2 * np.pi * harmonic * cycle)
+            self._tables[count] = (
+                table[:-1].astype(np.float32),
+                np.diff(table).astype(np.float32)
+            )
+        return self._tables[count]
+
+    def harmonics_below_nyquist(self, max_freq: float) -> int:
+        count = int((self.sample_rate / 2) // max_freq) if max_freq > 0 else len(self.harmonics)
+        return max(1, min(count, len(self.harmonics)))
+
+    def lookup(self,
+               phases: np.ndarray,
+               max_freq: float,
+               interpolate: bool = False,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Read float32 samples at uint32 phases for a tone peaking at max_freq"""
+        table, slopes = self._table(self.harmonics_below_nyquist(max_freq))
+        index = phases >> _INDEX_SHIFT
+        result = np.take(table, index, out=out)
+        if interpolate:
+            frac = (phases & _FRAC_MASK).astype(np.float32)
+            frac *= _FRAC_SCALE
+            frac *= np.take(slopes, index)
+            result += frac
+        return result
+
+
+class Oscillator:
+    """
+    Phase-accumulator oscillator rendering a fixed tone or exponential sweep
+    State carries across calls, so it can run block by block in an audio callback
+    """
+
+    def __init__(self,
+                 wavetable: Wavetable,
+                 freq: float,
+                 end_freq: Optional[float] = None,
+                 duration_s: Optional[float] = None,
+                 interpolate: bool = False):
+        if freq <= 0 or (end_freq is not None and end_freq <= 0):
+            raise ValueError("Oscillator frequencies must be positive")
+        if end_freq is not None and not duration_s:
+            raise ValueError("A sweep needs a duration")
+
+        self.wavetable = wavetable
+        self.interpolate = interpolate
+        self.phase = 0
+        self._increment = phase_increment(freq, wavetable.sample_rate)
+        self._max_freq = max(freq, end_freq or freq)
+        self._ratio = 1.0
+        self._powers: Optional[np.ndarray] = None
+
+        if end_freq is not None and end_freq != freq:
+            n = int(wavetable.sample_rate * duration_s)
+            self._ratio = (end_freq / freq) ** (1 / max(n - 1, 1))
+
+    @property
+    def is_sweep(self) -> bool:
+        return self._ratio != 1.0
+
+    def _sweep_powers(self, frames: int) -> np.ndarray:
+        """ratio**k for k in [0, frames), built once per block size"""
+        if self._powers is None or len(self._powers) < frames:
+            self._powers = geometric_ramp(self._ratio, frames)[0]
+        return self._powers[:frames]
+
+    def render(self, frames: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Render the next `frames` samples as float32"""
+        if self.is_sweep:
+            # Inclusive running sum, matching ToneGenerator.generate_sweep
+            increments = (self._increment * self._sweep_powers(frames)).astype(np.uint32)
+            phases = np.cumsum(increments, dtype=np.uint32)
+            phases += np.uint32(self.phase)
+            self.phase = int(phases[-1])
+            self._increment *= self._ratio ** frames
+        else:
+            increment = int(round(self._increment)) & PHASE_MASK
+            phases = np.arange(frames, dtype=np.uint32)
+            phases *= np.uint32(increment)
+            phases += np.uint32(self.phase)
+            self.phase = (self.phase + frames * increment) & PHASE_MASK
+
+        return self.wavetable.lookup(phases, self._max_freq, self.interpolate, out)